@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+import argparse
 import json
 import sys
 
@@ -10,41 +11,93 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from sales_automation.data import load_sales_data
+import pandas as pd
 
+from sales_automation.cache import load_summary
+from sales_automation.data import iter_sales_chunks, load_sales_data
+from sales_automation.engine import compute_metrics
+from sales_automation.periods import GROWTH_DIMENSIONS, PeriodMetrics
+from sales_automation.sql import BACKENDS, open_backend
+from sales_automation.summary import SalesSummary
+
+DATA_PATH = PROJECT_ROOT / "relatorio_vendas.csv"
 OUTPUT_DIR = PROJECT_ROOT / "artifacts"
 JSON_OUTPUT = OUTPUT_DIR / "business_snapshot.json"
 MD_OUTPUT = OUTPUT_DIR / "business_snapshot.md"
+SNAPSHOT_OUTPUTS = ["kpis", "by_city", "by_product_line", "by_payment"]
+
 
+def _pct_or_none(value: float) -> float | None:
+    return None if pd.isna(value) else round(float(value), 2)
 
-def generate_business_snapshot() -> tuple[Path, Path]:
-    df = load_sales_data(PROJECT_ROOT / "relatorio_vendas.csv")
 
-    revenue = float(df["Total"].sum())
-    orders = int(df["Invoice ID"].nunique())
-    avg_ticket = revenue / orders if orders else 0.0
+def _latest_month_growth(periods: PeriodMetrics, dimension: str) -> list[dict[str, object]]:
+    growth = periods.growth(dimension)
+    latest = growth[growth["Month"] == growth["Month"].iloc[-1]].sort_values("revenue", ascending=False)
+    return [
+        {
+            "name": str(row[dimension]),
+            "revenue": round(float(row["revenue"]), 2),
+            "mom_pct": _pct_or_none(row["mom_pct"]),
+            "yoy_pct": _pct_or_none(row["yoy_pct"]),
+        }
+        for row in latest.to_dict("records")
+    ]
 
-    city_rev = (
-        df.groupby("City", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
+
+def _format_growth(entries: list[dict[str, object]]) -> str:
+    return ", ".join(
+        f"{entry['name']} {entry['mom_pct']:+.2f}%" if entry["mom_pct"] is not None else f"{entry['name']} n/a"
+        for entry in entries
     )
+
+
+def generate_business_snapshot(
+    chunksize: int | None = None,
+    data_path: Path = DATA_PATH,
+    output_dir: Path = OUTPUT_DIR,
+    backend: str | None = None,
+    data: pd.DataFrame | None = None,
+    summary: SalesSummary | None = None,
+) -> tuple[Path, Path]:
+    """Write the JSON and Markdown snapshots; ``data`` reuses an already loaded frame.
+
+    Monthly growth and the rolling trends come from the stored daily summary
+    (``summary`` passes one that is already loaded).
+    """
+    json_output = output_dir / JSON_OUTPUT.name
+    md_output = output_dir / MD_OUTPUT.name
+
+    if backend is not None:
+        sql_backend = open_backend(backend, data_path)
+        try:
+            results = compute_metrics(sql_backend.select(), SNAPSHOT_OUTPUTS)
+            periods = PeriodMetrics.from_frame(sql_backend.daily_revenue(by=GROWTH_DIMENSIONS))
+        finally:
+            sql_backend.close()
+    else:
+        summary = summary or load_summary(data_path, data=data, chunksize=chunksize)
+        periods = summary.periods()
+        if data is not None or chunksize is None:
+            source = data if data is not None else load_sales_data(data_path, use_cache=True)
+        else:
+            source = iter_sales_chunks(data_path, chunksize=chunksize)
+        results = compute_metrics(source, SNAPSHOT_OUTPUTS)
+    kpis = results["kpis"]
+
+    revenue = kpis["revenue"]
+    orders = int(kpis["orders"])
+    avg_ticket = kpis["avg_ticket"]
+
+    city_rev = results["by_city"]
     top_city = city_rev.iloc[0]
     top_city_share = float(top_city["Total"] / revenue * 100) if revenue else 0.0
 
-    product_rev = (
-        df.groupby("Product line", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
-    )
+    product_rev = results["by_product_line"]
     top_product = product_rev.iloc[0]
     top_product_share = float(top_product["Total"] / revenue * 100) if revenue else 0.0
 
-    payment_rev = (
-        df.groupby("Payment", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
-    )
+    payment_rev = results["by_payment"]
     cashless_share = (
         float(
             payment_rev[payment_rev["Payment"].isin(["Credit Card", "Mobile Wallet"])]["Total"].sum()
@@ -55,14 +108,11 @@ def generate_business_snapshot() -> tuple[Path, Path]:
         else 0.0
     )
 
-    monthly = (
-        df.groupby("Month", as_index=False)["Total"]
-        .sum()
-        .sort_values("Month")
-    )
+    monthly = periods.growth()
     month_growth = 0.0
-    if len(monthly) >= 2 and float(monthly.iloc[0]["Total"]) != 0:
-        month_growth = float((monthly.iloc[-1]["Total"] - monthly.iloc[0]["Total"]) / monthly.iloc[0]["Total"] * 100)
+    if len(monthly) >= 2 and float(monthly.iloc[0]["revenue"]) != 0:
+        first, last = float(monthly.iloc[0]["revenue"]), float(monthly.iloc[-1]["revenue"])
+        month_growth = (last - first) / first * 100
 
     payload = {
         "period": {
@@ -73,7 +123,7 @@ def generate_business_snapshot() -> tuple[Path, Path]:
             "revenue": round(revenue, 2),
             "orders": orders,
             "avg_ticket": round(avg_ticket, 2),
-            "avg_rating": round(float(df["Rating"].mean()), 2),
+            "avg_rating": round(kpis["avg_rating"], 2),
             "cashless_share_pct": round(cashless_share, 2),
             "growth_pct_first_to_last_month": round(month_growth, 2),
         },
@@ -89,10 +139,19 @@ def generate_business_snapshot() -> tuple[Path, Path]:
                 "share_pct": round(top_product_share, 2),
             },
         },
+        "trends": {
+            "as_of": str(pd.Timestamp(periods.start + periods.days - 1).date()),
+            "rolling_revenue": {f"{window}d": round(periods.window_revenue(window), 2) for window in periods.windows},
+            "ytd_revenue": round(periods.ytd_revenue(), 2),
+            "latest_month_growth": {
+                "city": _latest_month_growth(periods, "City"),
+                "product_line": _latest_month_growth(periods, "Product line"),
+            },
+        },
     }
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    JSON_OUTPUT.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    json_output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
     markdown = f"""## Executive Snapshot ({payload['period']['start_month']} to {payload['period']['end_month']})
 
@@ -104,13 +163,32 @@ def generate_business_snapshot() -> tuple[Path, Path]:
 - Revenue growth (first month vs last month): {payload['kpis']['growth_pct_first_to_last_month']:.2f}%
 - Top city: {payload['leaders']['top_city']['name']} ({payload['leaders']['top_city']['share_pct']:.2f}% of revenue)
 - Top product line: {payload['leaders']['top_product_line']['name']} ({payload['leaders']['top_product_line']['share_pct']:.2f}% of revenue)
+- Revenue in the last 7/28/90 days (to {payload['trends']['as_of']}): ${payload['trends']['rolling_revenue']['7d']:,.2f} / ${payload['trends']['rolling_revenue']['28d']:,.2f} / ${payload['trends']['rolling_revenue']['90d']:,.2f}
+- Year-to-date revenue: ${payload['trends']['ytd_revenue']:,.2f}
+- Latest month vs previous month by city: {_format_growth(payload['trends']['latest_month_growth']['city'])}
+- Latest month vs previous month by product line: {_format_growth(payload['trends']['latest_month_growth']['product_line'])}
 """
-    MD_OUTPUT.write_text(markdown, encoding="utf-8")
+    md_output.write_text(markdown, encoding="utf-8")
 
-    return JSON_OUTPUT, MD_OUTPUT
+    return json_output, md_output
 
 
 if __name__ == "__main__":
-    json_path, md_path = generate_business_snapshot()
+    parser = argparse.ArgumentParser(description="Generate the executive business snapshot.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the source in chunks of this many rows to bound memory usage.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Aggregate with an embedded SQL engine instead of in-memory pandas.",
+    )
+    args = parser.parse_args()
+
+    json_path, md_path = generate_business_snapshot(chunksize=args.chunksize, backend=args.backend)
     print(f"Business snapshot JSON generated at: {json_path}")
     print(f"Business snapshot Markdown generated at: {md_path}")
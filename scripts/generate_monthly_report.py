@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+import argparse
 import sys
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -9,35 +10,86 @@ SRC_PATH = PROJECT_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from sales_automation.data import load_sales_data
+import pandas as pd
 
+from sales_automation.aggregates import SalesAccumulator
+from sales_automation.cache import load_summary
+from sales_automation.data import iter_sales_chunks, load_sales_data
+from sales_automation.sql import BACKENDS, open_backend
+from sales_automation.summary import SalesSummary
 
+
+DATA_PATH = PROJECT_ROOT / "relatorio_vendas.csv"
 OUTPUT_DIR = PROJECT_ROOT / "artifacts"
 OUTPUT_FILE = OUTPUT_DIR / "monthly_summary.csv"
+SUMMARY_COLUMNS = ["Month", "revenue", "orders", "avg_rating", "gross_income", "avg_ticket"]
 
 
 
-def generate_monthly_summary() -> Path:
-    df = load_sales_data(PROJECT_ROOT / "relatorio_vendas.csv")
+def generate_monthly_summary(
+    chunksize: int | None = None,
+    data_path: Path = DATA_PATH,
+    output_file: Path = OUTPUT_FILE,
+    backend: str | None = None,
+    order_error: float | None = None,
+    data: pd.DataFrame | None = None,
+    summary: SalesSummary | None = None,
+) -> Path:
+    """Write the monthly summary CSV.
 
-    summary = (
-        df.groupby("Month", as_index=False)
-        .agg(
-            revenue=("Total", "sum"),
-            orders=("Invoice ID", "nunique"),
-            avg_rating=("Rating", "mean"),
-            gross_income=("Gross income", "sum"),
-        )
-        .sort_values("Month")
-    )
-    summary["avg_ticket"] = summary["revenue"] / summary["orders"]
+    By default it is rolled up from the stored daily summary of the source,
+    which is only rebuilt (from ``data`` when given) after the source changed;
+    ``summary`` passes one that is already loaded.
+    """
+    if backend is not None:
+        sql_backend = open_backend(backend, data_path)
+        try:
+            monthly = sql_backend.summary(by=["Month"])[SUMMARY_COLUMNS]
+        finally:
+            sql_backend.close()
+    elif order_error is not None:
+        accumulator = SalesAccumulator(by=["Month"], order_error=order_error)
+        if chunksize is None:
+            accumulator.update(load_sales_data(data_path, use_cache=True) if data is None else data)
+        else:
+            for chunk in iter_sales_chunks(data_path, chunksize=chunksize):
+                accumulator.update(chunk)
+        monthly = accumulator.result()[SUMMARY_COLUMNS]
+    else:
+        summary = summary or load_summary(data_path, data=data, chunksize=chunksize)
+        monthly = summary.monthly()[SUMMARY_COLUMNS]
 
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    summary.to_csv(OUTPUT_FILE, index=False)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    monthly.to_csv(output_file, index=False)
 
-    return OUTPUT_FILE
+    return output_file
 
 
 if __name__ == "__main__":
-    file_path = generate_monthly_summary()
+    parser = argparse.ArgumentParser(description="Generate the monthly summary CSV.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the source in chunks of this many rows to bound memory usage.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default=None,
+        help="Aggregate with an embedded SQL engine instead of in-memory pandas.",
+    )
+    parser.add_argument(
+        "--order-error",
+        type=float,
+        default=None,
+        help="Estimate distinct orders with HyperLogLog at this relative error (e.g. 0.01) instead of exactly.",
+    )
+    args = parser.parse_args()
+
+    file_path = generate_monthly_summary(
+        chunksize=args.chunksize,
+        backend=args.backend,
+        order_error=args.order_error,
+    )
     print(f"Monthly summary generated at: {file_path}")
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+from datetime import datetime, timezone
+import json
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from scripts.generate_business_snapshot import generate_business_snapshot
+from scripts.generate_monthly_report import generate_monthly_summary
+from sales_automation.cache import build_snapshot, load_summary, source_version
+from sales_automation.catalog import read_catalog
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.engine import METRIC_OUTPUTS, compute_metrics
+from sales_automation.metrics import (
+    compute_kpis,
+    payment_mix,
+    revenue_by_city,
+    revenue_by_day,
+    revenue_by_product_line,
+)
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+BENCHMARK_DIR = PROJECT_ROOT / "artifacts" / "benchmarks"
+# Synthetic sources and their reports are regenerated on demand, so they live in the ignored cache directory.
+DATA_DIR = PROJECT_ROOT / ".sales_cache" / "benchmarks"
+JSON_REPORT = BENCHMARK_DIR / "benchmark_results.json"
+DEFAULT_ROWS = [1_000, 100_000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Slowdowns smaller than this are timer noise, whatever the ratio.
+DEFAULT_MIN_SECONDS = 0.001
+GENERATOR_CHUNK_ROWS = 1_000_000
+
+# Label mixes taken from relatorio_vendas.csv so filters and rankings behave realistically.
+BRANCHES = {"Downtown": 340, "Uptown": 332, "Suburban": 328}
+CITIES = {"Toronto": 349, "Chicago": 329, "Vancouver": 322}
+CUSTOMER_TYPES = {"Regular": 508, "Member": 492}
+GENDERS = {"Male": 522, "Female": 478}
+PRODUCT_LINES = {
+    "Health & Wellness": 297,
+    "Electronics Accessories": 295,
+    "Home & Lifestyle": 213,
+    "Food & Beverages": 102,
+    "Sports & Travel": 93,
+}
+PAYMENTS = {"Cash": 337, "Credit Card": 332, "Mobile Wallet": 331}
+FIRST_NAMES = ["Olivia", "Liam", "Emma", "Noah", "Ava", "Lucas", "Sophia", "Ethan", "Mia", "James"]
+LAST_NAMES = ["Smith", "Brown", "Davis", "Wilson", "Anderson", "Martin", "Thomas", "Lee", "Taylor", "Clark"]
+CSV_COLUMNS = [
+    "Invoice ID", "Branch", "City", "Customer type", "Customer Name", "Gender", "Product line",
+    "Unit price", "Quantity", "Tax 5%", "Total", "Date", "Time", "Payment", "cogs",
+    "gross margin percentage", "Gross income", "Rating",
+]
+
+
+def _choice(rng: np.random.Generator, weights: dict[str, int], size: int) -> np.ndarray:
+    labels = np.array(list(weights))
+    probabilities = np.array(list(weights.values()), dtype=np.float64)
+    return labels[rng.choice(len(labels), size=size, p=probabilities / probabilities.sum())]
+
+
+def _day_weights(days: pd.DatetimeIndex) -> np.ndarray:
+    # Busier weekends and a year-end peak, like the source export.
+    weekend = np.where(days.dayofweek >= 5, 1.25, 1.0)
+    season = 1.0 + 0.2 * np.cos(2 * np.pi * (days.dayofyear.to_numpy() - 350) / 365)
+    weights = weekend * season
+    return weights / weights.sum()
+
+
+def _synthetic_chunk(rng: np.random.Generator, start_row: int, rows: int, days: pd.DatetimeIndex) -> pd.DataFrame:
+    unit_price = np.round(rng.uniform(10, 1000, rows), 2)
+    quantity = rng.integers(1, 11, rows).astype(np.float64)
+    cogs = np.round(unit_price * quantity, 2)
+    tax = np.round(cogs * 0.05, 2)
+    minutes = rng.integers(10 * 60, 21 * 60, rows)
+    # Multiplying by a number coprime with 10**9 keeps invoice IDs unique up to 10**9 rows.
+    invoice_numbers = (np.arange(start_row, start_row + rows, dtype=np.int64) * 7919 + 12345) % 10**9
+    invoice_text = pd.Series(invoice_numbers).astype(str).str.zfill(9)
+
+    return pd.DataFrame(
+        {
+            "Invoice ID": invoice_text.str[:3] + "-" + invoice_text.str[3:5] + "-" + invoice_text.str[5:],
+            "Branch": _choice(rng, BRANCHES, rows),
+            "City": _choice(rng, CITIES, rows),
+            "Customer type": _choice(rng, CUSTOMER_TYPES, rows),
+            "Customer Name": np.char.add(
+                np.char.add(np.array(FIRST_NAMES)[rng.integers(0, len(FIRST_NAMES), rows)], " "),
+                np.array(LAST_NAMES)[rng.integers(0, len(LAST_NAMES), rows)],
+            ),
+            "Gender": _choice(rng, GENDERS, rows),
+            "Product line": _choice(rng, PRODUCT_LINES, rows),
+            "Unit price": unit_price,
+            "Quantity": quantity,
+            "Tax 5%": tax,
+            "Total": np.round(cogs + tax, 2),
+            "Date": days[rng.choice(len(days), size=rows, p=_day_weights(days))].strftime("%Y-%m-%d"),
+            "Time": [f"{minute // 60:02d}:{minute % 60:02d}" for minute in minutes],
+            "Payment": _choice(rng, PAYMENTS, rows),
+            "cogs": cogs,
+            "gross margin percentage": 0.0,
+            "Gross income": cogs,
+            "Rating": np.round(rng.uniform(5, 10, rows), 1),
+        },
+        columns=CSV_COLUMNS,
+    )
+
+
+def generate_synthetic_sales(
+    output_path: Path,
+    rows: int,
+    seed: int = 0,
+    start_date: str = "2023-01-01",
+    periods_days: int = 365,
+) -> Path:
+    """Write a CSV with the ``relatorio_vendas.csv`` schema and ``rows`` random sales.
+
+    Rows are generated and written in chunks, so memory stays bounded even
+    for 10**8 rows.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(start_date, periods=periods_days, freq="D")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+
+    with tmp_path.open("w", encoding="utf-8", newline="") as handle:
+        for start_row in range(0, rows, GENERATOR_CHUNK_ROWS):
+            chunk_rows = min(GENERATOR_CHUNK_ROWS, rows - start_row)
+            chunk = _synthetic_chunk(rng, start_row, chunk_rows, days)
+            chunk.to_csv(handle, index=False, header=start_row == 0)
+
+    tmp_path.replace(output_path)
+    return output_path
+
+
+def synthetic_dataset(rows: int, seed: int = 0, data_dir: Path = DATA_DIR) -> Path:
+    """Return the synthetic dataset for ``rows``, generating it on first use."""
+    path = data_dir / f"synthetic_sales_{rows}_{seed}.csv"
+    if not path.exists():
+        generate_synthetic_sales(path, rows, seed=seed)
+    return path
+
+
+def _default_filters(df: pd.DataFrame) -> dict[str, list[str]]:
+    # The dashboard's default view: latest month, two cities.
+    return {"months": [str(df["Month"].max())], "cities": sorted(df["City"].unique())[:2]}
+
+
+def _load_frame(data_path: Path) -> pd.DataFrame:
+    return load_sales_data(data_path)
+
+
+def _warm_cache(data_path: Path) -> Path:
+    load_sales_data(data_path, use_cache=True)
+    return data_path
+
+
+def _filter_state(data_path: Path) -> tuple[pd.DataFrame, dict[str, list[str]]]:
+    df = _load_frame(data_path)
+    return df, _default_filters(df)
+
+
+def _dashboard_state(data_path: Path) -> tuple[Any, dict[str, list[str]]]:
+    snapshot = build_snapshot(data_path)
+    return snapshot, _default_filters(snapshot.frame)
+
+
+def _catalog_state(data_path: Path) -> Path:
+    # Building a snapshot stores the filter catalog sidecar that a cold dashboard reads first.
+    build_snapshot(data_path)
+    return data_path
+
+
+def _report_dir(data_path: Path) -> tuple[Path, Path]:
+    # Reports run against a warm columnar cache and stored summary, as they do on repeat runs.
+    _warm_cache(data_path)
+    load_summary(data_path)
+    return data_path, data_path.parent / "reports"
+
+
+# Stage name -> (setup, run). Setup is not timed; run receives its result.
+STAGES: dict[str, tuple[Callable[[Path], Any], Callable[[Any], Any]]] = {
+    "load_sales_data": (lambda path: path, load_sales_data),
+    "load_sales_data_cached": (_warm_cache, lambda path: load_sales_data(path, use_cache=True)),
+    "filter_sales_data": (_filter_state, lambda state: filter_sales_data(state[0], **state[1])),
+    "compute_kpis": (_load_frame, compute_kpis),
+    "revenue_by_day": (_load_frame, revenue_by_day),
+    "revenue_by_product_line": (_load_frame, revenue_by_product_line),
+    "revenue_by_city": (_load_frame, revenue_by_city),
+    "payment_mix": (_load_frame, payment_mix),
+    "filter_catalog": (_catalog_state, lambda path: read_catalog(path, source_version(path))),
+    "dashboard_query": (
+        _dashboard_state,
+        lambda state: compute_metrics(state[0].cube.slice(**state[1]), METRIC_OUTPUTS),
+    ),
+    "generate_monthly_summary": (
+        _report_dir,
+        lambda state: generate_monthly_summary(data_path=state[0], output_file=state[1] / "monthly_summary.csv"),
+    ),
+    "generate_business_snapshot": (
+        _report_dir,
+        lambda state: generate_business_snapshot(data_path=state[0], output_dir=state[1]),
+    ),
+}
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def run_stage(stage: str, data_path: Path, rows: int, repeat: int = DEFAULT_REPEAT) -> dict[str, Any]:
+    """Time one pipeline stage ``repeat`` times on ``data_path`` (setup excluded)."""
+    setup, run = STAGES[stage]
+    state = setup(data_path)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        "stage": stage,
+        "rows": rows,
+        "repeat": repeat,
+        "wall_seconds": round(best, 6),
+        "median_seconds": round(statistics.median(timings), 6),
+        "rows_per_second": round(rows / best, 1) if best > 0 else None,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+
+
+def run_benchmarks(
+    row_counts: list[int] = DEFAULT_ROWS,
+    stages: list[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = 0,
+    isolate: bool = True,
+    data_dir: Path = DATA_DIR,
+) -> dict[str, Any]:
+    """Benchmark every stage at every size and return the JSON-ready payload.
+
+    With ``isolate`` each stage runs in a fresh interpreter, so its peak RSS
+    is its own (including its untimed setup) rather than the whole run's.
+    """
+    stages = stages or list(STAGES)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark stages: {sorted(unknown)}")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for rows in row_counts:
+        data_path = synthetic_dataset(rows, seed=seed, data_dir=data_dir)
+        for stage in stages:
+            if isolate:
+                with context.Pool(1, maxtasksperchild=1) as pool:
+                    result = pool.apply(run_stage, (stage, data_path, rows, repeat))
+            else:
+                result = run_stage(stage, data_path, rows, repeat)
+            print(
+                f"{stage:<28} {rows:>12,} rows  {result['wall_seconds']:>10.4f}s  "
+                f"{(result['rows_per_second'] or 0):>14,.0f} rows/s",
+                flush=True,
+            )
+            results.append(result)
+
+    return {
+        "generated_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> list[dict[str, Any]]:
+    """Return the stages whose best wall time regressed by more than ``threshold``."""
+    baseline_times = {(item["stage"], item["rows"]): item["wall_seconds"] for item in baseline["results"]}
+    regressions = []
+    for item in current["results"]:
+        previous = baseline_times.get((item["stage"], item["rows"]))
+        if not previous or item["wall_seconds"] <= max(previous * (1 + threshold), previous + min_seconds):
+            continue
+        regressions.append(
+            {
+                "stage": item["stage"],
+                "rows": item["rows"],
+                "baseline_seconds": previous,
+                "current_seconds": item["wall_seconds"],
+                "slowdown": round(item["wall_seconds"] / previous, 3),
+            }
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the sales pipeline on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Dataset sizes to benchmark.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=None, help="Stages to run (default: all).")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per stage; the best is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data generator.")
+    parser.add_argument("--output", type=Path, default=JSON_REPORT, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown versus the baseline before failing (0.25 = 25%%).",
+    )
+    parser.add_argument("--no-isolate", action="store_true", help="Run every stage in this process.")
+    args = parser.parse_args()
+
+    payload = run_benchmarks(args.rows, args.stages, args.repeat, args.seed, isolate=not args.no_isolate)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"Benchmark results written to: {args.output}")
+
+    if args.baseline is not None:
+        regressions = compare_results(payload, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for item in regressions:
+            print(
+                f"REGRESSION {item['stage']} at {item['rows']:,} rows: "
+                f"{item['baseline_seconds']:.4f}s -> {item['current_seconds']:.4f}s (x{item['slowdown']})"
+            )
+        raise SystemExit(1 if regressions else 0)
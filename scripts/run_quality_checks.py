@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import argparse
 import html
 import json
 from pathlib import Path
@@ -17,7 +18,8 @@ if str(PROJECT_ROOT) not in sys.path:
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from scripts.generate_monthly_report import generate_monthly_summary
+from scripts.generate_monthly_report import DATA_PATH, generate_monthly_summary
+from sales_automation.validation import ValidationReport, validate_file
 
 ARTIFACTS_DIR = PROJECT_ROOT / "artifacts"
 JSON_REPORT = ARTIFACTS_DIR / "test_report.json"
@@ -36,6 +38,96 @@ TEST_PURPOSES = {
     "test_kpis_match_expected_values": "Confirms KPI calculations remain stable on a fixed regression dataset.",
     "test_city_ranking_is_stable": "Confirms city ordering stays stable on a fixed regression dataset.",
     "test_generate_monthly_summary_creates_csv": "Confirms monthly automated report artifact is generated.",
+    "test_cached_load_matches_direct_load": "Confirms the columnar cache returns the same data as a fresh CSV load.",
+    "test_cache_is_rebuilt_when_source_changes": "Confirms a changed source file invalidates the columnar cache.",
+    "test_touched_source_reuses_cache": "Confirms an unchanged file with a new timestamp keeps its cache.",
+    "test_sniff_csv_dialect_detects_modern_export": "Confirms the standard export is recognized as comma-separated UTF-8.",
+    "test_legacy_export_is_parsed_in_a_single_pass": "Confirms legacy semicolon/latin1 exports load with the same schema and totals.",
+    "test_compact_frame_uses_smaller_dtypes": "Confirms the compact schema shrinks the in-memory dataset.",
+    "test_compact_frame_keeps_kpis_and_filters": "Confirms KPIs and filters are unchanged on the compact schema.",
+    "test_chunked_monthly_summary_matches_full_load": "Confirms chunked streaming produces the same monthly summary as a full load.",
+    "test_merged_accumulators_count_shared_invoices_once": "Confirms merged partial aggregates count each order exactly once.",
+    "test_cube_rollups_match_frame_metrics": "Confirms cube roll-ups return the same KPIs and breakdowns as raw-row metrics.",
+    "test_cube_counts_invoices_spanning_cells_once": "Confirms orders spanning several cube cells are counted once.",
+    "test_indexed_filter_matches_mask_filter": "Confirms bitmap-index filtering returns exactly the rows of the mask filter.",
+    "test_full_selection_skips_filtering": "Confirms selecting every value returns the dataset without copying it.",
+    "test_single_pass_matches_groupby_results": "Confirms the fused metrics engine matches per-metric groupby results.",
+    "test_chunk_stream_matches_full_frame": "Confirms the metrics engine gives the same results on a chunk stream as on the full frame.",
+    "test_unknown_output_is_rejected": "Confirms requests for unsupported metric outputs fail loudly.",
+    "test_lru_eviction_and_counters": "Confirms the result cache evicts least-recently-used entries and counts hits and misses.",
+    "test_entries_expire_after_ttl": "Confirms cached results are recomputed once their time-to-live expires.",
+    "test_dataset_is_shared_until_source_changes": "Confirms every caller shares one dataset copy until the source file changes.",
+    "test_equivalent_selections_share_memoized_metrics": "Confirms equivalent filter selections reuse one memoized metric result.",
+    "test_watched_dataset_swaps_only_after_version_settles": "Confirms a changed source is swapped in only after its version settles, while requests keep the old snapshot.",
+    "test_failed_reload_keeps_previous_snapshot": "Confirms a broken source drop leaves the previous snapshot in service.",
+    "test_watch_is_idempotent": "Confirms watching the same source twice reuses one watcher.",
+    "test_refresh_ingests_only_appended_rows": "Confirms a refresh parses only appended rows and matches a full reload, aggregates included.",
+    "test_partial_line_waits_for_next_refresh": "Confirms a half-written trailing line is ingested only once it is complete.",
+    "test_resent_invoices_are_detected_and_dropped": "Confirms re-sent Invoice IDs are counted and kept out of the frame and aggregates.",
+    "test_rewritten_source_is_reloaded": "Confirms a source rewritten before the watermark is reloaded in full.",
+    "test_cached_load_parses_only_the_appended_tail": "Confirms the cached loader extends its frame from the appended tail instead of re-reading the file.",
+    "test_merge_sorted_rows_places_late_rows_by_date": "Confirms late-arriving rows are merged into date order without re-sorting.",
+    "test_synthetic_data_matches_source_schema": "Confirms generated benchmark data loads with the production schema, labels and date spread.",
+    "test_run_and_compare_benchmarks": "Confirms benchmark runs report throughput and slowdowns beyond the threshold are flagged.",
+    "test_disabled_telemetry_records_nothing": "Confirms instrumentation is a no-op while telemetry is switched off.",
+    "test_collected_spans_carry_rows_and_cache_tags": "Confirms profiled runs capture nested spans with row counts and cache hit/miss tags.",
+    "test_chrome_trace_export": "Confirms recorded spans export as valid Chrome trace events.",
+    "test_directory_load_matches_single_file": "Confirms a partitioned export directory loads the same rows as the single export, in date order.",
+    "test_process_pool_matches_serial_load": "Confirms parallel partition loading returns the same frame as a serial load.",
+    "test_filters_prune_partitions_before_reading": "Confirms month/city filters skip partitions outside the selection and return the right rows.",
+    "test_glob_source_and_version": "Confirms glob sources load only matching partitions and are versioned separately.",
+    "test_metrics_match_pandas_exactly_on_golden_fixture": "Confirms SQLite-backed KPIs and breakdowns equal the pandas path exactly on the golden fixture.",
+    "test_filtered_rows_and_summary_match_pandas": "Confirms SQL-filtered rows and grouped summaries match filter_sales_data and SalesAccumulator.",
+    "test_database_is_rebuilt_when_source_changes": "Confirms the SQLite database is reused while the source is unchanged and rebuilt after edits.",
+    "test_full_dataset_matches_within_float_tolerance": "Confirms SQL metrics on the full dataset agree with pandas and its monthly summary is rounded like the daily summary.",
+    "test_unknown_backend_is_rejected": "Confirms open_backend rejects unsupported engine names.",
+    "test_resolution_follows_selected_span": "Confirms the trend resolution switches from day to week to month as the date span grows.",
+    "test_resampling_preserves_revenue": "Confirms weekly and monthly trend buckets keep total revenue and reject unknown resolutions.",
+    "test_lttb_keeps_endpoints_and_peaks": "Confirms LTTB downsampling keeps endpoints and extreme points within the point cap.",
+    "test_trend_series_caps_points_unless_full_resolution": "Confirms the plotted trend is capped by default and complete when full resolution is requested.",
+    "test_chunked_csv_matches_single_serialization": "Confirms chunked CSV export produces the same bytes as a single to_csv call.",
+    "test_compressed_formats_round_trip_smaller": "Confirms gzip CSV and Parquet exports round-trip the data at under half the plain CSV size.",
+    "test_cache_builds_each_selection_once": "Confirms each selection and format is exported once and reused, and old exports are pruned.",
+    "test_estimates_within_error_bound": "Confirms HyperLogLog estimates stay within four standard errors from tens to hundreds of thousands of IDs.",
+    "test_union_matches_single_sketch_and_round_trips": "Confirms unioned sketches equal a single sketch, survive serialization and reject mixed precisions.",
+    "test_exact_mode_stays_default": "Confirms orders stay exact by default and sketched counts over chunks are close.",
+    "test_accumulators_merge_sketches_across_partitions": "Confirms sketched SalesAccumulator partials merge to near-exact monthly orders and avg tickets.",
+    "test_cube_rolls_up_cell_sketches_for_any_selection": "Confirms per-cell cube sketches estimate orders for arbitrary filter selections.",
+    "test_independent_jobs_overlap_and_receive_dependencies": "Confirms independent report jobs run concurrently and dependents receive their inputs.",
+    "test_failures_skip_dependents_and_bad_graphs_are_rejected": "Confirms failed jobs skip their dependents and cyclic or dangling graphs are rejected.",
+    "test_reports_share_one_dataset_load": "Confirms the orchestrated reports load the dataset once and match the standalone monthly summary.",
+    "test_rolling_windows_and_ytd_match_pandas": "Confirms rolling-window and year-to-date revenue match pandas rolling sums on the daily series.",
+    "test_growth_matches_groupby_reference": "Confirms month-over-month and year-over-year growth match a groupby reference per city and product line.",
+    "test_incremental_updates_in_any_order_match_a_full_build": "Confirms out-of-order incremental period updates equal a full build.",
+    "test_refresh_extends_period_metrics": "Confirms an incremental refresh extends the rolling and year-to-date metrics.",
+    "test_reports_violation_counts_and_samples_per_rule": "Confirms each failed rule reports its violating row count and sample rows.",
+    "test_chunk_stream_matches_single_frame": "Confirms validating a chunk stream matches validating the loaded frame.",
+    "test_missing_columns_and_dtypes_fail": "Confirms missing columns and wrong dtypes fail validation.",
+    "test_kpis_match_engine_and_honor_etags": "Confirms API KPIs match the engine and ETags answer 304 until the data changes.",
+    "test_identical_concurrent_requests_share_one_computation": "Confirms identical concurrent API requests are coalesced into one computation.",
+    "test_http_server_routes_and_errors": "Confirms the HTTP server routes, conditional requests and error statuses.",
+    "test_catalog_summarizes_filter_values_and_round_trips": "Confirms the filter catalog counts values, round-trips as a sidecar and rejects stale versions.",
+    "test_snapshot_build_stores_the_sidecar_for_the_next_cold_start": "Confirms building a snapshot stores a catalog matching the loaded filter options.",
+    "test_background_load_resolves_once_and_retries_failures": "Confirms background dataset loading is shared per path and retried after a failure.",
+    "test_repeat_rate_cohorts_rfm_and_customer_types": "Confirms repeat rate, cohort retention, RFM scores and customer-type metrics on a fixed dataset.",
+    "test_cohorts_match_a_groupby_over_generated_sales": "Confirms cohort counts and customer spend match a groupby over generated sales.",
+    "test_cache_memoizes_per_selection": "Confirms customer metrics are memoized per dataset version and filter selection.",
+    "test_rollups_match_row_level_groupby": "Confirms the daily summary rolls up to the same monthly totals and orders as a row-level groupby.",
+    "test_sidecar_is_versioned_and_skips_the_rows_when_fresh": "Confirms the stored summary is tagged with the source version and reused without reading the rows.",
+    "test_ingestion_keeps_the_stored_summary_current": "Confirms incremental ingestion keeps the stored daily summary current.",
+    "test_least_recently_used_datasets_are_unloaded_over_budget": "Confirms the least recently used datasets are unloaded once the memory budget is exceeded.",
+    "test_dataset_budget_trims_its_own_results": "Confirms a per-dataset budget trims only that dataset's memoized results.",
+    "test_config_file_and_unknown_names": "Confirms the registry file is parsed and unknown dataset names are rejected.",
+    "test_multi_line_invoices_are_not_resends": "Confirms lines of one invoice are kept and only IDs ingested before the watermark count as re-sends.",
+    "test_unloaded_dataset_is_not_reloaded_by_its_watcher": "Confirms a reload finishing after its dataset was unloaded is discarded, not installed.",
+    "test_only_summaries_keeping_every_row_are_stored": "Confirms the stored daily summary is only written by ingestion that keeps every row, like a full load.",
+    "test_latin1_bytes_past_the_sniff_sample_are_decoded": "Confirms a latin1 byte past the sniff sample still decodes every column as text.",
+    "test_sidecar_grows_with_cells_not_rows": "Confirms the stored summary does not grow with the rows of its cells.",
+    "test_loads_run_outside_the_lock_and_are_shared": "Confirms a slow dataset load neither blocks other datasets nor runs twice.",
+    "test_non_iso_dates_are_parsed_like_pandas": "Confirms SQL backends parse non-ISO export dates into the same rows and months as pandas.",
+    "test_full_dataset_matches_groupby_within_rtol": "Confirms engine sums on the full dataset match groupby sums within the documented relative tolerance.",
+    "test_hits_keep_exports_and_pruned_files_are_rebuilt": "Confirms pruning keeps recently served exports and a pruned export is rebuilt on open.",
+    "test_file_named_like_a_glob_is_a_single_source": "Confirms an existing file with glob characters in its name loads and caches as one source.",
 }
 
 
@@ -83,16 +175,59 @@ def _risk_level(pass_rate: float, failures: int, errors: int) -> str:
     return "Low"
 
 
-def run_quality_checks() -> int:
-    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
 
+def run_test_suite() -> TimedTestResult:
     loader = unittest.TestLoader()
     suite = loader.discover(start_dir=str(PROJECT_ROOT / "tests"), pattern="test_*.py")
 
     runner = TimedTextTestRunner(verbosity=2)
-    result: TimedTestResult = runner.run(suite)
+    return runner.run(suite)
 
+
+def run_quality_checks(data_path: Path = DATA_PATH, chunksize: int | None = None) -> int:
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    result = run_test_suite()
     monthly_report = generate_monthly_summary()
+    validation = validate_file(data_path, chunksize=chunksize)
+
+    _, _, meets_gate = write_quality_report(result, monthly_report, validation=validation)
+    return 0 if meets_gate else 1
+
+
+def _validation_rows(validation: ValidationReport | None) -> str:
+    if validation is None:
+        return ""
+    return "\n".join(
+        "<tr>"
+        f"<td><code>{html.escape(rule.name)}</code></td>"
+        f"<td><span class='pill {'passed' if rule.passed else 'failed'}'>{'PASSED' if rule.passed else 'FAILED'}</span></td>"
+        f"<td>{'missing column' if rule.missing_column else f'{rule.violations:,} rows'}</td>"
+        "</tr>"
+        for rule in validation.results
+    )
+
+
+def write_quality_report(
+    result: TimedTestResult,
+    monthly_report: Path,
+    output_dir: Path = ARTIFACTS_DIR,
+    validation: ValidationReport | None = None,
+) -> tuple[Path, Path, bool]:
+    """Write the JSON and HTML quality reports; also return whether the gate was met.
+
+    A ``validation`` report of the source data is included when given, and
+    any failed rule also fails the gate.
+    """
+    json_report = output_dir / JSON_REPORT.name
+    html_report = output_dir / HTML_REPORT.name
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     rows = []
     for test_name in sorted(result.timings.keys()):
@@ -118,6 +253,7 @@ def run_quality_checks() -> int:
         and error_count == 0
         and skipped_count == 0
         and pass_rate >= MIN_PASS_RATE
+        and (validation is None or validation.passed)
     )
     risk = _risk_level(pass_rate / 100.0, failed_count, error_count)
 
@@ -139,12 +275,13 @@ def run_quality_checks() -> int:
             "generated_at_unix": int(time.time()),
         },
         "tests": rows,
+        "data_validation": validation.as_dict() if validation is not None else None,
         "artifacts": {
-            "monthly_summary_csv": str(monthly_report.relative_to(PROJECT_ROOT)),
+            "monthly_summary_csv": _display_path(monthly_report),
         },
     }
 
-    JSON_REPORT.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    json_report.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
     success = payload["summary"]["success"]
     status_color = "#0f766e" if success else "#b91c1c"
@@ -161,6 +298,24 @@ def run_quality_checks() -> int:
         ]
     )
 
+    validation_rows = _validation_rows(validation)
+    validation_section = (
+        f"""
+    <section class=\"table-wrap\">
+      <table>
+        <thead>
+          <tr><th>Data rule ({validation.rows:,} rows)</th><th>Status</th><th>Violations</th></tr>
+        </thead>
+        <tbody>
+          {validation_rows}
+        </tbody>
+      </table>
+    </section>
+"""
+        if validation is not None
+        else ""
+    )
+
     html_content = f"""<!doctype html>
 <html lang=\"en\">
 <head>
@@ -270,17 +425,21 @@ def run_quality_checks() -> int:
         </tbody>
       </table>
     </section>
-  </main>
+{validation_section}  </main>
 </body>
 </html>
 """
 
-    HTML_REPORT.write_text(html_content, encoding="utf-8")
-    print(f"JSON report generated at: {JSON_REPORT}")
-    print(f"HTML report generated at: {HTML_REPORT}")
+    html_report.write_text(html_content, encoding="utf-8")
+    print(f"JSON report generated at: {json_report}")
+    print(f"HTML report generated at: {html_report}")
 
-    return 0 if meets_gate else 1
+    return json_report, html_report, meets_gate
 
 
 if __name__ == "__main__":
-    raise SystemExit(run_quality_checks())
+    parser = argparse.ArgumentParser(description="Run the test suite and validate the source data.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="Sales file or partitioned export to validate.")
+    parser.add_argument("--chunksize", type=int, default=None, help="Validate the source in streamed row chunks.")
+    args = parser.parse_args()
+    raise SystemExit(run_quality_checks(args.data, args.chunksize))
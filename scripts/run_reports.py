@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from graphlib import TopologicalSorter
+import json
+import sys
+import time
+import traceback
+from typing import Any, Callable, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from scripts.generate_business_snapshot import generate_business_snapshot
+from scripts.generate_monthly_report import OUTPUT_FILE, generate_monthly_summary
+from scripts.run_quality_checks import run_test_suite, write_quality_report
+from sales_automation.cache import load_summary
+from sales_automation.data import load_sales_data
+from sales_automation.validation import validate
+
+DATA_PATH = PROJECT_ROOT / "relatorio_vendas.csv"
+OUTPUT_DIR = PROJECT_ROOT / "artifacts"
+RUN_REPORT = OUTPUT_DIR / "report_run.json"
+DEFAULT_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """One node of the report graph.
+
+    ``run`` receives the results of the jobs named in ``depends_on``, keyed
+    by job name.
+    """
+
+    name: str
+    run: Callable[[dict[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+
+
+@dataclass
+class JobOutcome:
+    name: str
+    status: str
+    depends_on: tuple[str, ...] = ()
+    started_seconds: float = 0.0
+    duration_seconds: float = 0.0
+    error: str | None = None
+    result: Any = field(default=None, repr=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "depends_on": list(self.depends_on),
+            "started_seconds": self.started_seconds,
+            "duration_seconds": self.duration_seconds,
+            "error": self.error,
+        }
+
+
+def _run_timed(job: ReportJob, inputs: dict[str, Any], origin: float) -> JobOutcome:
+    started = time.perf_counter()
+    outcome = JobOutcome(job.name, "ok", job.depends_on, started_seconds=round(started - origin, 4))
+    try:
+        outcome.result = job.run(inputs)
+    except Exception:
+        outcome.status = "failed"
+        outcome.error = traceback.format_exc(limit=3)
+    outcome.duration_seconds = round(time.perf_counter() - started, 4)
+    return outcome
+
+
+def run_jobs(jobs: Sequence[ReportJob], max_workers: int = DEFAULT_WORKERS) -> dict[str, JobOutcome]:
+    """Run jobs on a thread pool as soon as their dependencies have succeeded.
+
+    Jobs whose dependencies failed (or were skipped) are skipped. Outcomes
+    are returned in completion order.
+    """
+    by_name = {job.name: job for job in jobs}
+    unknown = {dependency for job in jobs for dependency in job.depends_on} - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown job dependencies: {sorted(unknown)}")
+
+    sorter = TopologicalSorter({job.name: job.depends_on for job in jobs})
+    sorter.prepare()
+    outcomes: dict[str, JobOutcome] = {}
+    origin = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report") as pool:
+        running: dict[Future[JobOutcome], str] = {}
+        while sorter.is_active():
+            for name in sorter.get_ready():
+                job = by_name[name]
+                if any(outcomes[dependency].status != "ok" for dependency in job.depends_on):
+                    outcomes[name] = JobOutcome(name, "skipped", job.depends_on)
+                    sorter.done(name)
+                    continue
+                inputs = {dependency: outcomes[dependency].result for dependency in job.depends_on}
+                running[pool.submit(_run_timed, job, inputs, origin)] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                outcomes[name] = future.result()
+                sorter.done(name)
+    return outcomes
+
+
+def build_jobs(
+    data_path: Path = DATA_PATH,
+    output_dir: Path = OUTPUT_DIR,
+    include_tests: bool = True,
+) -> list[ReportJob]:
+    """The standard report graph: the dataset is loaded once and shared by every generator."""
+    jobs = [
+        ReportJob("load_dataset", lambda _: load_sales_data(data_path, use_cache=True)),
+        ReportJob(
+            "sales_summary",
+            lambda inputs: load_summary(data_path, data=inputs["load_dataset"]),
+            depends_on=("load_dataset",),
+        ),
+        ReportJob(
+            "monthly_summary",
+            lambda inputs: generate_monthly_summary(
+                data_path=data_path,
+                output_file=output_dir / OUTPUT_FILE.name,
+                summary=inputs["sales_summary"],
+            ),
+            depends_on=("sales_summary",),
+        ),
+        ReportJob(
+            "business_snapshot",
+            lambda inputs: generate_business_snapshot(
+                data_path=data_path,
+                output_dir=output_dir,
+                data=inputs["load_dataset"],
+                summary=inputs["sales_summary"],
+            ),
+            depends_on=("load_dataset", "sales_summary"),
+        ),
+    ]
+    if include_tests:
+        jobs += [
+            ReportJob("test_suite", lambda _: run_test_suite()),
+            ReportJob("data_validation", lambda inputs: validate(inputs["load_dataset"]), depends_on=("load_dataset",)),
+            ReportJob(
+                "quality_report",
+                lambda inputs: write_quality_report(
+                    inputs["test_suite"],
+                    inputs["monthly_summary"],
+                    output_dir,
+                    validation=inputs["data_validation"],
+                ),
+                depends_on=("test_suite", "monthly_summary", "data_validation"),
+            ),
+        ]
+    return jobs
+
+
+def write_run_report(
+    outcomes: dict[str, JobOutcome],
+    wall_seconds: float,
+    max_workers: int,
+    output_file: Path = RUN_REPORT,
+) -> Path:
+    payload = {
+        "generated_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "workers": max_workers,
+        "wall_seconds": round(wall_seconds, 4),
+        "job_seconds_total": round(sum(outcome.duration_seconds for outcome in outcomes.values()), 4),
+        "jobs": [outcome.as_dict() for outcome in outcomes.values()],
+    }
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return output_file
+
+
+def run_reports(
+    data_path: Path = DATA_PATH,
+    output_dir: Path = OUTPUT_DIR,
+    include_tests: bool = True,
+    max_workers: int = DEFAULT_WORKERS,
+) -> tuple[dict[str, JobOutcome], Path]:
+    started = time.perf_counter()
+    outcomes = run_jobs(build_jobs(data_path, output_dir, include_tests), max_workers=max_workers)
+    wall_seconds = time.perf_counter() - started
+    run_report = write_run_report(outcomes, wall_seconds, max_workers, output_dir / RUN_REPORT.name)
+    return outcomes, run_report
+
+
+def _exit_code(outcomes: dict[str, JobOutcome]) -> int:
+    if any(outcome.status != "ok" for outcome in outcomes.values()):
+        return 1
+    quality = outcomes.get("quality_report")
+    return 0 if quality is None or quality.result[2] else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate every report artifact from a single dataset load.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Jobs run concurrently.")
+    parser.add_argument("--skip-tests", action="store_true", help="Skip the test suite and the quality report.")
+    args = parser.parse_args()
+
+    outcomes, run_report = run_reports(include_tests=not args.skip_tests, max_workers=args.workers)
+    for outcome in outcomes.values():
+        print(
+            f"{outcome.name:<18} {outcome.status:<8} "
+            f"start {outcome.started_seconds:>7.3f}s  took {outcome.duration_seconds:>7.3f}s"
+        )
+        if outcome.error:
+            print(outcome.error, file=sys.stderr)
+    print(f"Run timings written to: {run_report}")
+    raise SystemExit(_exit_code(outcomes))
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_PATH = PROJECT_ROOT / "src"
+
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from sales_automation.api import DEFAULT_HOST, DEFAULT_PORT, serve_forever
+
+
+DATA_PATH = PROJECT_ROOT / "relatorio_vendas.csv"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve dashboard KPIs and breakdowns as a JSON HTTP API.")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="Sales file or partitioned export to serve.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-watch", action="store_true", help="Do not hot-reload the source when it changes.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(serve_forever(args.data, args.host, args.port, watch=not args.no_watch))
+    except KeyboardInterrupt:
+        pass
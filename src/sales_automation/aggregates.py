@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .sketch import HyperLogLog, grouped_registers, hash_values, precision_for_error
+
+SUM_MEASURES = {
+    "Total": "revenue",
+    "Gross income": "gross_income",
+    "Rating": "rating_sum",
+}
+RESULT_COLUMNS = ["revenue", "orders", "avg_rating", "gross_income", "avg_ticket", "rows"]
+_ALL_ROWS_KEY = "__all__"
+
+
+class SalesAccumulator:
+    """Mergeable partial aggregates of sales rows, optionally grouped by dimensions.
+
+    Sums and row counts are additive across chunks. Distinct ``Invoice ID``
+    counts are kept exact by retaining the unique (group, invoice) pairs,
+    so memory grows with the number of orders, not with the number of rows.
+    With ``order_error`` each group keeps a HyperLogLog sketch instead, so
+    memory is fixed per group and merging never revisits invoice IDs.
+    """
+
+    def __init__(self, by: Sequence[str] = (), order_error: float | None = None) -> None:
+        self.by = list(by)
+        self.order_error = order_error
+        self._precision = precision_for_error(order_error) if order_error is not None else None
+        self._sketches: dict[object, HyperLogLog] = {}
+        self._totals: pd.DataFrame | None = None
+        self._pairs: pd.DataFrame | None = None
+        self._pending_pairs: list[pd.DataFrame] = []
+        self._pending_rows = 0
+
+    def _keys(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.by:
+            return chunk[self.by]
+        return pd.DataFrame({_ALL_ROWS_KEY: 0}, index=chunk.index)
+
+    def update(self, chunk: pd.DataFrame) -> SalesAccumulator:
+        if chunk.empty:
+            return self
+
+        keys = self._keys(chunk)
+        key_columns = list(keys.columns)
+        frame = pd.concat([keys, chunk[list(SUM_MEASURES)]], axis=1)
+        grouped = frame.groupby(key_columns, observed=True, sort=False)
+        partial = grouped[list(SUM_MEASURES)].sum().rename(columns=SUM_MEASURES)
+        partial["rows"] = grouped.size()
+        self._add_totals(partial)
+
+        if self._precision is not None:
+            self._update_sketches(keys, chunk["Invoice ID"])
+        else:
+            pairs = pd.concat([keys, chunk[["Invoice ID"]]], axis=1).dropna().drop_duplicates()
+            self._add_pairs(pairs)
+        return self
+
+    def _update_sketches(self, keys: pd.DataFrame, invoices: pd.Series) -> None:
+        has_invoice = invoices.notna().to_numpy()
+        group_codes, groups = pd.factorize(pd.MultiIndex.from_frame(keys[has_invoice]))
+        registers = grouped_registers(hash_values(invoices), group_codes, len(groups), self._precision)
+        for group, group_registers in zip(groups, registers):
+            key = group if len(keys.columns) > 1 else group[0]
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                self._sketches[key] = HyperLogLog(self._precision, group_registers)
+            else:
+                np.maximum(sketch.registers, group_registers, out=sketch.registers)
+
+    def merge(self, other: SalesAccumulator) -> SalesAccumulator:
+        if other.by != self.by:
+            raise ValueError(f"Cannot merge accumulators grouped by {other.by} into {self.by}")
+        if other._precision != self._precision:
+            raise ValueError("Cannot merge accumulators with different order counting modes")
+        if other._totals is not None:
+            self._add_totals(other._totals)
+        for key, sketch in other._sketches.items():
+            if key in self._sketches:
+                self._sketches[key].merge(sketch)
+            else:
+                self._sketches[key] = HyperLogLog(sketch.precision, sketch.registers.copy())
+        for pairs in other._pair_frames():
+            self._add_pairs(pairs)
+        return self
+
+    def _add_totals(self, partial: pd.DataFrame) -> None:
+        if self._totals is None:
+            self._totals = partial
+        else:
+            self._totals = self._totals.add(partial, fill_value=0)
+
+    def _pair_frames(self) -> list[pd.DataFrame]:
+        frames = list(self._pending_pairs)
+        if self._pairs is not None:
+            frames.append(self._pairs)
+        return frames
+
+    def _add_pairs(self, pairs: pd.DataFrame) -> None:
+        self._pending_pairs.append(pairs)
+        self._pending_rows += len(pairs)
+        # Deduplicate once pending pairs outgrow the consolidated set (amortized linear cost).
+        consolidated_rows = 0 if self._pairs is None else len(self._pairs)
+        if self._pending_rows > max(consolidated_rows, 10_000):
+            self._consolidate_pairs()
+
+    def _consolidate_pairs(self) -> pd.DataFrame | None:
+        if self._pending_pairs:
+            self._pairs = pd.concat(self._pair_frames(), ignore_index=True).drop_duplicates()
+            self._pending_pairs = []
+            self._pending_rows = 0
+        return self._pairs
+
+    def result(self) -> pd.DataFrame:
+        """Return one row per group with revenue, orders, averages and row counts."""
+        key_columns = self.by or [_ALL_ROWS_KEY]
+        if self._totals is None:
+            return pd.DataFrame(columns=self.by + RESULT_COLUMNS)
+
+        totals = self._totals.copy()
+        if self._precision is not None:
+            totals["orders"] = pd.Series(
+                {key: round(sketch.count()) for key, sketch in self._sketches.items()}, dtype="float64"
+            )
+        else:
+            pairs = self._consolidate_pairs()
+            totals["orders"] = pairs.groupby(key_columns, observed=True).size()
+        totals["orders"] = totals["orders"].fillna(0).astype(int)
+        totals["rows"] = totals["rows"].astype(int)
+        totals["avg_rating"] = totals["rating_sum"] / totals["rows"]
+        totals["avg_ticket"] = totals["revenue"] / totals["orders"]
+
+        summary = totals.reset_index()[key_columns + RESULT_COLUMNS]
+        if not self.by:
+            summary = summary.drop(columns=[_ALL_ROWS_KEY])
+        return summary.sort_values(self.by).reset_index(drop=True) if self.by else summary
+
+
+def accumulate(
+    chunks: Iterable[pd.DataFrame],
+    groupings: Sequence[Sequence[str]],
+    order_error: float | None = None,
+) -> list[SalesAccumulator]:
+    """Feed every chunk once to one accumulator per grouping."""
+    accumulators = [SalesAccumulator(by, order_error) for by in groupings]
+    for chunk in chunks:
+        for accumulator in accumulators:
+            accumulator.update(chunk)
+    return accumulators
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass
+import hashlib
+from http import HTTPStatus
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Hashable, Mapping
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .cache import DatasetSnapshot, SalesCache, get_shared_cache
+from .data import DATA_PATH
+from .engine import METRIC_OUTPUTS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8050
+MAX_HEADER_LINES = 100
+FILTER_PARAMETERS = {"month": "months", "city": "cities", "product_line": "product_lines"}
+
+
+@dataclass(frozen=True)
+class ApiResponse:
+    status: int
+    body: bytes = b""
+    etag: str | None = None
+    content_type: str = "application/json"
+
+    def encode(self, keep_alive: bool = True, include_body: bool = True) -> bytes:
+        reason = HTTPStatus(self.status).phrase
+        headers = [
+            f"HTTP/1.1 {self.status} {reason}",
+            f"Content-Type: {self.content_type}",
+            f"Content-Length: {len(self.body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if self.etag is not None:
+            headers += [f"ETag: {self.etag}", "Cache-Control: no-cache"]
+        head = ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1")
+        return head + self.body if include_body else head
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value: object) -> object:
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        return value.astype(object).where(value.notna(), None).to_dict(orient="records")
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def encode_json(payload: Any) -> bytes:
+    return json.dumps(_jsonable(payload), default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _query_values(query: dict[str, list[str]], name: str) -> list[str]:
+    return [value for raw in query.get(name, []) for value in raw.split(",") if value]
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class MetricsAPI:
+    """Headless JSON API over the shared dataset snapshot and metric cache.
+
+    Routes: ``/kpis``, ``/metrics`` (``outputs=kpis,by_city,...``),
+    ``/filters`` and ``/health``; ``month``, ``city`` and ``product_line``
+    filter like the dashboard (repeat them or separate values with commas).
+    ETags are derived from the dataset version and the normalized query, so
+    an ``If-None-Match`` hit is answered without computing anything, and
+    identical concurrent requests share one computation on the thread pool.
+    """
+
+    def __init__(self, data_path: Path | str = DATA_PATH, cache: SalesCache | None = None) -> None:
+        self.data_path = Path(data_path)
+        self.cache = cache or get_shared_cache()
+        self.stats = {"requests": 0, "not_modified": 0, "coalesced": 0, "computed": 0}
+        self._inflight: dict[Hashable, asyncio.Future[bytes]] = {}
+
+    async def handle(self, method: str, target: str, headers: Mapping[str, str] | None = None) -> ApiResponse:
+        """Answer one request; ``headers`` use lower-case names."""
+        self.stats["requests"] += 1
+        if method not in ("GET", "HEAD"):
+            return ApiResponse(HTTPStatus.METHOD_NOT_ALLOWED, encode_json({"error": f"{method} is not supported"}))
+
+        url = urlsplit(target)
+        route = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        try:
+            if route == "/health":
+                snapshot = await self._snapshot()
+                return ApiResponse(HTTPStatus.OK, encode_json({"status": "ok", "version": snapshot.version}))
+            return await self._cached_route(route, query, (headers or {}).get("if-none-match"))
+        except ApiError as exc:
+            return ApiResponse(exc.status, encode_json({"error": str(exc)}))
+        except Exception:
+            logger.exception("Failed to answer %s %s", method, target)
+            return ApiResponse(HTTPStatus.INTERNAL_SERVER_ERROR, encode_json({"error": "internal error"}))
+
+    async def _snapshot(self) -> DatasetSnapshot:
+        return await asyncio.get_running_loop().run_in_executor(None, self.cache.dataset, self.data_path)
+
+    async def _cached_route(self, route: str, query: dict[str, list[str]], if_none_match: str | None) -> ApiResponse:
+        snapshot = await self._snapshot()
+        filters = {name: _query_values(query, parameter) for parameter, name in FILTER_PARAMETERS.items()}
+        selection = self.cache.normalize_selection(snapshot, **filters)
+
+        if route == "/filters":
+            outputs: tuple[str, ...] = ()
+            build: Callable[[], bytes] = lambda: encode_json({"version": snapshot.version, **snapshot.dimension_values})
+        elif route in ("/kpis", "/metrics"):
+            outputs = ("kpis",) if route == "/kpis" else tuple(_query_values(query, "outputs")) or METRIC_OUTPUTS
+            unknown = sorted(set(outputs) - set(METRIC_OUTPUTS))
+            if unknown:
+                raise ApiError(HTTPStatus.BAD_REQUEST, f"Unknown outputs {unknown}; expected any of {list(METRIC_OUTPUTS)}")
+            metric_filters = {name: list(values or []) for name, values in zip(filters, selection)}
+            build = lambda: encode_json(self.cache.metrics(snapshot, outputs=outputs, **metric_filters))
+        else:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown route {route}")
+
+        # The leading ("api", path, version) lets the cache drop these bodies when a new version is installed.
+        key = ("api", str(snapshot.path), snapshot.version, route, outputs, selection)
+        etag = '"' + hashlib.blake2b(repr(key).encode("utf-8"), digest_size=12).hexdigest() + '"'
+        if _matches(if_none_match, etag):
+            self.stats["not_modified"] += 1
+            return ApiResponse(HTTPStatus.NOT_MODIFIED, etag=etag)
+
+        body = await self._coalesced(key, lambda: self.cache.results.get_or_compute(key, self._counted(build)))
+        return ApiResponse(HTTPStatus.OK, body, etag=etag)
+
+    def _counted(self, build: Callable[[], bytes]) -> Callable[[], bytes]:
+        def compute() -> bytes:
+            self.stats["computed"] += 1
+            return build()
+
+        return compute
+
+    async def _coalesced(self, key: Hashable, compute: Callable[[], bytes]) -> bytes:
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.get_running_loop().run_in_executor(None, compute)
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded so one disconnecting client does not cancel the result the others wait for.
+        return await asyncio.shield(pending)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """Start listening; use ``server.sockets[0].getsockname()`` to find an ephemeral port."""
+        return await asyncio.start_server(self._on_connection, host, port)
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers = request
+                response = await self.handle(method, target, headers)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(response.encode(keep_alive, include_body=method != "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ApiError as exc:
+            writer.write(ApiResponse(exc.status, encode_json({"error": str(exc)})).encode(keep_alive=False))
+            with suppress(ConnectionError):
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> tuple[str, str, str, dict[str, str]] | None:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers: dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return parts[0], parts[1], parts[2], headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many header lines")
+
+
+async def serve_forever(
+    data_path: Path | str = DATA_PATH,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    watch: bool = True,
+) -> None:
+    """Load the dataset once, optionally hot-reload it, and serve until cancelled."""
+    api = MetricsAPI(data_path)
+    if watch:
+        api.cache.watch(api.data_path)
+    else:
+        api.cache.dataset(api.data_path)
+    server = await api.serve(host, port)
+    logger.info("Serving %s on http://%s:%s", api.data_path, host, port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,615 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+import hashlib
+import os
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .catalog import FilterCatalog, build_catalog, read_catalog, write_catalog
+from .cube import SalesCube
+from .customers import CUSTOMER_OUTPUTS, compute_customer_metrics
+from .data import filter_sales_data, iter_sales_chunks, load_sales_data
+from .engine import METRIC_OUTPUTS, compute_metrics
+from .export import EXPORT_FORMATS, prune_exports, write_export
+from .index import INDEX_DIMENSIONS, SalesIndex
+from .periods import PeriodMetrics
+from .partitions import discover_partitions, is_partitioned_source, partitions_version
+from .summary import SalesSummary, read_summary, write_summary
+from .telemetry import span
+
+if TYPE_CHECKING:
+    from .watcher import DatasetWatcher
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 15 * 60
+# Rebuilds tried when a concurrent prune removes an export before it is opened.
+EXPORT_OPEN_ATTEMPTS = 3
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed by :class:`ResultCache`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Approximate the memory held by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    expires_at: float
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by entry count and bytes, with a TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+        ttl_seconds: float | None = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        nbytes = estimate_nbytes(value)
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, nbytes, expires_at)
+            self._stats.bytes += nbytes
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.bytes = 0
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; return how many were dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def bytes_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Bytes held by the entries whose key matches ``predicate``."""
+        with self._lock:
+            return sum(entry.nbytes for key, entry in self._entries.items() if predicate(key))
+
+    def trim_where(self, predicate: Callable[[Hashable], bool], max_bytes: int) -> int:
+        """Evict the least recently used matching entries until they hold at most ``max_bytes``."""
+        with self._lock:
+            matching = [(key, entry.nbytes) for key, entry in self._entries.items() if predicate(key)]
+            held = sum(nbytes for _, nbytes in matching)
+            evicted = 0
+            for key, nbytes in matching:
+                if held <= max_bytes:
+                    break
+                self._remove(key)
+                held -= nbytes
+                evicted += 1
+            self._stats.evictions += evicted
+        return evicted
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "entries": len(self._entries)})
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._stats.bytes -= entry.nbytes
+
+    def _evict(self) -> None:
+        # The newest entry is always kept, even when it alone exceeds ``max_bytes``.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._stats.bytes > self.max_bytes)
+        ):
+            self._remove(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+
+@dataclass(frozen=True)
+class DatasetSnapshot:
+    """One loaded version of a source file, shared read-only by every session."""
+
+    path: Path
+    version: str
+    frame: pd.DataFrame = field(repr=False)
+    cube: SalesCube = field(repr=False)
+    index: SalesIndex = field(repr=False)
+    catalog: FilterCatalog = field(repr=False)
+    summary: SalesSummary = field(repr=False)
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def dimension_values(self) -> dict[str, list[object]]:
+        return {dimension: self.catalog.options(dimension) for dimension in INDEX_DIMENSIONS.values()}
+
+    @cached_property
+    def nbytes(self) -> int:
+        """Approximate memory held by the rows, cube, filter index and summary."""
+        return (
+            estimate_nbytes(self.frame)
+            + estimate_nbytes(vars(self.cube))
+            + estimate_nbytes(vars(self.index))
+            + self.summary.nbytes
+        )
+
+
+def source_version(data_path: Path | str) -> str:
+    """Identify a source version by size and modification time (of every partition)."""
+    if is_partitioned_source(data_path):
+        return partitions_version(discover_partitions(data_path))
+    stat = Path(data_path).stat()
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def load_summary(
+    data_path: Path | str,
+    data: pd.DataFrame | None = None,
+    chunksize: int | None = None,
+    version: str | None = None,
+) -> SalesSummary:
+    """Return the stored daily summary for the current source version, rebuilding it when stale.
+
+    A rebuild aggregates ``data`` when given (an already loaded frame of the
+    source), otherwise the source itself, streamed in ``chunksize`` rows when
+    set, and stores the result for the next caller.
+    """
+    path = Path(data_path)
+    version = version or source_version(path)
+    summary = read_summary(path, version)
+    if summary is not None:
+        return summary
+
+    with span("build_summary", path=str(path)):
+        summary = SalesSummary(version=version)
+        if data is not None:
+            summary.update(data)
+        elif chunksize:
+            for chunk in iter_sales_chunks(path, chunksize=chunksize):
+                summary.update(chunk)
+        else:
+            summary.update(load_sales_data(path, use_cache=True))
+    write_summary(path, summary)
+    return summary
+
+
+def build_snapshot(data_path: Path | str, version: str | None = None) -> DatasetSnapshot:
+    """Load a source file and build the shared cube, filter index, filter catalog and summary for it.
+
+    The catalog and summary are also stored as sidecars, so the next cold
+    start can draw its filters before loading the rows and reports can skip
+    the rows altogether.
+    """
+    path = Path(data_path)
+    version = version or source_version(path)
+    frame = load_sales_data(path, use_cache=True, compact=True)
+    catalog = read_catalog(path, version)
+    if catalog is None:
+        catalog = build_catalog(frame, version)
+        write_catalog(path, catalog)
+    return DatasetSnapshot(
+        path=path,
+        version=version,
+        frame=frame,
+        cube=SalesCube.from_frame(frame),
+        index=SalesIndex.build(frame),
+        catalog=catalog,
+        summary=load_summary(path, frame, version=version),
+    )
+
+
+def _normalize_values(
+    selected: Sequence[object] | None,
+    available: list[object],
+    complete: bool,
+) -> tuple[object, ...] | None:
+    if not selected:
+        return None
+    values = tuple(sorted(set(selected), key=str))
+    # Selecting every value is the same query as not filtering, unless some rows lack a label.
+    if complete and set(values) >= set(available):
+        return None
+    return values
+
+
+class SalesCache:
+    """Process-wide dataset snapshots plus memoized metric results.
+
+    Each source file is loaded once per version and shared by every caller
+    (no per-session copies). Metric results and filtered frames are memoized
+    in a :class:`ResultCache` keyed by dataset version and the normalized
+    filter selection, so equivalent selections share one entry.
+    """
+
+    def __init__(
+        self,
+        result_cache: ResultCache | None = None,
+        loader: Callable[[Path | str, str], DatasetSnapshot] = build_snapshot,
+        export_dir: Path | str | None = None,
+    ) -> None:
+        self.results = result_cache or ResultCache()
+        self._loader = loader
+        self.export_dir = Path(export_dir) if export_dir is not None else Path(tempfile.gettempdir()) / "sales_exports"
+        self._snapshots: dict[Path, DatasetSnapshot] = {}
+        self._watchers: dict[Path, DatasetWatcher] = {}
+        self._loading: dict[Path, Future[DatasetSnapshot]] = {}
+        self._building: dict[tuple[Path, str], Future[DatasetSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def dataset(self, data_path: Path | str) -> DatasetSnapshot:
+        """Return the shared snapshot for the current version of ``data_path``.
+
+        Watched paths return the installed snapshot without touching the
+        source; their reloads happen on the watcher thread. Loads run outside
+        the cache lock, so requests for other datasets are not blocked, and
+        concurrent requests for the same version wait for a single load.
+        """
+        path = Path(data_path).resolve()
+        with self._lock:
+            previous = self._snapshots.get(path)
+            if previous is not None and path in self._watchers:
+                return previous
+
+            version = source_version(path)
+            if previous is not None and previous.version == version:
+                return previous
+            # Concurrent requests for the same version share one load, which runs outside the lock.
+            future = self._building.get((path, version))
+            owner = future is None
+            if owner:
+                future = self._building[(path, version)] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            snapshot = self._loader(path, version)
+        except BaseException as exc:
+            with self._lock:
+                self._building.pop((path, version), None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._building.pop((path, version), None)
+            # A snapshot installed while this one loaded is at least as recent; keep it.
+            if self._snapshots.get(path) is previous:
+                self._install_locked(snapshot)
+        future.set_result(snapshot)
+        return snapshot
+
+    def current(self, data_path: Path | str) -> DatasetSnapshot | None:
+        """Return the installed snapshot for ``data_path`` without checking the source."""
+        with self._lock:
+            return self._snapshots.get(Path(data_path).resolve())
+
+    def load_snapshot(self, data_path: Path | str, version: str) -> DatasetSnapshot:
+        """Build a snapshot without installing it (used for off-request reloads)."""
+        return self._loader(Path(data_path).resolve(), version)
+
+    def install(self, snapshot: DatasetSnapshot, replace_only: bool = False) -> bool:
+        """Atomically make ``snapshot`` the current version of its source; return whether it was installed.
+
+        With ``replace_only`` nothing is installed unless a snapshot of the
+        source is still loaded, so a reload that finishes after
+        :meth:`unload` does not bring the dataset back.
+        """
+        with self._lock:
+            if replace_only and snapshot.path not in self._snapshots:
+                return False
+            self._install_locked(snapshot)
+        return True
+
+    def _install_locked(self, snapshot: DatasetSnapshot) -> None:
+        previous = self._snapshots.get(snapshot.path)
+        self._snapshots[snapshot.path] = snapshot
+        if previous is not None and previous.version != snapshot.version:
+            path_key, stale_version = str(previous.path), previous.version
+            self.results.discard_where(lambda key: key[1] == path_key and key[2] == stale_version)
+
+    def unload(self, data_path: Path | str) -> bool:
+        """Drop the snapshot, watcher and memoized results of ``data_path``; return whether it was loaded.
+
+        The next :meth:`dataset` call loads it again, from the columnar cache
+        when the source is unchanged.
+        """
+        path = Path(data_path).resolve()
+        with self._lock:
+            snapshot = self._snapshots.pop(path, None)
+            watcher = self._watchers.pop(path, None)
+            self._loading.pop(path, None)
+        if watcher is not None:
+            # Signal only: the request that unloads must not wait for a reload in progress,
+            # which finds the snapshot gone and discards its result.
+            watcher.stop(timeout=0)
+        path_key = str(path)
+        self.results.discard_where(lambda key: key[1] == path_key)
+        return snapshot is not None
+
+    def watch(self, data_path: Path | str, interval_seconds: float | None = None, start: bool = True) -> DatasetWatcher:
+        """Load ``data_path`` now and keep it fresh from a background watcher thread."""
+        from .watcher import DEFAULT_POLL_SECONDS, DatasetWatcher
+
+        path = Path(data_path).resolve()
+        self.dataset(path)
+        with self._lock:
+            watcher = self._watchers.get(path)
+            if watcher is None:
+                watcher = DatasetWatcher(self, path, interval_seconds or DEFAULT_POLL_SECONDS)
+                self._watchers[path] = watcher
+        if start:
+            watcher.start()
+        return watcher
+
+    def load_in_background(self, data_path: Path | str, watch: bool = True) -> Future[DatasetSnapshot]:
+        """Start loading ``data_path`` on a daemon thread, once per path.
+
+        The future resolves to the first snapshot (and the path is watched
+        from then on with ``watch``); later versions still come from
+        :meth:`dataset`. A failed load is retried on the next call.
+        """
+        path = Path(data_path).resolve()
+        with self._lock:
+            future = self._loading.get(path)
+            if future is not None and not (future.done() and future.exception() is not None):
+                return future
+            future = self._loading[path] = Future()
+
+        def load() -> None:
+            try:
+                if watch:
+                    self.watch(path)
+                future.set_result(self.dataset(path))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        threading.Thread(target=load, name=f"dataset-loader:{path.name}", daemon=True).start()
+        return future
+
+    def normalize_selection(
+        self,
+        snapshot: DatasetSnapshot,
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> tuple[tuple[object, ...] | None, ...]:
+        """Canonical form of a filter selection, used as part of cache keys."""
+        selections = (months, cities, product_lines)
+        return tuple(
+            _normalize_values(
+                selected,
+                snapshot.dimension_values[dimension],
+                snapshot.index.complete[dimension],
+            )
+            for selected, dimension in zip(selections, INDEX_DIMENSIONS.values())
+        )
+
+    def metrics(
+        self,
+        snapshot: DatasetSnapshot,
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+        outputs: Sequence[str] = METRIC_OUTPUTS,
+    ) -> dict[str, Any]:
+        """Return memoized engine results for a filter selection (treat as read-only)."""
+        selection = self.normalize_selection(snapshot, months, cities, product_lines)
+        key = ("metrics", str(snapshot.path), snapshot.version, tuple(outputs), selection)
+        month_values, city_values, product_values = (list(values or []) for values in selection)
+
+        with span("cache.metrics", cache="hit", outputs=len(outputs)) as active:
+
+            def compute() -> dict[str, Any]:
+                active.set(cache="miss")
+                return compute_metrics(
+                    snapshot.cube.slice(months=month_values, cities=city_values, product_lines=product_values),
+                    outputs,
+                )
+
+            return self.results.get_or_compute(key, compute)
+
+    def filtered_frame(
+        self,
+        snapshot: DatasetSnapshot,
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Return the memoized filtered rows for a selection (treat as read-only)."""
+        selection = self.normalize_selection(snapshot, months, cities, product_lines)
+        if selection == (None, None, None):
+            return snapshot.frame
+
+        key = ("rows", str(snapshot.path), snapshot.version, selection)
+        month_values, city_values, product_values = (list(values or []) for values in selection)
+
+        with span("cache.filtered_frame", cache="hit") as active:
+
+            def compute() -> pd.DataFrame:
+                active.set(cache="miss")
+                return filter_sales_data(
+                    snapshot.frame,
+                    months=month_values,
+                    cities=city_values,
+                    product_lines=product_values,
+                    index=snapshot.index,
+                )
+
+            filtered = self.results.get_or_compute(key, compute)
+            active.set(rows=len(filtered))
+            return filtered
+
+    def period_metrics(
+        self,
+        snapshot: DatasetSnapshot,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> PeriodMetrics:
+        """Return memoized rolling and period-over-period metrics over the whole timeline.
+
+        Only the city and product line filters apply: windows and growth
+        rates need the neighbouring months regardless of the month filter.
+        They are computed from the snapshot's daily summary, not the rows.
+        """
+        selection = self.normalize_selection(snapshot, None, cities, product_lines)
+        key = ("periods", str(snapshot.path), snapshot.version, selection)
+        return self.results.get_or_compute(key, lambda: snapshot.summary.select(*selection[1:]).periods())
+
+    def customer_metrics(
+        self,
+        snapshot: DatasetSnapshot,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> dict[str, Any]:
+        """Return memoized customer metrics (repeat rate, cohorts, RFM, customer types).
+
+        Like :meth:`period_metrics`, the month filter does not apply:
+        recency and cohort retention need each customer's whole history.
+        """
+        selection = self.normalize_selection(snapshot, None, cities, product_lines)
+        key = ("customers", str(snapshot.path), snapshot.version, selection)
+        return self.results.get_or_compute(
+            key,
+            lambda: compute_customer_metrics(
+                self.filtered_frame(snapshot, None, cities, product_lines), CUSTOMER_OUTPUTS
+            ),
+        )
+
+    def export(
+        self,
+        snapshot: DatasetSnapshot,
+        fmt: str = "csv",
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> Path:
+        """Return a file holding the filtered rows of a selection in ``fmt``.
+
+        Files are named after the version, selection and format, so one is
+        written in chunks on first request and then shared by every session.
+        A hit refreshes the file's modification time, so pruning drops the
+        least recently used exports first.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {fmt!r}; expected one of {tuple(EXPORT_FORMATS)}")
+        selection = self.normalize_selection(snapshot, months, cities, product_lines)
+        key = ("export", str(snapshot.path), snapshot.version, selection, fmt)
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=12).hexdigest()
+        output = self.export_dir / f"{digest}{EXPORT_FORMATS[fmt].suffix}"
+
+        with span("cache.export", cache="hit", format=fmt) as active:
+            try:
+                os.utime(output)
+            except FileNotFoundError:
+                active.set(cache="miss")
+                write_export(self.filtered_frame(snapshot, months, cities, product_lines), output, fmt)
+                prune_exports(self.export_dir)
+            return output
+
+    def open_export(
+        self,
+        snapshot: DatasetSnapshot,
+        fmt: str = "csv",
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> BinaryIO:
+        """Open the :meth:`export` file of a selection for reading.
+
+        Another session may prune the file between :meth:`export` and the
+        open; it is then written again. The open handle stays readable after
+        a later prune.
+        """
+        for _ in range(EXPORT_OPEN_ATTEMPTS - 1):
+            try:
+                return self.export(snapshot, fmt, months, cities, product_lines).open("rb")
+            except FileNotFoundError:
+                continue
+        return self.export(snapshot, fmt, months, cities, product_lines).open("rb")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            datasets = len(self._snapshots)
+        return {**self.results.stats().as_dict(), "datasets": datasets}
+
+
+_shared_cache: SalesCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SalesCache:
+    """Return the cache shared by every session in this process."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SalesCache()
+        return _shared_cache
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+import pandas as pd
+
+from .columnar import CACHE_DIR_NAME
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT_VERSION = 1
+CATALOG_DIMENSIONS = ("Month", "City", "Product line")
+
+
+@dataclass(frozen=True)
+class FilterCatalog:
+    """Everything the filter sidebar needs, without the rows.
+
+    ``counts`` maps each filter dimension to its distinct non-null values
+    (sorted) and how many rows carry each one. The catalog is a few
+    kilobytes, so a cold dashboard can draw its filters before the dataset
+    itself has loaded.
+    """
+
+    version: str
+    rows: int
+    min_date: str | None
+    max_date: str | None
+    counts: dict[str, dict[str, int]] = field(repr=False)
+
+    def options(self, dimension: str) -> list[str]:
+        return list(self.counts.get(dimension, {}))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"format_version": CATALOG_FORMAT_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> FilterCatalog:
+        return cls(
+            version=payload["version"],
+            rows=int(payload["rows"]),
+            min_date=payload["min_date"],
+            max_date=payload["max_date"],
+            counts={dimension: dict(values) for dimension, values in payload["counts"].items()},
+        )
+
+
+def build_catalog(df: pd.DataFrame, version: str) -> FilterCatalog:
+    """Summarize a normalized sales frame (plain or compact schema)."""
+    counts = {}
+    for dimension in CATALOG_DIMENSIONS:
+        if dimension not in df.columns:
+            continue
+        values = df[dimension].value_counts(sort=False, dropna=True)
+        counts[dimension] = {str(value): int(count) for value, count in sorted(values.items()) if count > 0}
+
+    dates = df["Date"] if "Date" in df.columns else pd.Series(dtype="datetime64[ns]")
+    min_date, max_date = dates.min(), dates.max()
+    return FilterCatalog(
+        version=version,
+        rows=len(df),
+        min_date=None if pd.isna(min_date) else min_date.strftime("%Y-%m-%d"),
+        max_date=None if pd.isna(max_date) else max_date.strftime("%Y-%m-%d"),
+        counts=counts,
+    )
+
+
+def catalog_path(data_path: Path | str) -> Path | None:
+    """Sidecar location for a source file or partition directory (globs have none)."""
+    path = Path(data_path)
+    if path.is_dir():
+        return path / CACHE_DIR_NAME / "partitions.catalog.json"
+    if path.is_file():
+        return path.parent / CACHE_DIR_NAME / f"{path.name}.catalog.json"
+    return None
+
+
+def read_catalog(data_path: Path | str, version: str | None = None) -> FilterCatalog | None:
+    """Return the stored catalog, or ``None`` when it is missing, unreadable or not for ``version``."""
+    path = catalog_path(data_path)
+    if path is None:
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("format_version") != CATALOG_FORMAT_VERSION:
+            return None
+        catalog = FilterCatalog.from_dict(payload)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if version is not None and catalog.version != version:
+        return None
+    return catalog
+
+
+def write_catalog(data_path: Path | str, catalog: FilterCatalog) -> Path | None:
+    """Store the catalog next to the source; failures are logged, never raised."""
+    path = catalog_path(data_path)
+    if path is None:
+        return None
+    temporary = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(json.dumps(catalog.as_dict(), separators=(",", ":")), encoding="utf-8")
+        os.replace(temporary, path)
+    except OSError as exc:
+        logger.warning("Unable to write filter catalog for %s: %s", data_path, exc)
+        temporary.unlink(missing_ok=True)
+        return None
+    return path
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = ".sales_cache"
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    """Identity of a source file used to validate its columnar cache."""
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+
+def _hash_file(data_path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with data_path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_source(data_path: Path | str) -> SourceFingerprint:
+    """Fingerprint a source file by size, modification time and content hash."""
+    path = Path(data_path)
+    stat = path.stat()
+    return SourceFingerprint(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        content_hash=_hash_file(path),
+    )
+
+
+def cache_paths(data_path: Path | str) -> tuple[Path, Path]:
+    """Return the Arrow IPC file and metadata sidecar used for a source file."""
+    path = Path(data_path)
+    cache_dir = path.parent / CACHE_DIR_NAME
+    return cache_dir / f"{path.name}.arrow", cache_dir / f"{path.name}.meta.json"
+
+
+def _read_metadata(meta_path: Path) -> dict | None:
+    try:
+        metadata = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if metadata.get("format_version") != CACHE_FORMAT_VERSION:
+        return None
+    return metadata
+
+
+def _cache_is_fresh(data_path: Path, meta_path: Path, metadata: dict) -> bool:
+    stored = metadata.get("source", {})
+    stat = data_path.stat()
+
+    if stat.st_size != stored.get("size"):
+        return False
+    if stat.st_mtime_ns == stored.get("mtime_ns"):
+        return True
+
+    # Same size but a new mtime: the file may only have been touched or copied.
+    content_hash = _hash_file(data_path)
+    if content_hash != stored.get("content_hash"):
+        return False
+
+    metadata["source"] = asdict(
+        SourceFingerprint(size=stat.st_size, mtime_ns=stat.st_mtime_ns, content_hash=content_hash)
+    )
+    try:
+        _write_atomic(meta_path, json.dumps(metadata, indent=2).encode("utf-8"))
+    except OSError:
+        pass
+    return True
+
+
+def _write_atomic(target: Path, payload: bytes) -> None:
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, target)
+
+
+def read_cached_frame(data_path: Path | str) -> pd.DataFrame | None:
+    """Return the cached normalized frame, or ``None`` when missing or stale."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    path = Path(data_path)
+    arrow_path, meta_path = cache_paths(path)
+    if not arrow_path.exists():
+        return None
+
+    metadata = _read_metadata(meta_path)
+    if metadata is None or not _cache_is_fresh(path, meta_path, metadata):
+        return None
+
+    frame = _read_arrow(arrow_path)
+    if frame is not None:
+        logger.debug("Loaded %s from columnar cache %s", path, arrow_path)
+    return frame
+
+
+def _read_arrow(arrow_path: Path) -> pd.DataFrame | None:
+    import pyarrow as pa
+
+    try:
+        with pa.memory_map(str(arrow_path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (OSError, pa.ArrowInvalid) as exc:
+        logger.warning("Ignoring unreadable sales cache %s: %s", arrow_path, exc)
+        return None
+    return table.to_pandas()
+
+
+def _hash_with_prefix(data_path: Path, prefix_bytes: int) -> tuple[str, str, bytes]:
+    # One pass yields the full-file hash and the hash of the first ``prefix_bytes``.
+    digest = hashlib.blake2b(digest_size=16)
+    prefix_hash = ""
+    last_prefix_byte = b""
+    remaining = prefix_bytes
+    with data_path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_BYTES), b""):
+            if 0 < remaining <= len(chunk):
+                digest.update(chunk[:remaining])
+                prefix_hash = digest.copy().hexdigest()
+                last_prefix_byte = chunk[remaining - 1 : remaining]
+                digest.update(chunk[remaining:])
+            else:
+                digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest(), prefix_hash, last_prefix_byte
+
+
+def read_appendable_cache(
+    data_path: Path | str,
+) -> tuple[pd.DataFrame, SourceFingerprint, SourceFingerprint] | None:
+    """Return a stale cache whose source has only had whole lines appended since.
+
+    The result is the cached frame, the fingerprint it was built from and
+    the current fingerprint; rows past ``stored.size`` still need parsing.
+    ``None`` means the source was rewritten (or never cached).
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+
+    path = Path(data_path)
+    arrow_path, meta_path = cache_paths(path)
+    metadata = _read_metadata(meta_path)
+    if metadata is None or not arrow_path.exists():
+        return None
+
+    try:
+        stored = SourceFingerprint(**metadata["source"])
+    except (KeyError, TypeError):
+        return None
+
+    stat = path.stat()
+    if not 0 < stored.size < stat.st_size:
+        return None
+
+    content_hash, prefix_hash, last_prefix_byte = _hash_with_prefix(path, stored.size)
+    if prefix_hash != stored.content_hash or last_prefix_byte != b"\n":
+        return None
+
+    frame = _read_arrow(arrow_path)
+    if frame is None:
+        return None
+
+    current = SourceFingerprint(size=stat.st_size, mtime_ns=stat.st_mtime_ns, content_hash=content_hash)
+    return frame, stored, current
+
+
+def write_cached_frame(
+    data_path: Path | str,
+    df: pd.DataFrame,
+    fingerprint: SourceFingerprint,
+) -> Path | None:
+    """Persist a normalized frame as Arrow IPC next to its source file."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    arrow_path, meta_path = cache_paths(data_path)
+    metadata = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source": asdict(fingerprint),
+        "rows": int(len(df)),
+    }
+
+    try:
+        arrow_path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = arrow_path.with_name(f"{arrow_path.name}.{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, arrow_path)
+        _write_atomic(meta_path, json.dumps(metadata, indent=2).encode("utf-8"))
+    except (OSError, pa.ArrowException) as exc:
+        logger.warning("Unable to write sales cache for %s: %s", data_path, exc)
+        return None
+
+    return arrow_path
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .sketch import estimate_cardinality, grouped_registers, hash_values, precision_for_error
+
+CUBE_DIMENSIONS = ("Month", "City", "Product line", "Payment", "Date")
+FILTER_DIMENSIONS = {"months": "Month", "cities": "City", "product_lines": "Product line"}
+SKETCH_DIMENSIONS = tuple(FILTER_DIMENSIONS.values())
+
+
+class SalesCube:
+    """Additive measures pre-aggregated at Month x City x Product line x Payment x Date grain.
+
+    Every cell holds revenue, gross income, rating sum/count and row count,
+    so any filter combination is answered by summing cells instead of
+    rescanning raw rows. Distinct orders are additive when every invoice
+    falls in a single cell; otherwise each cell keeps its invoice codes and
+    a selection is counted through an invoice bitmap.
+
+    Built with ``order_error``, the cube instead keeps one HyperLogLog
+    sketch per Month x City x Product line cell and estimates the orders of
+    a selection from the union of its sketches, without storing any IDs.
+    """
+
+    def __init__(
+        self,
+        values: dict[str, np.ndarray],
+        dtypes: dict[str, object],
+        codes: dict[str, np.ndarray],
+        measures: dict[str, np.ndarray],
+        cell_invoices: np.ndarray,
+        invoice_count: int,
+        order_sketches: np.ndarray | None = None,
+        sketch_cells: np.ndarray | None = None,
+    ) -> None:
+        self.values = values
+        self.dtypes = dtypes
+        self.codes = codes
+        self.measures = measures
+        self.cell_invoices = cell_invoices
+        self.invoice_count = invoice_count
+        self.order_sketches = order_sketches
+        self.sketch_cells = sketch_cells
+        self.invoices_are_cell_local = bool(
+            len(cell_invoices) == 0 or np.bincount(cell_invoices, minlength=invoice_count).max() <= 1
+        )
+
+    @property
+    def cell_count(self) -> int:
+        return len(self.measures["rows"])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, order_error: float | None = None) -> SalesCube:
+        """Build the cube from a normalized sales frame in one vectorized pass.
+
+        ``order_error`` switches distinct-order counting to per-cell sketches
+        with that relative standard error.
+        """
+        row_codes = []
+        values: dict[str, np.ndarray] = {}
+        dtypes: dict[str, object] = {}
+        for dimension in CUBE_DIMENSIONS:
+            codes, uniques = pd.factorize(df[dimension], sort=True, use_na_sentinel=False)
+            row_codes.append(codes)
+            values[dimension] = np.asarray(uniques)
+            dtypes[dimension] = df[dimension].dtype
+
+        shape = tuple(max(len(values[dimension]), 1) for dimension in CUBE_DIMENSIONS)
+        row_keys = np.ravel_multi_index(row_codes, shape) if len(df) else np.empty(0, dtype=np.int64)
+        cell_keys, row_cells = np.unique(row_keys, return_inverse=True)
+        cell_codes = np.unravel_index(cell_keys, shape)
+        cell_count = len(cell_keys)
+
+        ratings = df["Rating"].to_numpy(dtype=np.float64)
+        rated = ~np.isnan(ratings)
+        measures = {
+            "revenue": np.bincount(row_cells, weights=df["Total"].to_numpy(dtype=np.float64), minlength=cell_count),
+            "gross_income": np.bincount(
+                row_cells, weights=df["Gross income"].to_numpy(dtype=np.float64), minlength=cell_count
+            ),
+            "rating_sum": np.bincount(row_cells, weights=np.where(rated, ratings, 0.0), minlength=cell_count),
+            "rating_count": np.bincount(row_cells, weights=rated.astype(np.float64), minlength=cell_count),
+            "rows": np.bincount(row_cells, minlength=cell_count),
+        }
+
+        if order_error is not None:
+            order_sketches, sketch_cells = cls._build_sketches(df, cell_codes, row_cells, order_error)
+            return cls(
+                values=values,
+                dtypes=dtypes,
+                codes=dict(zip(CUBE_DIMENSIONS, cell_codes)),
+                measures=measures,
+                cell_invoices=np.empty(0, dtype=np.int64),
+                invoice_count=0,
+                order_sketches=order_sketches,
+                sketch_cells=sketch_cells,
+            )
+
+        invoice_codes, invoice_values = pd.factorize(df["Invoice ID"])
+        invoice_count = len(invoice_values)
+        stride = max(invoice_count, 1)
+        has_invoice = invoice_codes >= 0
+        # Unique (cell, invoice) pairs, ordered by cell so they can be masked per cell with np.repeat.
+        pair_keys = np.unique(row_cells[has_invoice].astype(np.int64) * stride + invoice_codes[has_invoice])
+        measures["orders"] = np.bincount(pair_keys // stride, minlength=cell_count)
+
+        return cls(
+            values=values,
+            dtypes=dtypes,
+            codes=dict(zip(CUBE_DIMENSIONS, cell_codes)),
+            measures=measures,
+            cell_invoices=pair_keys % stride,
+            invoice_count=invoice_count,
+        )
+
+    @staticmethod
+    def _build_sketches(
+        df: pd.DataFrame,
+        cell_codes: tuple[np.ndarray, ...],
+        row_cells: np.ndarray,
+        order_error: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Cube cells sharing Month, City and Product line share one sketch row.
+        positions = [CUBE_DIMENSIONS.index(dimension) for dimension in SKETCH_DIMENSIONS]
+        shape = tuple(int(cell_codes[position].max(initial=0)) + 1 for position in positions)
+        group_keys = (
+            np.ravel_multi_index([cell_codes[position] for position in positions], shape)
+            if len(row_cells)
+            else np.empty(0, dtype=np.int64)
+        )
+        _, sketch_cells = np.unique(group_keys, return_inverse=True)
+        group_count = int(sketch_cells.max(initial=-1)) + 1
+
+        has_invoice = df["Invoice ID"].notna().to_numpy()
+        hashes = hash_values(df["Invoice ID"])
+        registers = grouped_registers(
+            hashes,
+            sketch_cells[row_cells[has_invoice]],
+            group_count,
+            precision_for_error(order_error),
+        )
+        return registers, sketch_cells
+
+    def slice(
+        self,
+        months: list[str] | None = None,
+        cities: list[str] | None = None,
+        product_lines: list[str] | None = None,
+    ) -> CubeSlice:
+        """Select the cells matching the same filters as ``filter_sales_data``."""
+        mask = np.ones(self.cell_count, dtype=bool)
+        selections = {"months": months, "cities": cities, "product_lines": product_lines}
+        for argument, dimension in FILTER_DIMENSIONS.items():
+            selected = selections[argument]
+            if selected:
+                value_mask = np.isin(self.values[dimension], list(selected))
+                mask &= value_mask[self.codes[dimension]]
+        return CubeSlice(self, mask)
+
+
+class CubeSlice:
+    """A filtered view of a :class:`SalesCube` accepted by the metric functions."""
+
+    def __init__(self, cube: SalesCube, mask: np.ndarray) -> None:
+        self.cube = cube
+        self.mask = mask
+
+    def _total(self, measure: str) -> float:
+        return float(self.cube.measures[measure][self.mask].sum())
+
+    @property
+    def rows(self) -> int:
+        return int(self._total("rows"))
+
+    @property
+    def empty(self) -> bool:
+        return self.rows == 0
+
+    def order_count(self) -> int:
+        cube = self.cube
+        if cube.order_sketches is not None:
+            groups = np.unique(cube.sketch_cells[self.mask])
+            if len(groups) == 0:
+                return 0
+            return int(round(estimate_cardinality(cube.order_sketches[groups].max(axis=0))))
+        if cube.invoices_are_cell_local:
+            return int(self._total("orders"))
+
+        pair_mask = np.repeat(self.mask, cube.measures["orders"])
+        bitmap = np.zeros(cube.invoice_count, dtype=bool)
+        bitmap[cube.cell_invoices[pair_mask]] = True
+        return int(np.count_nonzero(bitmap))
+
+    def compute_kpis(self) -> dict[str, float]:
+        if self.empty:
+            return {
+                "revenue": 0.0,
+                "orders": 0.0,
+                "avg_ticket": 0.0,
+                "avg_rating": 0.0,
+                "gross_income": 0.0,
+            }
+
+        revenue = self._total("revenue")
+        orders = float(self.order_count())
+        rating_count = self._total("rating_count")
+
+        return {
+            "revenue": revenue,
+            "orders": orders,
+            "avg_ticket": revenue / orders if orders else 0.0,
+            "avg_rating": self._total("rating_sum") / rating_count if rating_count else float("nan"),
+            "gross_income": self._total("gross_income"),
+        }
+
+    def revenue_by(self, dimension: str) -> pd.DataFrame:
+        """Roll revenue up to one dimension, unsorted, like ``groupby(...)["Total"].sum()``."""
+        cube = self.cube
+        values = cube.values[dimension]
+        codes = cube.codes[dimension][self.mask]
+        totals = np.bincount(codes, weights=cube.measures["revenue"][self.mask], minlength=len(values))
+        present = (np.bincount(codes, minlength=len(values)) > 0) & ~pd.isna(values)
+
+        labels = pd.Series(values[present], name=dimension)
+        if isinstance(cube.dtypes[dimension], pd.CategoricalDtype):
+            labels = labels.astype(cube.dtypes[dimension])
+        return pd.DataFrame({dimension: labels, "Total": totals[present]})
@@ -1,27 +1,28 @@
 from __future__ import annotations
 
+from concurrent.futures import Future
+from contextlib import nullcontext
+from datetime import datetime
+import json
 from pathlib import Path
+import time
 
-import plotly.express as px
 import streamlit as st
 
-from .data import load_sales_data, filter_sales_data
-from .metrics import (
-    compute_kpis,
-    payment_mix,
-    revenue_by_city,
-    revenue_by_day,
-    revenue_by_product_line,
-)
-
-
-@st.cache_data(show_spinner=False)
-def get_data(data_path: str) -> object:
-    return load_sales_data(Path(data_path))
+from . import telemetry
+from .cache import DatasetSnapshot, SalesCache, source_version
+from .catalog import FilterCatalog, read_catalog
+from .export import EXPORT_FORMATS
+from .registry import DatasetRegistry, DatasetSpec, get_shared_registry
+from .telemetry import span
+from .trend import MARKER_POINT_LIMIT, MAX_TREND_POINTS, RESOLUTIONS, trend_series
 
+# URL parameter selecting a registered dataset, e.g. ``?dataset=north``.
+DATASET_PARAMETER = "dataset"
 
 
 def run_dashboard() -> None:
+    started = time.perf_counter()
     st.set_page_config(page_title="Sales Automation Dashboard", layout="wide")
 
     st.title("Sales Analytics Automation Case")
@@ -29,35 +30,127 @@ def run_dashboard() -> None:
         "End-to-end analytics workflow: data ingestion, KPI tracking, segmentation and export-ready insights."
     )
 
-    df = get_data("relatorio_vendas.csv")
+    profile = st.sidebar.checkbox(
+        "Profile this rerun",
+        value=False,
+        help="Time data loading, filtering, metrics and chart building for this rerun.",
+    )
+    if not profile:
+        _render_dashboard(started)
+        return
 
-    months = sorted(df["Month"].unique().tolist())
-    cities = sorted(df["City"].unique().tolist())
-    product_lines = sorted(df["Product line"].unique().tolist())
+    with telemetry.collect() as spans:
+        with span("run_dashboard"):
+            _render_dashboard(started)
+    _render_profile(spans)
 
-    with st.sidebar:
-        st.header("Filters")
 
-        selected_months = st.multiselect(
-            "Month",
-            options=months,
-            default=[months[-1]] if months else [],
-        )
-        selected_cities = st.multiselect("City", options=cities, default=cities)
-        selected_product_lines = st.multiselect(
-            "Product line",
-            options=product_lines,
-            default=product_lines,
+def _render_profile(spans: list[telemetry.Span]) -> None:
+    with st.expander("Profiling", expanded=True):
+        st.dataframe(telemetry.summarize(spans), use_container_width=True)
+        st.download_button(
+            label="Download trace (Chrome trace JSON)",
+            data=json.dumps(telemetry.to_chrome_trace(spans)).encode("utf-8"),
+            file_name="dashboard_trace.json",
+            mime="application/json",
         )
 
-    filtered_df = filter_sales_data(
-        df,
-        months=selected_months,
-        cities=selected_cities,
-        product_lines=selected_product_lines,
+
+def _select_dataset(registry: DatasetRegistry) -> DatasetSpec:
+    """The dataset named in the URL, switchable from the sidebar when several are registered."""
+    names = registry.names
+    requested = st.query_params.get(DATASET_PARAMETER)
+    selected = requested if requested in names else names[0]
+    if len(names) > 1:
+        selected = st.sidebar.selectbox("Dataset", options=names, index=names.index(selected))
+        st.query_params[DATASET_PARAMETER] = selected
+    return registry.spec(selected)
+
+
+def _filter_catalog(cache: SalesCache, data_path: Path, loading: Future[DatasetSnapshot]) -> FilterCatalog:
+    """The loaded snapshot's catalog, else the current sidecar, else wait for the first load."""
+    snapshot = cache.current(data_path)
+    if snapshot is not None:
+        return snapshot.catalog
+    catalog = read_catalog(data_path, source_version(data_path))
+    if catalog is not None:
+        return catalog
+    with st.spinner("Loading dataset..."):
+        return loading.result().catalog
+
+
+def _multiselect(catalog: FilterCatalog, dimension: str, default: list[str], dataset: str) -> list[str]:
+    counts = catalog.counts.get(dimension, {})
+    return st.multiselect(
+        dimension,
+        options=catalog.options(dimension),
+        default=default,
+        format_func=lambda value: f"{value} ({counts.get(value, 0):,})",
+        # Each dataset keeps its own selection when switching between them.
+        key=f"{dataset}:{dimension}",
     )
 
-    kpis = compute_kpis(filtered_df)
+
+def _render_dashboard(started: float) -> None:
+    registry = get_shared_registry()
+    cache = registry.cache
+    dataset = _select_dataset(registry)
+    # The rows load on a background thread while the sidebar is drawn from the filter catalog.
+    loading = registry.load_in_background(dataset.name)
+
+    with span("dashboard.first_paint", dataset=dataset.name):
+        catalog = _filter_catalog(cache, dataset.path, loading)
+        months = catalog.options("Month")
+
+        with st.sidebar:
+            st.header("Filters")
+            st.caption(f"{catalog.rows:,} rows from {catalog.min_date} to {catalog.max_date}")
+
+            selected_months = _multiselect(catalog, "Month", [months[-1]] if months else [], dataset.name)
+            selected_cities = _multiselect(catalog, "City", catalog.options("City"), dataset.name)
+            selected_product_lines = _multiselect(
+                catalog, "Product line", catalog.options("Product line"), dataset.name
+            )
+
+            trend_resolution = st.selectbox(
+                "Trend resolution",
+                options=["auto", *RESOLUTIONS],
+                help="Auto uses days for short ranges, weeks up to two years and months beyond.",
+            )
+            full_trend = st.checkbox(
+                "Full-resolution trend",
+                value=False,
+                help="Plot every point instead of a shape-preserving downsample of long series.",
+            )
+            statistics = st.expander("Cache statistics")
+    first_paint_seconds = time.perf_counter() - started
+
+    with span("dashboard.wait_for_data", ready=loading.done()):
+        with nullcontext() if loading.done() else st.spinner("Loading dataset..."):
+            loading.result()
+        snapshot = registry.dataset(dataset.name)
+    data_ready_seconds = time.perf_counter() - started
+
+    with statistics:
+        st.caption(
+            f"Data version {snapshot.version}, loaded "
+            f"{datetime.fromtimestamp(snapshot.loaded_at):%Y-%m-%d %H:%M:%S}. "
+            f"First paint {first_paint_seconds * 1000:,.0f} ms, data ready {data_ready_seconds * 1000:,.0f} ms."
+        )
+        st.json(cache.stats())
+        st.json(registry.stats())
+
+    filters = {
+        "months": selected_months,
+        "cities": selected_cities,
+        "product_lines": selected_product_lines,
+    }
+    results = cache.metrics(
+        snapshot,
+        outputs=["kpis", "by_day", "by_product_line", "by_city", "by_payment"],
+        **filters,
+    )
+    kpis = results["kpis"]
 
     metric_col1, metric_col2, metric_col3, metric_col4, metric_col5 = st.columns(5)
     metric_col1.metric("Revenue", f"${kpis['revenue']:,.2f}")
@@ -66,50 +159,157 @@ def run_dashboard() -> None:
     metric_col4.metric("Gross Income", f"${kpis['gross_income']:,.2f}")
     metric_col5.metric("Average Rating", f"{kpis['avg_rating']:.2f}")
 
-    if filtered_df.empty:
+    if results["by_day"].empty:
         st.warning("No rows match the current filters. Adjust the selections to continue.")
         return
 
+    # plotly.express takes longer to import than drawing the sidebar, so it is deferred until the first chart.
+    import plotly.express as px
+
     trend_col, product_col = st.columns(2)
     city_col, payment_col = st.columns(2)
 
-    fig_trend = px.line(
-        revenue_by_day(filtered_df),
-        x="Date",
-        y="Total",
-        markers=True,
-        title="Revenue by Day",
-    )
-    trend_col.plotly_chart(fig_trend, use_container_width=True)
-
-    fig_product = px.bar(
-        revenue_by_product_line(filtered_df),
-        x="Total",
-        y="Product line",
-        orientation="h",
-        title="Revenue by Product Line",
-    )
-    product_col.plotly_chart(fig_product, use_container_width=True)
+    with span("chart.revenue_by_day"):
+        trend, resolution = trend_series(
+            results["by_day"],
+            resolution=trend_resolution,
+            max_points=None if full_trend else MAX_TREND_POINTS,
+        )
+        fig_trend = px.line(
+            trend,
+            x="Date",
+            y="Total",
+            markers=len(trend) <= MARKER_POINT_LIMIT,
+            render_mode="webgl" if len(trend) > MAX_TREND_POINTS else "auto",
+            title=f"Revenue by {resolution.capitalize()}",
+        )
+        trend_col.plotly_chart(fig_trend, use_container_width=True)
 
-    fig_city = px.bar(
-        revenue_by_city(filtered_df),
-        x="City",
-        y="Total",
-        title="Revenue by City",
-    )
-    city_col.plotly_chart(fig_city, use_container_width=True)
+    with span("chart.revenue_by_product_line"):
+        fig_product = px.bar(
+            results["by_product_line"],
+            x="Total",
+            y="Product line",
+            orientation="h",
+            title="Revenue by Product Line",
+        )
+        product_col.plotly_chart(fig_product, use_container_width=True)
+
+    with span("chart.revenue_by_city"):
+        fig_city = px.bar(
+            results["by_city"],
+            x="City",
+            y="Total",
+            title="Revenue by City",
+        )
+        city_col.plotly_chart(fig_city, use_container_width=True)
+
+    with span("chart.payment_mix"):
+        fig_payment = px.pie(
+            results["by_payment"],
+            values="Total",
+            names="Payment",
+            title="Payment Mix",
+        )
+        payment_col.plotly_chart(fig_payment, use_container_width=True)
+
+    _render_periods(cache, snapshot, filters)
+    _render_customers(cache, snapshot, filters)
+    _render_export(cache, snapshot, filters)
+
+
+def _render_periods(cache: SalesCache, snapshot: DatasetSnapshot, filters: dict[str, list[str]]) -> None:
+    import plotly.express as px
+
+    periods = cache.period_metrics(snapshot, cities=filters["cities"], product_lines=filters["product_lines"])
+    if periods.start is None:
+        return
+
+    rolling_col, growth_col = st.columns(2)
+    with span("chart.rolling_revenue"):
+        daily = periods.daily()
+        windows = [f"rolling_{window}d" for window in periods.windows]
+        fig_rolling = px.line(
+            daily,
+            x="Date",
+            y=windows,
+            title="Rolling Revenue (7/28/90 days)",
+            render_mode="webgl" if len(daily) > MAX_TREND_POINTS else "auto",
+        )
+        rolling_col.plotly_chart(fig_rolling, use_container_width=True)
+        rolling_col.caption(
+            f"Year-to-date revenue: ${periods.ytd_revenue():,.2f}. "
+            "Rolling windows span all months for the selected cities and product lines."
+        )
+
+    with span("table.period_growth"):
+        latest_month = max(filters["months"]) if filters["months"] else None
+        dimension = growth_col.radio("Growth by", options=list(periods.dimensions), horizontal=True)
+        growth = periods.growth(dimension)
+        latest_month = latest_month or growth["Month"].iloc[-1]
+        growth_col.caption(f"Month-over-month and year-over-year growth for {latest_month}")
+        growth_col.dataframe(
+            growth[growth["Month"] == latest_month].drop(columns="Month"),
+            use_container_width=True,
+            hide_index=True,
+        )
 
-    fig_payment = px.pie(
-        payment_mix(filtered_df),
-        values="Total",
-        names="Payment",
-        title="Payment Mix",
-    )
-    payment_col.plotly_chart(fig_payment, use_container_width=True)
 
-    st.download_button(
-        label="Download filtered dataset (CSV)",
-        data=filtered_df.to_csv(index=False).encode("utf-8"),
-        file_name="filtered_sales_data.csv",
-        mime="text/csv",
+def _render_customers(cache: SalesCache, snapshot: DatasetSnapshot, filters: dict[str, list[str]]) -> None:
+    import plotly.express as px
+
+    customers = cache.customer_metrics(snapshot, cities=filters["cities"], product_lines=filters["product_lines"])
+    repeat = customers["repeat"]
+    if not repeat["customers"]:
+        return
+
+    st.subheader("Customers")
+    customers_col, repeat_col, frequency_col = st.columns(3)
+    customers_col.metric("Customers", f"{repeat['customers']:,}")
+    repeat_col.metric("Repeat-purchase rate", f"{repeat['repeat_rate']:.1%}")
+    frequency_col.metric("Orders per customer", f"{repeat['orders_per_customer']:.2f}")
+
+    cohort_col, type_col = st.columns(2)
+    with span("chart.cohort_retention"):
+        retention = customers["cohorts"].pivot(index="Cohort", columns="months_since_first", values="retention")
+        fig_cohorts = px.imshow(
+            retention,
+            labels={"x": "Months since first purchase", "y": "First-purchase month", "color": "Retention"},
+            color_continuous_scale="Blues",
+            aspect="auto",
+            title="Cohort Retention",
+        )
+        cohort_col.plotly_chart(fig_cohorts, use_container_width=True)
+
+    with span("table.customer_types"):
+        type_col.caption("Member vs Regular")
+        type_col.dataframe(customers["by_customer_type"], use_container_width=True, hide_index=True)
+        segments = customers["rfm"]["rfm"].value_counts().rename_axis("rfm").reset_index(name="customers")
+        type_col.caption("Customers per RFM code (recency, frequency, monetary scores from 1 to 5)")
+        type_col.dataframe(segments.head(10), use_container_width=True, hide_index=True)
+    st.caption("Customer metrics span all months for the selected cities and product lines.")
+
+
+def _render_export(cache: SalesCache, snapshot: DatasetSnapshot, filters: dict[str, list[str]]) -> None:
+    # The file is only built after an explicit request, then reused while the selection is unchanged.
+    export_col, format_col = st.columns([1, 2])
+    export_format = format_col.selectbox(
+        "Export format",
+        options=list(EXPORT_FORMATS),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt].label,
+        label_visibility="collapsed",
     )
+    request = (str(snapshot.path), snapshot.version, export_format, *(tuple(values) for values in filters.values()))
+    if export_col.button("Prepare filtered dataset"):
+        st.session_state["export_request"] = request
+    if st.session_state.get("export_request") != request:
+        return
+
+    file_format = EXPORT_FORMATS[export_format]
+    with cache.open_export(snapshot, export_format, **filters) as handle:
+        st.download_button(
+            label=f"Download filtered dataset ({file_format.label})",
+            data=handle,
+            file_name=f"filtered_sales_data{file_format.suffix}",
+            mime=file_format.mime,
+        )
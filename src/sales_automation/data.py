@@ -1,9 +1,28 @@
 from __future__ import annotations
 
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from dataclasses import dataclass, replace
+import io
+import logging
+import multiprocessing
+import os
 from pathlib import Path
+import re
+from typing import Any, BinaryIO, Iterator
 
+import numpy as np
 import pandas as pd
 
+from .columnar import fingerprint_source, read_appendable_cache, read_cached_frame, write_cached_frame
+from .index import SalesIndex
+from .partitions import discover_partitions, is_partitioned_source, prune_partitions
+from .schema import compact_sales_frame
+from .telemetry import span
+
+logger = logging.getLogger(__name__)
+
 DATA_PATH = Path("relatorio_vendas.csv")
 
 COLUMN_RENAME_MAP = {
@@ -12,28 +31,186 @@ COLUMN_RENAME_MAP = {
     "Unit price": "Unit price",
 }
 
+# Normalized columns in source order, for frames built without reading a file.
+SALES_COLUMNS = (
+    "Invoice ID", "Branch", "City", "Customer type", "Customer Name", "Gender", "Product line",
+    "Unit price", "Quantity", "Tax 5%", "Total", "Date", "Time", "Payment", "cogs",
+    "gross margin percentage", "Gross income", "Rating", "Month",
+)
+NUMERIC_SALES_COLUMNS = (
+    "Unit price", "Quantity", "Tax 5%", "Total", "cogs", "gross margin percentage", "Gross income", "Rating",
+)
 
-def _read_csv_flexible(data_path: Path | str) -> pd.DataFrame:
-    """Read CSV supporting legacy and modern delimiters/encodings."""
-    read_attempts = [
-        {"sep": ",", "encoding": "utf-8"},
-        {"sep": ";", "decimal": ",", "encoding": "latin1"},
-    ]
-    last_error: Exception | None = None
+DEFAULT_CHUNK_ROWS = 100_000
+SNIFF_SAMPLE_BYTES = 64 * 1024
+SNIFF_MAX_LINES = 50
+CANDIDATE_DELIMITERS = ",;\t|"
+# Parsed by the normalization step, so the reader must hand them over as text.
+TEXT_COLUMNS = ("Date", "Time")
+
+_COMMA_DECIMAL = re.compile(r"^-?\d+,\d+$")
+_DOT_DECIMAL = re.compile(r"^-?\d+\.\d+$")
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    """Format of a CSV export as detected from its header sample."""
+
+    delimiter: str = ","
+    decimal: str = "."
+    encoding: str = "utf-8"
+    quotechar: str = '"'
+
+
+def _latin1_fallback(dialect: CsvDialect) -> CsvDialect | None:
+    """The dialect to retry with when a file sniffed as UTF-8 has invalid bytes past the sample."""
+    return replace(dialect, encoding="latin1") if dialect.encoding.startswith("utf-8") else None
+
+
+def _detect_encoding(sample: bytes) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError:
+        return "latin1"
+    return "utf-8"
+
+
+def _detect_decimal(lines: list[str], delimiter: str, quotechar: str) -> str:
+    if delimiter == ",":
+        return "."
+
+    comma_values = 0
+    dot_values = 0
+    for row in csv.reader(lines[1:], delimiter=delimiter, quotechar=quotechar):
+        for value in row:
+            value = value.strip()
+            if _COMMA_DECIMAL.match(value):
+                comma_values += 1
+            elif _DOT_DECIMAL.match(value):
+                dot_values += 1
+
+    return "," if comma_values > dot_values else "."
+
+
+def sniff_csv_dialect(data_path: Path | str, sample_bytes: int = SNIFF_SAMPLE_BYTES) -> CsvDialect:
+    """Detect delimiter, decimal mark, encoding and quoting from a file sample."""
+    with Path(data_path).open("rb") as handle:
+        sample = handle.read(sample_bytes)
+
+    if len(sample) == sample_bytes and b"\n" in sample:
+        # Drop the trailing partial line so multi-byte characters are never split.
+        sample = sample[: sample.rindex(b"\n") + 1]
+
+    encoding = _detect_encoding(sample)
+    lines = [line for line in sample.decode(encoding).splitlines() if line.strip()][:SNIFF_MAX_LINES]
+    if not lines:
+        raise RuntimeError(f"Unable to read CSV file at {data_path}: file is empty")
+
+    try:
+        sniffed = csv.Sniffer().sniff("\n".join(lines), delimiters=CANDIDATE_DELIMITERS)
+        delimiter = sniffed.delimiter
+        quotechar = sniffed.quotechar or '"'
+    except csv.Error:
+        delimiter = max(CANDIDATE_DELIMITERS, key=lines[0].count)
+        quotechar = '"'
+
+    return CsvDialect(
+        delimiter=delimiter,
+        decimal=_detect_decimal(lines, delimiter, quotechar),
+        encoding=encoding,
+        quotechar=quotechar,
+    )
 
-    for kwargs in read_attempts:
+
+def _read_csv_pyarrow(data_path: Path | str | BinaryIO, dialect: CsvDialect) -> pd.DataFrame | None:
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return None
+
+    utf8 = dialect.encoding.startswith("utf-8")
+    try:
+        table = pa_csv.read_csv(
+            str(data_path) if isinstance(data_path, (str, Path)) else data_path,
+            read_options=pa_csv.ReadOptions(
+                encoding="utf8" if utf8 else dialect.encoding,
+            ),
+            parse_options=pa_csv.ParseOptions(
+                delimiter=dialect.delimiter,
+                quote_char=dialect.quotechar,
+            ),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={column: pa.string() for column in TEXT_COLUMNS},
+                decimal_point=dialect.decimal,
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid as exc:
+        if not utf8 or "UTF8" not in str(exc):
+            raise
+        raise UnicodeDecodeError("utf-8", b"", 0, 1, str(exc)) from exc
+
+    # pyarrow hands back columns that are not valid UTF-8 as raw bytes instead of failing.
+    undecodable = [field.name for field in table.schema if pa.types.is_binary(field.type)]
+    if utf8 and undecodable:
+        raise UnicodeDecodeError("utf-8", b"", 0, 1, f"columns {undecodable} are not valid UTF-8")
+    df = table.to_pandas()
+    # Match the pandas reader's naming of blank header cells (legacy index column).
+    df.columns = [name or f"Unnamed: {position}" for position, name in enumerate(df.columns)]
+    return df
+
+
+def _read_csv_with(data_path: Path | str | BinaryIO, dialect: CsvDialect, active: Any) -> pd.DataFrame:
+    df = _read_csv_pyarrow(data_path, dialect)
+    active.set(engine="pyarrow")
+    if df is None:
+        active.set(engine="pandas")
+        df = pd.read_csv(
+            data_path,
+            sep=dialect.delimiter,
+            decimal=dialect.decimal,
+            encoding=dialect.encoding,
+            quotechar=dialect.quotechar,
+        )
+    return df
+
+
+def _read_csv_flexible(data_path: Path | str | BinaryIO, dialect: CsvDialect | None = None) -> pd.DataFrame:
+    """Read CSV supporting legacy and modern delimiters/encodings.
+
+    The dialect is sniffed from a small sample, so the file is usually
+    parsed once; a file sniffed as UTF-8 whose invalid bytes come after the
+    sample is parsed again as latin1.
+    """
+    with span("read_csv") as active:
         try:
-            return pd.read_csv(data_path, **kwargs)
-        except Exception as exc:  # pragma: no cover
-            last_error = exc
+            dialect = dialect or sniff_csv_dialect(data_path)
+            logger.info("Reading %s with %s", data_path, dialect)
+            try:
+                df = _read_csv_with(data_path, dialect, active)
+            except UnicodeDecodeError:
+                fallback = _latin1_fallback(dialect)
+                if fallback is None:
+                    raise
+                logger.warning("%s is not valid UTF-8 past its sample; reading it as latin1", data_path)
+                if not isinstance(data_path, (str, Path)):
+                    data_path.seek(0)
+                df = _read_csv_with(data_path, fallback, active)
+        except Exception as exc:
+            raise RuntimeError(f"Unable to read CSV file at {data_path}") from exc
+        active.set(rows=len(df))
 
-    raise RuntimeError(f"Unable to read CSV file at {data_path}") from last_error
+    if len(df.columns) < 2:
+        raise RuntimeError(f"Unable to read CSV file at {data_path}: detected a single column with {dialect}")
 
+    return df
 
-def load_sales_data(data_path: Path | str = DATA_PATH) -> pd.DataFrame:
-    """Load and normalize the source sales dataset."""
-    df = _read_csv_flexible(data_path)
 
+def _normalize_sales_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply column renames, type coercion and row validation to raw rows."""
     if "Unnamed: 0" in df.columns:
         df = df.drop(columns=["Unnamed: 0"])
 
@@ -56,7 +233,263 @@ def load_sales_data(data_path: Path | str = DATA_PATH) -> pd.DataFrame:
     df = df.dropna(subset=["Total", "Gross income", "Quantity", "Rating"])
     df["Month"] = df["Date"].dt.to_period("M").astype(str)
 
-    return df.sort_values("Date").reset_index(drop=True)
+    return df
+
+
+def _empty_sales_frame() -> pd.DataFrame:
+    """A normalized frame with no rows, built from :data:`SALES_COLUMNS` without opening any file."""
+    dtypes = {column: "float64" if column in NUMERIC_SALES_COLUMNS else "object" for column in SALES_COLUMNS}
+    dtypes["Date"] = "datetime64[ns]"
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+
+
+def _load_sales_file(data_path: Path | str, use_cache: bool = False) -> pd.DataFrame:
+    with span("load_sales_data", cache="off") as active:
+        df = read_cached_frame(data_path) if use_cache else None
+        if use_cache:
+            active.set(cache="hit")
+        if df is None and use_cache:
+            df = _extend_cached_frame(data_path)
+            active.set(cache="append")
+
+        if df is None:
+            if use_cache:
+                active.set(cache="miss")
+            fingerprint = fingerprint_source(data_path) if use_cache else None
+            df = _normalize_sales_frame(_read_csv_flexible(data_path))
+            df = df.sort_values("Date").reset_index(drop=True)
+            if fingerprint is not None:
+                write_cached_frame(data_path, df, fingerprint)
+
+        active.set(rows=len(df))
+        return df
+
+
+def _load_partitioned(
+    source: Path | str,
+    use_cache: bool,
+    workers: int | None,
+    months: list[str] | None,
+    cities: list[str] | None,
+    product_lines: list[str] | None,
+) -> pd.DataFrame:
+    partitions = discover_partitions(source)
+    if not partitions:
+        raise RuntimeError(f"Unable to find CSV partitions at {source}")
+
+    selected = prune_partitions(partitions, months=months, cities=cities, product_lines=product_lines)
+    logger.info("Reading %s of %s partitions from %s", len(selected), len(partitions), source)
+    if not selected:
+        return _empty_sales_frame()
+
+    paths = [partition.path for partition in selected]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with span("load_partitions", partitions=len(paths), pruned=len(partitions) - len(paths), workers=workers):
+        if workers <= 1:
+            frames = [_load_sales_file(path, use_cache) for path in paths]
+        else:
+            # Spawned workers do not inherit the parent's threads (watchers, Arrow pools).
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                frames = list(pool.map(_load_sales_file, paths, [use_cache] * len(paths)))
+        return merge_sorted_frames(frames)
+
+
+def load_sales_data(
+    data_path: Path | str = DATA_PATH,
+    use_cache: bool = False,
+    compact: bool = False,
+    months: list[str] | None = None,
+    cities: list[str] | None = None,
+    product_lines: list[str] | None = None,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Load and normalize the source sales dataset.
+
+    With ``use_cache`` the normalized frame is persisted as Arrow IPC next to
+    the source and memory-mapped on later loads until the source changes.
+    When rows were only appended since, just the new tail is parsed and
+    merged into the cached frame.
+    With ``compact`` the frame is converted to the compact schema from
+    :mod:`sales_automation.schema` and the bytes-per-row change is logged.
+
+    ``data_path`` may also be a directory or glob of CSV partitions (e.g.
+    ``year=2023/month=01/branch=Downtown/``). Partitions are parsed across
+    up to ``workers`` processes and merged by date. ``months``, ``cities``
+    and ``product_lines`` keep only matching rows, and partitions whose
+    path keys exclude the selection are never read.
+    """
+    if is_partitioned_source(data_path):
+        df = _load_partitioned(data_path, use_cache, workers, months, cities, product_lines)
+    else:
+        df = _load_sales_file(data_path, use_cache)
+
+    if months or cities or product_lines:
+        df = filter_sales_data(df, months=months, cities=cities, product_lines=product_lines)
+        df = df.reset_index(drop=True)
+
+    if compact:
+        df, report = compact_sales_frame(df)
+        logger.info("Compacted %s: %s", data_path, report)
+
+    return df
+
+
+def read_appended_rows(
+    data_path: Path | str,
+    start_offset: int,
+    dialect: CsvDialect | None = None,
+    complete_lines: bool = False,
+) -> tuple[pd.DataFrame, int]:
+    """Parse only the rows stored after ``start_offset`` bytes of the source.
+
+    The file's header line is reused for the tail, and offsets inside the
+    header are moved past it, so ``start_offset=0`` parses the whole file.
+    With ``complete_lines`` a trailing line still being written is left for
+    the next call. Returns the normalized rows and the offset consumed up to.
+    """
+    dialect = dialect or sniff_csv_dialect(data_path)
+    with Path(data_path).open("rb") as handle:
+        header = handle.readline()
+        start_offset = max(start_offset, len(header))
+        handle.seek(start_offset)
+        body = handle.read()
+
+    if complete_lines:
+        body = body[: body.rfind(b"\n") + 1]
+    end_offset = start_offset + len(body)
+    if not body.strip():
+        return _normalize_sales_frame(_read_csv_flexible(io.BytesIO(header), dialect)).iloc[:0], end_offset
+
+    return _normalize_sales_frame(_read_csv_flexible(io.BytesIO(header + body), dialect)), end_offset
+
+
+def merge_sorted_rows(df: pd.DataFrame, rows: pd.DataFrame, on: str = "Date") -> pd.DataFrame:
+    """Merge ``rows`` into ``df`` (already sorted by ``on``) without re-sorting ``df``.
+
+    Only the new rows are sorted; their slots are found with ``searchsorted``
+    and they land after existing rows with the same key. Rows that all sort
+    at or after the current end are a plain append.
+    """
+    if rows.empty:
+        return df
+
+    rows = rows.sort_values(on, kind="stable")
+    existing = df[on].to_numpy()
+    incoming = rows[on].to_numpy()
+    combined = pd.concat([df, rows], ignore_index=True)
+    if not len(existing) or incoming[0] >= existing[-1]:
+        return combined
+
+    slots = np.searchsorted(existing, incoming, side="right") + np.arange(len(incoming))
+    is_new = np.zeros(len(combined), dtype=bool)
+    is_new[slots] = True
+    order = np.empty(len(combined), dtype=np.intp)
+    order[is_new] = np.arange(len(df), len(combined))
+    order[~is_new] = np.arange(len(df))
+    return combined.take(order).reset_index(drop=True)
+
+
+def merge_sorted_frames(frames: list[pd.DataFrame], on: str = "Date") -> pd.DataFrame:
+    """K-way merge of frames that are each sorted by ``on``.
+
+    Runs are merged pairwise in rounds, so every row moves ``log2(k)``
+    times instead of the whole result being re-sorted.
+    """
+    if not frames:
+        raise ValueError("merge_sorted_frames needs at least one frame")
+
+    runs = list(frames)
+    while len(runs) > 1:
+        merged = [merge_sorted_rows(left, right, on=on) for left, right in zip(runs[::2], runs[1::2])]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0].reset_index(drop=True)
+
+
+def duplicate_invoice_mask(rows: pd.DataFrame, seen: pd.Series | set[object]) -> np.ndarray:
+    """Flag rows re-sending an ``Invoice ID`` from ``seen``, the invoices ingested before them.
+
+    Repeats within ``rows`` are not flagged: they are the lines of one
+    multi-line invoice, which ``load_sales_data`` keeps as well.
+    """
+    invoices = rows["Invoice ID"]
+    return (invoices.isin(seen) & invoices.notna()).to_numpy()
+
+
+def _extend_cached_frame(data_path: Path | str) -> pd.DataFrame | None:
+    appendable = read_appendable_cache(data_path)
+    if appendable is None:
+        return None
+
+    cached, stored, current = appendable
+    rows, _ = read_appended_rows(data_path, stored.size)
+    duplicates = int(duplicate_invoice_mask(rows, cached["Invoice ID"]).sum())
+    if duplicates:
+        # Kept so the result matches a full reload of the same file.
+        logger.warning("%s re-sends %s already loaded Invoice IDs", data_path, duplicates)
+
+    df = merge_sorted_rows(cached, rows)
+    logger.info("Appended %s new rows from %s to its cached frame", len(rows), data_path)
+    write_cached_frame(data_path, df, current)
+    return df
+
+
+def iter_sales_chunks(
+    data_path: Path | str = DATA_PATH,
+    chunksize: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """Stream the source in fixed-size row chunks, each normalized like ``load_sales_data``.
+
+    Chunks keep file order (they are not sorted by date), so memory stays
+    bounded by ``chunksize`` regardless of the file size. Partitioned
+    sources are streamed one file after another.
+    """
+    if is_partitioned_source(data_path):
+        for partition in discover_partitions(data_path):
+            yield from iter_sales_chunks(partition.path, chunksize)
+        return
+
+    dialect = sniff_csv_dialect(data_path)
+    logger.info("Streaming %s in chunks of %s rows with %s", data_path, chunksize, dialect)
+
+    streamed = 0
+    try:
+        for chunk in _read_csv_chunks(data_path, dialect, chunksize):
+            streamed += len(chunk)
+            yield _normalize_sales_frame(chunk)
+    except UnicodeDecodeError:
+        fallback = _latin1_fallback(dialect)
+        if fallback is None:
+            raise
+        # Invalid UTF-8 past the sample: stream again as latin1, skipping the rows already yielded.
+        logger.warning("%s is not valid UTF-8 past its sample; streaming it as latin1", data_path)
+        for chunk in _read_csv_chunks(data_path, fallback, chunksize):
+            skipped = min(streamed, len(chunk))
+            streamed -= skipped
+            if skipped < len(chunk):
+                yield _normalize_sales_frame(chunk.iloc[skipped:])
+
+
+def _read_csv_chunks(data_path: Path | str, dialect: CsvDialect, chunksize: int) -> Iterator[pd.DataFrame]:
+    reader = pd.read_csv(
+        data_path,
+        sep=dialect.delimiter,
+        decimal=dialect.decimal,
+        encoding=dialect.encoding,
+        quotechar=dialect.quotechar,
+        chunksize=chunksize,
+    )
+    with reader:
+        yield from reader
+
+
+def _take_rows(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        # Contiguous selection (e.g. months on the date-sorted frame): slice without gathering.
+        return df.iloc[rows[0] : rows[-1] + 1]
+    return df.take(rows)
 
 
 def filter_sales_data(
@@ -64,15 +497,29 @@ def filter_sales_data(
     months: list[str] | None = None,
     cities: list[str] | None = None,
     product_lines: list[str] | None = None,
+    index: SalesIndex | None = None,
 ) -> pd.DataFrame:
-    """Filter dataset by month, city and product line."""
-    filtered_df = df
+    """Filter dataset by month, city and product line.
+
+    With a prebuilt ``index`` the selection is resolved from row bitmaps and
+    the result may share memory with ``df`` (the frame itself when nothing
+    is filtered out), so callers must treat it as read-only.
+    """
+    with span("filter_sales_data", rows_in=len(df), indexed=index is not None) as active:
+        if index is not None:
+            rows = index.select(months=months, cities=cities, product_lines=product_lines)
+            filtered = df if rows is None else _take_rows(df, rows)
+        else:
+            mask = np.ones(len(df), dtype=bool)
+
+            if months:
+                mask &= df["Month"].isin(months).to_numpy()
+            if cities:
+                mask &= df["City"].isin(cities).to_numpy()
+            if product_lines:
+                mask &= df["Product line"].isin(product_lines).to_numpy()
 
-    if months:
-        filtered_df = filtered_df[filtered_df["Month"].isin(months)]
-    if cities:
-        filtered_df = filtered_df[filtered_df["City"].isin(cities)]
-    if product_lines:
-        filtered_df = filtered_df[filtered_df["Product line"].isin(product_lines)]
+            filtered = df.take(np.flatnonzero(mask))
 
-    return filtered_df.copy()
+        active.set(rows=len(filtered))
+        return filtered
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .cube import CubeSlice
+from .sketch import OrderCounter
+from .telemetry import span
+
+BREAKDOWN_DIMENSIONS = {
+    "by_day": "Date",
+    "by_month": "Month",
+    "by_product_line": "Product line",
+    "by_city": "City",
+    "by_payment": "Payment",
+}
+METRIC_OUTPUTS = ("kpis", *BREAKDOWN_DIMENSIONS)
+# Trend outputs are ordered by their key; rankings by revenue, highest first.
+KEY_ORDERED_OUTPUTS = {"by_day", "by_month"}
+
+EMPTY_KPIS = {
+    "revenue": 0.0,
+    "orders": 0.0,
+    "avg_ticket": 0.0,
+    "avg_rating": 0.0,
+    "gross_income": 0.0,
+}
+
+
+class PushdownSelection(ABC):
+    """A filtered selection whose metrics are computed by an external query engine."""
+
+    engine = "pushdown"
+
+    @abstractmethod
+    def compute_metrics(self, outputs: Sequence[str]) -> dict[str, Any]:
+        """Return ``compute_metrics``-shaped results for ``outputs``."""
+
+
+def _sort_breakdown(output: str, frame: pd.DataFrame) -> pd.DataFrame:
+    if output in KEY_ORDERED_OUTPUTS:
+        return frame.sort_values(BREAKDOWN_DIMENSIONS[output])
+    return frame.sort_values("Total", ascending=False)
+
+
+class _MetricsScan:
+    """Partial sums from one pass over a frame or chunk, mergeable across chunks."""
+
+    def __init__(self, outputs: Sequence[str], order_error: float | None = None) -> None:
+        self.outputs = list(outputs)
+        self.rows = 0
+        self.revenue = 0.0
+        self.gross_income = 0.0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.orders = OrderCounter(order_error)
+        self.breakdowns: dict[str, list[tuple[object, np.ndarray]]] = {
+            output: [] for output in self.outputs if output in BREAKDOWN_DIMENSIONS
+        }
+
+    def update(self, df: pd.DataFrame) -> None:
+        totals = df["Total"].to_numpy(dtype=np.float64)
+        self.rows += len(df)
+
+        if "kpis" in self.outputs:
+            ratings = df["Rating"].to_numpy(dtype=np.float64)
+            self.revenue += float(np.nansum(totals))
+            self.gross_income += float(np.nansum(df["Gross income"].to_numpy(dtype=np.float64)))
+            self.rating_sum += float(np.nansum(ratings))
+            self.rating_count += int(np.count_nonzero(~np.isnan(ratings)))
+            self.orders.update(df["Invoice ID"])
+
+        for output, parts in self.breakdowns.items():
+            codes, uniques = pd.factorize(df[BREAKDOWN_DIMENSIONS[output]], sort=True)
+            valid = codes >= 0
+            sums = np.bincount(codes[valid], weights=np.nan_to_num(totals[valid]), minlength=len(uniques))
+            parts.append((uniques, sums.astype(np.float64, copy=False)))
+
+    def kpis(self) -> dict[str, float]:
+        if self.rows == 0:
+            return dict(EMPTY_KPIS)
+
+        orders = self.orders.count()
+        return {
+            "revenue": self.revenue,
+            "orders": orders,
+            "avg_ticket": self.revenue / orders if orders else 0.0,
+            "avg_rating": self.rating_sum / self.rating_count if self.rating_count else float("nan"),
+            "gross_income": self.gross_income,
+        }
+
+    def breakdown(self, output: str) -> pd.DataFrame:
+        dimension = BREAKDOWN_DIMENSIONS[output]
+        parts = self.breakdowns[output]
+        if len(parts) == 1:
+            uniques, sums = parts[0]
+            frame = pd.DataFrame({dimension: uniques, "Total": sums})
+        elif parts:
+            merged = pd.concat([pd.Series(sums, index=np.asarray(uniques)) for uniques, sums in parts])
+            merged = merged.groupby(level=0).sum()
+            frame = pd.DataFrame({dimension: merged.index, "Total": merged.to_numpy()})
+        else:
+            frame = pd.DataFrame({dimension: [], "Total": np.array([], dtype=np.float64)})
+        return _sort_breakdown(output, frame)
+
+
+def compute_metrics(
+    data: pd.DataFrame | CubeSlice | PushdownSelection | Iterable[pd.DataFrame],
+    outputs: Sequence[str] = METRIC_OUTPUTS,
+    order_error: float | None = None,
+) -> dict[str, Any]:
+    """Compute the requested KPI and breakdown outputs in a single pass.
+
+    ``data`` may be a filtered frame, a :class:`CubeSlice`, a
+    :class:`PushdownSelection` (e.g. from :mod:`sales_automation.sql`) or an
+    iterable of normalized chunks (e.g. from ``iter_sales_chunks``).
+    ``outputs`` is any subset of :data:`METRIC_OUTPUTS`; each dimension is
+    factorized once and reduced with ``np.bincount``. Because ``bincount``
+    adds in a different order than a pandas groupby, revenue sums may differ
+    from the groupby results in the last bits (relative difference below
+    ``1e-12``); money values are not rounded here, so compare them with a
+    tolerance or round them for display.
+
+    Orders are counted exactly unless ``order_error`` is given, in which
+    case frames and chunk streams use a HyperLogLog sketch with that
+    relative standard error. Cube slices use the sketches the cube was built
+    with; pushdown selections always count exactly.
+    """
+    unknown = set(outputs) - set(METRIC_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown metric outputs: {sorted(unknown)}")
+
+    if isinstance(data, PushdownSelection):
+        with span("compute_metrics", source=data.engine, outputs=len(outputs)):
+            return data.compute_metrics(outputs)
+
+    if isinstance(data, CubeSlice):
+        with span("compute_metrics", source="cube", outputs=len(outputs)):
+            results: dict[str, Any] = {}
+            for output in outputs:
+                if output == "kpis":
+                    results[output] = data.compute_kpis()
+                else:
+                    results[output] = _sort_breakdown(output, data.revenue_by(BREAKDOWN_DIMENSIONS[output]))
+            return results
+
+    source = "frame" if isinstance(data, pd.DataFrame) else "chunks"
+    with span("compute_metrics", source=source, outputs=len(outputs)) as active:
+        scan = _MetricsScan(outputs, order_error)
+        for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+            scan.update(chunk)
+        active.set(rows=scan.rows)
+
+        return {
+            output: scan.kpis() if output == "kpis" else scan.breakdown(output)
+            for output in outputs
+        }
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gzip
+import os
+from pathlib import Path
+import threading
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+
+from .telemetry import span
+
+EXPORT_CHUNK_ROWS = 100_000
+# Export files kept on disk; older selections are removed first.
+MAX_EXPORT_FILES = 32
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    suffix: str
+    mime: str
+    label: str
+
+
+EXPORT_FORMATS = {
+    "csv": ExportFormat(".csv", "text/csv", "CSV"),
+    "csv.gz": ExportFormat(".csv.gz", "application/gzip", "Compressed CSV (gzip)"),
+    "parquet": ExportFormat(".parquet", "application/vnd.apache.parquet", "Parquet"),
+}
+
+
+def iter_csv_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield ``df.to_csv(index=False)`` as UTF-8 bytes, ``chunk_rows`` rows at a time."""
+    if df.empty:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start : start + chunk_rows]
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def _write_csv(df: pd.DataFrame, handle: BinaryIO, chunk_rows: int) -> None:
+    for block in iter_csv_chunks(df, chunk_rows):
+        handle.write(block)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, chunk_rows: int) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            table = pa.Table.from_pandas(df.iloc[start : start + chunk_rows], preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(
+    df: pd.DataFrame,
+    path: Path | str,
+    fmt: str = "csv",
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Path:
+    """Write ``df`` to ``path`` in ``chunk_rows`` blocks, replacing it atomically.
+
+    Only one block is serialized at a time, so the export never holds the
+    whole CSV text in memory.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {tuple(EXPORT_FORMATS)}")
+
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    partial = output.with_name(f".{output.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    with span("write_export", format=fmt, rows=len(df)):
+        try:
+            if fmt == "parquet":
+                _write_parquet(df, partial, chunk_rows)
+            elif fmt == "csv.gz":
+                with gzip.open(partial, "wb", compresslevel=6) as handle:
+                    _write_csv(df, handle, chunk_rows)
+            else:
+                with partial.open("wb") as handle:
+                    _write_csv(df, handle, chunk_rows)
+            os.replace(partial, output)
+        finally:
+            partial.unlink(missing_ok=True)
+    return output
+
+
+def prune_exports(directory: Path | str, keep: int = MAX_EXPORT_FILES) -> int:
+    """Delete all but the ``keep`` most recently used (written or served) export files."""
+    files = [path for path in Path(directory).glob("*") if path.is_file() and not path.name.startswith(".")]
+    files.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+    for stale in files[keep:]:
+        stale.unlink(missing_ok=True)
+    return max(len(files) - keep, 0)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+
+from .aggregates import SalesAccumulator
+from .cache import source_version
+from .periods import PeriodMetrics
+from .summary import SalesSummary, write_summary
+from .data import (
+    CsvDialect,
+    duplicate_invoice_mask,
+    merge_sorted_rows,
+    read_appended_rows,
+    sniff_csv_dialect,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUPINGS: tuple[tuple[str, ...], ...] = ((), ("Month",))
+DUPLICATE_POLICIES = ("drop", "keep")
+# Bytes just before the watermark that must be unchanged for the file to count as appended.
+ANCHOR_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class IngestWatermark:
+    """How far into the source the last ingestion got."""
+
+    byte_offset: int
+    header: bytes
+    anchor: bytes
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """Outcome of one :meth:`IncrementalSalesData.refresh` call."""
+
+    appended_rows: int
+    duplicate_rows: int
+    reloaded: bool
+
+
+class IncrementalSalesData:
+    """Date-sorted sales frame that ingests only the rows appended to its source.
+
+    Each :meth:`refresh` parses the bytes past the watermark, merges them
+    into the sorted frame and feeds them to the running aggregates,
+    rolling/period-over-period metrics (:attr:`periods`) and the daily
+    summary (:attr:`sales_summary`), which is stored as a sidecar for
+    report scripts when ``persist_summary`` is set. A source
+    whose header or bytes before the watermark changed is reloaded in full.
+    Appended rows whose ``Invoice ID`` was ingested before the watermark are
+    counted as re-sends; the default ``on_duplicate="keep"`` keeps them, like
+    ``load_sales_data``, and ``"drop"`` leaves them out.
+    """
+
+    def __init__(
+        self,
+        data_path: Path | str,
+        groupings: Sequence[Sequence[str]] = DEFAULT_GROUPINGS,
+        on_duplicate: str = "keep",
+        persist_summary: bool = True,
+    ) -> None:
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"on_duplicate must be one of {DUPLICATE_POLICIES}, got {on_duplicate!r}")
+
+        self.data_path = Path(data_path)
+        self.groupings = [tuple(by) for by in groupings]
+        self.on_duplicate = on_duplicate
+        self.persist_summary = persist_summary
+        self.frame = pd.DataFrame()
+        self.watermark: IngestWatermark | None = None
+        self.aggregates: dict[tuple[str, ...], SalesAccumulator] = {}
+        self.periods = PeriodMetrics()
+        self.sales_summary = SalesSummary()
+        self.duplicate_rows = 0
+        self._dialect: CsvDialect | None = None
+        self._invoices: set[object] = set()
+
+    def refresh(self) -> IngestResult:
+        """Ingest whatever was appended since the last call."""
+        version = source_version(self.data_path)
+        if self.watermark is None or not self._is_append():
+            result = self._reload()
+        else:
+            result = self._append()
+        self._store_summary(version)
+        return result
+
+    def _append(self) -> IngestResult:
+        rows, end_offset = read_appended_rows(
+            self.data_path,
+            self.watermark.byte_offset,
+            dialect=self._dialect,
+            complete_lines=True,
+        )
+        appended, duplicates = self._ingest(rows)
+        self._advance(end_offset)
+        if appended or duplicates:
+            logger.info("Ingested %s appended rows from %s (%s duplicates)", appended, self.data_path, duplicates)
+        return IngestResult(appended_rows=appended, duplicate_rows=duplicates, reloaded=False)
+
+    def summary(self, by: Sequence[str] = ("Month",)) -> pd.DataFrame:
+        """Return the running aggregates for one of the configured groupings."""
+        return self.aggregates[tuple(by)].result()
+
+    def _is_append(self) -> bool:
+        watermark = self.watermark
+        if self.data_path.stat().st_size < watermark.byte_offset:
+            return False
+
+        with self.data_path.open("rb") as handle:
+            header = handle.readline()
+            handle.seek(watermark.byte_offset - len(watermark.anchor))
+            anchor = handle.read(len(watermark.anchor))
+        return header == watermark.header and anchor == watermark.anchor
+
+    def _reload(self) -> IngestResult:
+        self._dialect = sniff_csv_dialect(self.data_path)
+        self.frame = pd.DataFrame()
+        self.aggregates = {by: SalesAccumulator(by) for by in self.groupings}
+        self.periods = PeriodMetrics()
+        self.sales_summary = SalesSummary()
+        self.duplicate_rows = 0
+        self._invoices = set()
+        self.watermark = None
+
+        rows, end_offset = read_appended_rows(self.data_path, 0, dialect=self._dialect, complete_lines=True)
+        appended, duplicates = self._ingest(rows)
+        self._advance(end_offset)
+        logger.info("Loaded %s rows from %s", appended, self.data_path)
+        return IngestResult(appended_rows=appended, duplicate_rows=duplicates, reloaded=True)
+
+    def _ingest(self, rows: pd.DataFrame) -> tuple[int, int]:
+        duplicated = duplicate_invoice_mask(rows, self._invoices)
+        duplicates = int(duplicated.sum())
+        if duplicates:
+            logger.warning("%s re-sends %s already ingested Invoice IDs", self.data_path, duplicates)
+            if self.on_duplicate == "drop":
+                rows = rows[~duplicated]
+        self.duplicate_rows += duplicates
+
+        self._invoices.update(rows["Invoice ID"].dropna())
+        if self.frame.empty:
+            self.frame = rows.sort_values("Date", kind="stable").reset_index(drop=True)
+        else:
+            self.frame = merge_sorted_rows(self.frame, rows)
+        for accumulator in self.aggregates.values():
+            accumulator.update(rows)
+        self.periods.update(rows)
+        self.sales_summary.update(rows)
+        return len(rows), duplicates
+
+    def _store_summary(self, version: str) -> None:
+        # Only a source that stayed at ``version``, was read to its end and kept every row (the policy of
+        # ``load_summary``, the other writer of this sidecar) matches a full load of that version.
+        if not self.persist_summary or self.sales_summary.version == version:
+            return
+        if self.on_duplicate == "drop" and self.duplicate_rows:
+            return
+        if source_version(self.data_path) != version or self.watermark.byte_offset != self.data_path.stat().st_size:
+            return
+        self.sales_summary.version = version
+        write_summary(self.data_path, self.sales_summary)
+
+    def _advance(self, end_offset: int) -> None:
+        with self.data_path.open("rb") as handle:
+            header = handle.readline()
+            anchor_start = max(len(header), end_offset - ANCHOR_BYTES)
+            handle.seek(anchor_start)
+            anchor = handle.read(end_offset - anchor_start)
+
+        self.watermark = IngestWatermark(
+            byte_offset=end_offset,
+            header=header,
+            anchor=anchor,
+        )
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+INDEX_DIMENSIONS = {"months": "Month", "cities": "City", "product_lines": "Product line"}
+
+
+class SalesIndex:
+    """Inverted index of packed row bitmaps per filter dimension value.
+
+    Built once per loaded frame. A filter is resolved by OR-ing the bitmaps
+    of the selected values within a dimension and AND-ing across dimensions,
+    without touching the frame itself.
+    """
+
+    def __init__(self, row_count: int, bitmaps: dict[str, dict[object, np.ndarray]], complete: dict[str, bool]) -> None:
+        self.row_count = row_count
+        self.bitmaps = bitmaps
+        self.complete = complete
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> SalesIndex:
+        """Index the filter dimensions of a normalized sales frame."""
+        bitmaps: dict[str, dict[object, np.ndarray]] = {}
+        complete: dict[str, bool] = {}
+        for dimension in INDEX_DIMENSIONS.values():
+            codes, uniques = pd.factorize(df[dimension], sort=True)
+            bitmaps[dimension] = {
+                value: np.packbits(codes == position) for position, value in enumerate(uniques.tolist())
+            }
+            # Rows with a missing label never match ``isin``, so "all values" is not "all rows".
+            complete[dimension] = bool((codes >= 0).all())
+        return cls(len(df), bitmaps, complete)
+
+    def _dimension_bitmap(self, dimension: str, selected: list[object]) -> np.ndarray | None:
+        value_bitmaps = self.bitmaps[dimension]
+        matched = {value for value in selected if value in value_bitmaps}
+        if self.complete[dimension] and len(matched) == len(value_bitmaps):
+            return None
+
+        bitmap = np.zeros((self.row_count + 7) // 8, dtype=np.uint8)
+        for value in matched:
+            np.bitwise_or(bitmap, value_bitmaps[value], out=bitmap)
+        return bitmap
+
+    def select(
+        self,
+        months: list[str] | None = None,
+        cities: list[str] | None = None,
+        product_lines: list[str] | None = None,
+    ) -> np.ndarray | None:
+        """Return the sorted row positions matching the filters, or ``None`` for all rows."""
+        selections = {"months": months, "cities": cities, "product_lines": product_lines}
+        selection: np.ndarray | None = None
+
+        for argument, dimension in INDEX_DIMENSIONS.items():
+            if not selections[argument]:
+                continue
+            bitmap = self._dimension_bitmap(dimension, list(selections[argument]))
+            if bitmap is None:
+                continue
+            selection = bitmap if selection is None else np.bitwise_and(selection, bitmap)
+
+        if selection is None:
+            return None
+        return np.flatnonzero(np.unpackbits(selection, count=self.row_count))
@@ -2,67 +2,43 @@ from __future__ import annotations
 
 import pandas as pd
 
+from .cube import CubeSlice
+from .engine import compute_metrics
+from .telemetry import traced
 
 
-def compute_kpis(df: pd.DataFrame) -> dict[str, float]:
-    """Compute executive KPIs from the filtered dataset."""
-    if df.empty:
-        return {
-            "revenue": 0.0,
-            "orders": 0.0,
-            "avg_ticket": 0.0,
-            "avg_rating": 0.0,
-            "gross_income": 0.0,
-        }
+@traced("compute_kpis")
+def compute_kpis(df: pd.DataFrame | CubeSlice, order_error: float | None = None) -> dict[str, float]:
+    """Compute executive KPIs from the filtered dataset or a cube slice.
 
-    revenue = float(df["Total"].sum())
-    orders = float(df["Invoice ID"].nunique())
-    avg_ticket = revenue / orders if orders else 0.0
+    Pass ``order_error`` to estimate distinct orders with a HyperLogLog sketch.
+    """
+    return compute_metrics(df, ["kpis"], order_error=order_error)["kpis"]
 
-    return {
-        "revenue": revenue,
-        "orders": orders,
-        "avg_ticket": avg_ticket,
-        "avg_rating": float(df["Rating"].mean()),
-        "gross_income": float(df["Gross income"].sum()),
-    }
 
 
-
-def revenue_by_day(df: pd.DataFrame) -> pd.DataFrame:
+@traced("revenue_by_day")
+def revenue_by_day(df: pd.DataFrame | CubeSlice) -> pd.DataFrame:
     """Aggregate revenue by date for trend analysis."""
-    return (
-        df.groupby("Date", as_index=False)["Total"]
-        .sum()
-        .sort_values("Date")
-    )
+    return compute_metrics(df, ["by_day"])["by_day"]
 
 
 
-def revenue_by_product_line(df: pd.DataFrame) -> pd.DataFrame:
+@traced("revenue_by_product_line")
+def revenue_by_product_line(df: pd.DataFrame | CubeSlice) -> pd.DataFrame:
     """Aggregate revenue by product line."""
-    return (
-        df.groupby("Product line", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
-    )
+    return compute_metrics(df, ["by_product_line"])["by_product_line"]
 
 
 
-def revenue_by_city(df: pd.DataFrame) -> pd.DataFrame:
+@traced("revenue_by_city")
+def revenue_by_city(df: pd.DataFrame | CubeSlice) -> pd.DataFrame:
     """Aggregate revenue by city."""
-    return (
-        df.groupby("City", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
-    )
+    return compute_metrics(df, ["by_city"])["by_city"]
 
 
 
-def payment_mix(df: pd.DataFrame) -> pd.DataFrame:
+@traced("payment_mix")
+def payment_mix(df: pd.DataFrame | CubeSlice) -> pd.DataFrame:
     """Aggregate revenue by payment method."""
-    return (
-        df.groupby("Payment", as_index=False)["Total"]
-        .sum()
-        .sort_values("Total", ascending=False)
-    )
+    return compute_metrics(df, ["by_payment"])["by_payment"]
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import glob
+import hashlib
+from pathlib import Path
+from typing import Sequence
+from urllib.parse import unquote
+
+PARTITION_SUFFIXES = (".csv",)
+GLOB_CHARACTERS = set("*?[")
+# Partition keys that can be checked against the filters of ``filter_sales_data``.
+PRUNABLE_KEYS = {"cities": "city", "product_lines": "product_line"}
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One file of a partitioned dataset with its ``key=value`` path segments."""
+
+    path: Path
+    keys: dict[str, str] = field(default_factory=dict, hash=False)
+
+    @property
+    def month(self) -> str | None:
+        """The ``YYYY-MM`` month this file holds, when its path says so."""
+        month = self.keys.get("month")
+        if month is None:
+            return None
+        if len(month) == 7 and month[4] == "-":
+            return month
+        year = self.keys.get("year")
+        return f"{year}-{int(month):02d}" if year and month.isdigit() else None
+
+
+def is_partitioned_source(data_path: Path | str) -> bool:
+    """Whether ``data_path`` is a directory or glob of partitions rather than one file.
+
+    An existing path is taken literally, so a file named like
+    ``sales[2024].csv`` is a single source, not a pattern.
+    """
+    path = Path(data_path)
+    if path.exists():
+        return path.is_dir()
+    return bool(GLOB_CHARACTERS & set(str(data_path)))
+
+
+def _partition_keys(path: Path, root: Path | None) -> dict[str, str]:
+    parts = path.relative_to(root).parts[:-1] if root is not None else path.parts[:-1]
+    keys = {}
+    for part in parts:
+        key, separator, value = part.partition("=")
+        if separator:
+            keys[key.lower()] = unquote(value)
+    return keys
+
+
+def discover_partitions(source: Path | str) -> list[Partition]:
+    """List the CSV files of a directory tree or glob, sorted by path.
+
+    Hive-style directories (``year=2023/month=01/branch=Downtown``) become
+    partition keys; hidden directories such as ``.sales_cache`` are skipped.
+    """
+    root = Path(source)
+    if root.is_dir():
+        paths = [path for path in root.rglob("*") if path.suffix.lower() in PARTITION_SUFFIXES]
+        paths = [path for path in paths if not any(part.startswith(".") for part in path.relative_to(root).parts)]
+    else:
+        root = None
+        paths = [Path(match) for match in glob.glob(str(source), recursive=True)]
+        paths = [path for path in paths if path.is_file() and path.suffix.lower() in PARTITION_SUFFIXES]
+
+    return [Partition(path, _partition_keys(path, root)) for path in sorted(paths)]
+
+
+def _may_contain(
+    partition: Partition,
+    months: Sequence[str] | None,
+    selections: dict[str, Sequence[str] | None],
+) -> bool:
+    if months:
+        month = partition.month
+        year = partition.keys.get("year")
+        if month is not None and month not in months:
+            return False
+        if month is None and year is not None and not any(str(selected).startswith(year) for selected in months):
+            return False
+
+    for name, key in PRUNABLE_KEYS.items():
+        selected = selections[name]
+        if selected and key in partition.keys and partition.keys[key] not in selected:
+            return False
+    return True
+
+
+def prune_partitions(
+    partitions: Sequence[Partition],
+    months: Sequence[str] | None = None,
+    cities: Sequence[str] | None = None,
+    product_lines: Sequence[str] | None = None,
+) -> list[Partition]:
+    """Drop partitions whose path keys rule out every selected value.
+
+    A partition without the relevant key may hold any value and is kept.
+    """
+    selections = {"cities": cities, "product_lines": product_lines}
+    return [partition for partition in partitions if _may_contain(partition, months, selections)]
+
+
+def partitions_version(partitions: Sequence[Partition]) -> str:
+    """Identify the current contents of a partition set by paths, sizes and mtimes."""
+    digest = hashlib.blake2b(digest_size=12)
+    for partition in partitions:
+        stat = partition.path.stat()
+        digest.update(f"{partition.path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode("utf-8"))
+    return f"{len(partitions)}-{digest.hexdigest()}"
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOWS = (7, 28, 90)
+GROWTH_DIMENSIONS = ("City", "Product line")
+
+
+def _month_number(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[M]").astype(np.int64)
+
+
+def _growth_pct(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, (current / previous - 1.0) * 100.0, np.nan)
+
+
+class PeriodMetrics:
+    """Rolling-window, year-to-date and period-over-period revenue, maintained incrementally.
+
+    Revenue is kept per calendar day in a dense array with its prefix sums,
+    so every rolling window and year-to-date total is a difference of two
+    prefix sums. Monthly revenue per dimension value is kept in a
+    month x value matrix for month-over-month and year-over-year growth.
+    :meth:`update` adds rows in O(rows) plus the days after the earliest
+    touched day; nothing is regrouped from scratch.
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        dimensions: Sequence[str] = GROWTH_DIMENSIONS,
+    ) -> None:
+        self.windows = tuple(windows)
+        self.dimensions = tuple(dimensions)
+        self.start: np.datetime64 | None = None
+        self._daily = np.zeros(0, dtype=np.float64)
+        self._prefix = np.zeros(1, dtype=np.float64)
+        self.first_month: int | None = None
+        self._month_totals = np.zeros(0, dtype=np.float64)
+        self._labels: dict[str, dict[object, int]] = {dimension: {} for dimension in self.dimensions}
+        self._monthly: dict[str, np.ndarray] = {dimension: np.zeros((0, 0)) for dimension in self.dimensions}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, **options: Sequence) -> PeriodMetrics:
+        return cls(**options).update(df)
+
+    @property
+    def days(self) -> int:
+        return len(self._daily)
+
+    def update(self, rows: pd.DataFrame) -> PeriodMetrics:
+        """Add sales rows (or pre-aggregated rows with ``Date`` and ``Total``) from any dates."""
+        rows = rows[rows["Date"].notna()]
+        if rows.empty:
+            return self
+
+        days = rows["Date"].to_numpy().astype("datetime64[D]")
+        totals = np.nan_to_num(rows["Total"].to_numpy(dtype=np.float64))
+        self._extend_days(days.min(), days.max())
+        offsets = (days - self.start).astype(np.int64)
+        np.add.at(self._daily, offsets, totals)
+
+        # Sequential cumsum seeded with the untouched prefix matches a full recomputation bit for bit.
+        changed = int(offsets.min())
+        self._prefix[changed:] = np.cumsum(np.concatenate(([self._prefix[changed]], self._daily[changed:])))
+
+        months = _month_number(days)
+        self._extend_months(int(months.min()), int(months.max()))
+        month_offsets = months - self.first_month
+        np.add.at(self._month_totals, month_offsets, totals)
+        for dimension in self.dimensions:
+            codes, values = pd.factorize(rows[dimension])
+            columns = self._columns(dimension, values)
+            valid = codes >= 0
+            np.add.at(self._monthly[dimension], (month_offsets[valid], columns[codes[valid]]), totals[valid])
+        return self
+
+    def _extend_days(self, first: np.datetime64, last: np.datetime64) -> None:
+        if self.start is None:
+            self.start = first
+        before = max(int((self.start - first).astype(np.int64)), 0)
+        if before:
+            self.start = first
+            self._daily = np.concatenate((np.zeros(before), self._daily))
+            self._prefix = np.concatenate((np.zeros(before), self._prefix))
+        after = int((last - self.start).astype(np.int64)) + 1 - self.days
+        if after > 0:
+            self._daily = np.concatenate((self._daily, np.zeros(after)))
+            self._prefix = np.concatenate((self._prefix, np.full(after, self._prefix[-1])))
+
+    def _extend_months(self, first: int, last: int) -> None:
+        if self.first_month is None:
+            self.first_month = first
+        before = max(self.first_month - first, 0)
+        self.first_month -= before
+        after = max(last - self.first_month + 1 - len(self._month_totals) - before, 0)
+        self._month_totals = np.pad(self._month_totals, (before, after))
+        for dimension in self.dimensions:
+            self._monthly[dimension] = np.pad(self._monthly[dimension], ((before, after), (0, 0)))
+
+    def _columns(self, dimension: str, values: pd.Index | np.ndarray) -> np.ndarray:
+        labels = self._labels[dimension]
+        new = [value for value in values if value not in labels]
+        for value in new:
+            labels[value] = len(labels)
+        if new:
+            self._monthly[dimension] = np.pad(self._monthly[dimension], ((0, 0), (0, len(new))))
+        return np.array([labels[value] for value in values], dtype=np.int64)
+
+    def _dates(self) -> pd.DatetimeIndex:
+        return pd.date_range(pd.Timestamp(self.start), periods=self.days, freq="D")
+
+    def _window_sums(self, window: int) -> np.ndarray:
+        ends = np.arange(1, self.days + 1)
+        return self._prefix[ends] - self._prefix[np.maximum(ends - window, 0)]
+
+    def _ytd_sums(self) -> np.ndarray:
+        days = self.start + np.arange(self.days)
+        year_starts = (days.astype("datetime64[Y]").astype("datetime64[D]") - self.start).astype(np.int64)
+        return self._prefix[1:] - self._prefix[np.maximum(year_starts, 0)]
+
+    def daily(self) -> pd.DataFrame:
+        """One row per calendar day: revenue, each rolling window sum and the year-to-date total.
+
+        Days without sales count as zero; windows that start before the first
+        day only cover the available days.
+        """
+        if self.start is None:
+            columns = ["Date", "Total", *(f"rolling_{window}d" for window in self.windows), "ytd"]
+            return pd.DataFrame(columns=columns)
+
+        frame = pd.DataFrame({"Date": self._dates(), "Total": self._daily.copy()})
+        for window in self.windows:
+            frame[f"rolling_{window}d"] = self._window_sums(window)
+        frame["ytd"] = self._ytd_sums()
+        return frame
+
+    def window_revenue(self, window: int, as_of: pd.Timestamp | str | None = None) -> float:
+        """Revenue of the ``window`` days ending on ``as_of`` (default: the last day), in O(1)."""
+        if self.start is None:
+            return 0.0
+        end = self.days
+        if as_of is not None:
+            end = int((np.datetime64(pd.Timestamp(as_of), "D") - self.start).astype(np.int64)) + 1
+            end = min(max(end, 0), self.days)
+        return float(self._prefix[end] - self._prefix[max(end - window, 0)])
+
+    def ytd_revenue(self, as_of: pd.Timestamp | str | None = None) -> float:
+        """Revenue from January 1st of the year of ``as_of`` (default: the last day) through that day."""
+        if self.start is None:
+            return 0.0
+        as_of_day = self.start + self.days - 1 if as_of is None else np.datetime64(pd.Timestamp(as_of), "D")
+        year_start = as_of_day.astype("datetime64[Y]").astype("datetime64[D]")
+        days = (as_of_day - year_start).astype(np.int64) + 1
+        return self.window_revenue(int(days), as_of_day)
+
+    def growth(self, dimension: str | None = None) -> pd.DataFrame:
+        """Monthly revenue with month-over-month and year-over-year growth in percent.
+
+        Without ``dimension`` the totals are for all rows; otherwise there is
+        one row per month and dimension value. Growth is NaN when the
+        comparison month has no revenue or lies before the first month.
+        """
+        if dimension is None:
+            matrix = self._month_totals[:, None]
+            values: list[object] = [None]
+        else:
+            matrix = self._monthly[dimension]
+            values = list(self._labels[dimension])
+
+        month_count = matrix.shape[0]
+        previous_month = np.vstack((np.zeros((1, matrix.shape[1])), matrix[:-1])) if month_count else matrix
+        previous_year = np.vstack((np.zeros((min(12, month_count), matrix.shape[1])), matrix[:-12]))
+        months = np.arange(month_count) + (self.first_month or 0)
+        month_labels = pd.PeriodIndex.from_ordinals(months, freq="M").strftime("%Y-%m")
+
+        frame = pd.DataFrame(
+            {
+                "Month": np.repeat(month_labels, matrix.shape[1]),
+                "revenue": matrix.ravel(),
+                "mom_pct": _growth_pct(matrix, previous_month).ravel(),
+                "yoy_pct": _growth_pct(matrix, previous_year).ravel(),
+            }
+        )
+        if dimension is None:
+            return frame
+        frame.insert(1, dimension, np.tile(np.array(values, dtype=object), month_count))
+        return frame.sort_values(["Month", dimension], kind="stable").reset_index(drop=True)
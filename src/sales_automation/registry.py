@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+from .cache import DatasetSnapshot, SalesCache, get_shared_cache
+from .data import DATA_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+REGISTRY_ENV = "SALES_DATASETS"
+DATA_PATH_ENV = "SALES_DATA_PATH"
+MEBIBYTE = 1024**2
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """A registered dataset: its name (used in URLs), source and optional memory budget."""
+
+    name: str
+    path: Path
+    max_bytes: int | None = None
+
+
+def _megabytes(value: float | None) -> int | None:
+    return None if value is None else int(float(value) * MEBIBYTE)
+
+
+class DatasetRegistry:
+    """Named datasets served from one process, within per-dataset and total memory budgets.
+
+    A dataset counts its snapshot (rows, cube, index and summary) plus its
+    memoized results. When a dataset is used, its own results beyond its
+    ``max_bytes`` are evicted oldest first, and the least recently used
+    other datasets are unloaded until the loaded ones fit in the registry's
+    ``max_bytes``. An unloaded dataset reloads on its next request, from
+    the columnar cache when its source is unchanged.
+    """
+
+    def __init__(self, cache: SalesCache | None = None, max_bytes: int | None = DEFAULT_MAX_BYTES) -> None:
+        self.cache = cache or get_shared_cache()
+        self.max_bytes = max_bytes
+        self.unloads = 0
+        self._specs: dict[str, DatasetSpec] = {}
+        # Loaded datasets, least recently used first.
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, config_path: Path | str, cache: SalesCache | None = None) -> DatasetRegistry:
+        """Build a registry from a JSON file.
+
+        The file looks like ``{"max_mb": 4096, "datasets": [{"name": "north",
+        "path": "exports/north", "max_mb": 512}]}``; relative paths are
+        resolved against the file's directory and both budgets are optional.
+        """
+        config_path = Path(config_path)
+        config = json.loads(config_path.read_text(encoding="utf-8"))
+        max_bytes = _megabytes(config["max_mb"]) if "max_mb" in config else DEFAULT_MAX_BYTES
+        registry = cls(cache, max_bytes=max_bytes)
+        for entry in config["datasets"]:
+            registry.register(entry["name"], config_path.parent / entry["path"], _megabytes(entry.get("max_mb")))
+        return registry
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._specs)
+
+    def register(self, name: str, data_path: Path | str, max_bytes: int | None = None) -> DatasetSpec:
+        if not name or name in self._specs:
+            raise ValueError(f"Dataset name must be unique and non-empty, got {name!r}")
+        spec = DatasetSpec(name, Path(data_path), max_bytes)
+        self._specs[name] = spec
+        return spec
+
+    def spec(self, name: str) -> DatasetSpec:
+        try:
+            return self._specs[name]
+        except KeyError:
+            raise KeyError(f"Unknown dataset {name!r}; registered: {self.names}") from None
+
+    def load_in_background(self, name: str, watch: bool = True) -> Future[DatasetSnapshot]:
+        return self.cache.load_in_background(self.spec(name).path, watch=watch)
+
+    def dataset(self, name: str) -> DatasetSnapshot:
+        """Return the current snapshot of ``name`` and enforce the memory budgets around it."""
+        spec = self.spec(name)
+        snapshot = self.cache.dataset(spec.path)
+        with self._lock:
+            self._recent[name] = None
+            self._recent.move_to_end(name)
+        if spec.max_bytes is not None:
+            path_key = str(snapshot.path)
+            self.cache.results.trim_where(lambda key: key[1] == path_key, max(spec.max_bytes - snapshot.nbytes, 0))
+        self._unload_cold(keep=name)
+        return snapshot
+
+    def resident_bytes(self, name: str) -> int:
+        """Memory held by the loaded snapshot of ``name`` and its memoized results (0 when unloaded)."""
+        snapshot = self.cache.current(self.spec(name).path)
+        if snapshot is None:
+            return 0
+        path_key = str(snapshot.path)
+        return snapshot.nbytes + self.cache.results.bytes_where(lambda key: key[1] == path_key)
+
+    def unload(self, name: str) -> bool:
+        with self._lock:
+            self._recent.pop(name, None)
+        unloaded = self.cache.unload(self.spec(name).path)
+        if unloaded:
+            self.unloads += 1
+            logger.info("Unloaded cold dataset %s", name)
+        return unloaded
+
+    def _unload_cold(self, keep: str) -> None:
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            loaded = list(self._recent)
+        resident = {name: self.resident_bytes(name) for name in loaded}
+        total = sum(resident.values())
+        for name in loaded:
+            if total <= self.max_bytes:
+                break
+            if name != keep:
+                self.unload(name)
+                total -= resident[name]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            loaded = list(self._recent)
+        return {
+            "max_bytes": self.max_bytes,
+            "unloads": self.unloads,
+            "datasets": {
+                name: {
+                    "loaded": name in loaded,
+                    "resident_bytes": self.resident_bytes(name),
+                    "max_bytes": spec.max_bytes,
+                }
+                for name, spec in self._specs.items()
+            },
+        }
+
+
+_shared_registry: DatasetRegistry | None = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_shared_registry() -> DatasetRegistry:
+    """Return the process-wide registry.
+
+    It is read from the JSON file named by ``SALES_DATASETS``; without it,
+    the single source at ``SALES_DATA_PATH`` (default ``relatorio_vendas.csv``)
+    is registered under its file stem.
+    """
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            config = os.environ.get(REGISTRY_ENV)
+            if config:
+                _shared_registry = DatasetRegistry.from_file(config)
+            else:
+                data_path = Path(os.environ.get(DATA_PATH_ENV, DATA_PATH))
+                _shared_registry = DatasetRegistry()
+                _shared_registry.register(data_path.stem or "default", data_path)
+        return _shared_registry
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = (
+    "Branch",
+    "City",
+    "Customer type",
+    "Gender",
+    "Product line",
+    "Payment",
+)
+# Summed or averaged into KPIs, cubes and summaries, so they stay float64: float32 values that
+# round-trip one by one still drift in the sums (an average rating of 7.4645 became 7.464499995...).
+FLOAT64_COLUMNS = ("Total", "Gross income", "Rating")
+FLOAT32_COLUMNS = ("Unit price", "Tax 5%", "cogs", "gross margin percentage")
+INTEGER_COLUMNS = ("Quantity",)
+MONEY_DECIMALS = 2
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    """In-memory footprint of a sales frame before and after compaction."""
+
+    rows: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_per_row_before(self) -> float:
+        return self.bytes_before / self.rows if self.rows else 0.0
+
+    @property
+    def bytes_per_row_after(self) -> float:
+        return self.bytes_after / self.rows if self.rows else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.rows:,} rows: {self.bytes_per_row_before:,.1f} -> "
+            f"{self.bytes_per_row_after:,.1f} bytes/row"
+        )
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Return the deep memory usage of a frame, including its index."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _to_float32(series: pd.Series) -> pd.Series:
+    compact = series.astype(np.float32)
+    round_trip = np.round(compact.to_numpy(dtype=np.float64), MONEY_DECIMALS)
+    original = np.round(series.to_numpy(dtype=np.float64), MONEY_DECIMALS)
+    if np.array_equal(round_trip, original, equal_nan=True):
+        return compact
+    return series
+
+
+def _to_integer(series: pd.Series) -> pd.Series:
+    values = series.to_numpy(dtype=np.float64)
+    if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        return series
+    return pd.to_numeric(series.astype(np.int64), downcast="integer")
+
+
+def _to_invoice_ids(series: pd.Series) -> pd.Series:
+    try:
+        return series.astype("string[pyarrow]")
+    except ImportError:
+        return series
+
+
+def compact_sales_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, MemoryReport]:
+    """Convert a normalized sales frame to its compact in-memory schema.
+
+    Dimensions become categoricals, ``Month`` becomes an ordered categorical
+    whose codes are chronological period numbers, and numeric columns are
+    downcast only when every value survives the round trip.
+    """
+    bytes_before = frame_nbytes(df)
+    compact_df = df.copy()
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in compact_df.columns:
+            compact_df[column] = compact_df[column].astype("category")
+
+    if "Month" in compact_df.columns:
+        months = sorted(compact_df["Month"].dropna().unique().tolist())
+        compact_df["Month"] = pd.Categorical(compact_df["Month"], categories=months, ordered=True)
+
+    for column in FLOAT64_COLUMNS:
+        if column in compact_df.columns:
+            compact_df[column] = compact_df[column].astype(np.float64)
+
+    for column in FLOAT32_COLUMNS:
+        if column in compact_df.columns:
+            compact_df[column] = _to_float32(compact_df[column])
+
+    for column in INTEGER_COLUMNS:
+        if column in compact_df.columns:
+            compact_df[column] = _to_integer(compact_df[column])
+
+    if "Invoice ID" in compact_df.columns:
+        compact_df["Invoice ID"] = _to_invoice_ids(compact_df["Invoice ID"])
+
+    report = MemoryReport(
+        rows=len(compact_df),
+        bytes_before=bytes_before,
+        bytes_after=frame_nbytes(compact_df),
+    )
+    return compact_df, report
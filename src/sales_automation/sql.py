@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .aggregates import RESULT_COLUMNS
+from .cache import source_version
+from .columnar import CACHE_DIR_NAME
+from .data import (
+    COLUMN_RENAME_MAP,
+    DEFAULT_CHUNK_ROWS,
+    iter_sales_chunks,
+    sniff_csv_dialect,
+)
+from .engine import BREAKDOWN_DIMENSIONS, EMPTY_KPIS, PushdownSelection, _sort_breakdown
+from .partitions import discover_partitions, is_partitioned_source
+from .summary import MONEY_DECIMALS, MONEY_MEASURES
+
+logger = logging.getLogger(__name__)
+
+SALES_TABLE = "sales"
+FILTER_COLUMNS = {"months": "Month", "cities": "City", "product_lines": "Product line"}
+INDEXED_COLUMNS = ("Month", "City", "Product line", "Date")
+NUMERIC_COLUMNS = ("Total", "Gross income", "Quantity", "Rating", "Unit price")
+REQUIRED_COLUMNS = ("Total", "Gross income", "Quantity", "Rating")
+BACKENDS = ("sqlite", "duckdb")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _where(
+    months: Sequence[str] | None,
+    cities: Sequence[str] | None,
+    product_lines: Sequence[str] | None,
+) -> tuple[list[str], list[object]]:
+    clauses: list[str] = []
+    params: list[object] = []
+    for values, column in zip((months, cities, product_lines), FILTER_COLUMNS.values()):
+        if values:
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    return clauses, params
+
+
+def _where_sql(clauses: Sequence[str]) -> str:
+    return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+class SqlSlice(PushdownSelection):
+    """A filter selection whose metrics are answered by SQL aggregation queries.
+
+    Pass it to :func:`~sales_automation.engine.compute_metrics` or any
+    function in :mod:`sales_automation.metrics`, like a frame or a cube slice.
+    """
+
+    def __init__(self, backend: SqlBackend, clauses: list[str], params: list[object]) -> None:
+        self.backend = backend
+        self.engine = backend.name
+        self.clauses = clauses
+        self.params = params
+
+    def compute_metrics(self, outputs: Sequence[str]) -> dict[str, Any]:
+        return {
+            output: self._kpis() if output == "kpis" else self._breakdown(output)
+            for output in outputs
+        }
+
+    def _kpis(self) -> dict[str, float]:
+        totals = self.backend.query(
+            'SELECT COUNT(*) AS "rows", SUM("Total") AS revenue, COUNT(DISTINCT "Invoice ID") AS orders, '
+            'SUM("Rating") AS rating_sum, COUNT("Rating") AS rating_count, SUM("Gross income") AS gross_income '
+            f"FROM {SALES_TABLE}{_where_sql(self.clauses)}",
+            self.params,
+        ).iloc[0]
+        if not totals["rows"]:
+            return dict(EMPTY_KPIS)
+
+        revenue = float(totals["revenue"])
+        orders = float(totals["orders"])
+        rating_count = int(totals["rating_count"])
+        return {
+            "revenue": revenue,
+            "orders": orders,
+            "avg_ticket": revenue / orders if orders else 0.0,
+            "avg_rating": float(totals["rating_sum"]) / rating_count if rating_count else float("nan"),
+            "gross_income": float(totals["gross_income"]),
+        }
+
+    def _breakdown(self, output: str) -> pd.DataFrame:
+        dimension = BREAKDOWN_DIMENSIONS[output]
+        column = _quote(dimension)
+        clauses = [*self.clauses, f"{column} IS NOT NULL"]
+        frame = self.backend.query(
+            f'SELECT {column}, SUM("Total") AS "Total" FROM {SALES_TABLE}{_where_sql(clauses)} '
+            f"GROUP BY {column} ORDER BY {column}",
+            self.params,
+        )
+        frame["Total"] = frame["Total"].astype(np.float64)
+        if dimension == "Date":
+            frame["Date"] = pd.to_datetime(frame["Date"])
+        return _sort_breakdown(output, frame)
+
+
+class SqlBackend(ABC):
+    """Runs ``filter_sales_data`` and the metric functions as SQL on an embedded engine.
+
+    The normalized rows live in a ``sales`` table (or view) with the same
+    columns as :func:`~sales_automation.data.load_sales_data`, so only the
+    filtered rows or the aggregated results ever reach pandas.
+    """
+
+    name = "sql"
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def query(self, sql: str, params: Sequence[object] = ()) -> pd.DataFrame:
+        """Run ``sql`` with positional ``?`` parameters and return the result as a frame."""
+
+    def select(
+        self,
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> SqlSlice:
+        """Return the selection to pass to ``compute_metrics`` or the metric functions."""
+        return SqlSlice(self, *_where(months, cities, product_lines))
+
+    def filter_sales_data(
+        self,
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Fetch the normalized rows of a selection, ordered by date."""
+        clauses, params = _where(months, cities, product_lines)
+        rows = self.query(f'SELECT * FROM {SALES_TABLE}{_where_sql(clauses)} ORDER BY "Date"', params)
+        rows["Date"] = pd.to_datetime(rows["Date"])
+        return rows
+
+    def summary(
+        self,
+        by: Sequence[str] = (),
+        months: Sequence[str] | None = None,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """Grouped revenue, orders and averages, shaped like ``SalesAccumulator.result()``.
+
+        Revenue and gross income are rounded to the cent, like
+        :class:`~sales_automation.summary.SalesSummary` rollups.
+        """
+        keys = ", ".join(_quote(column) for column in by)
+        clauses, params = _where(months, cities, product_lines)
+        grouping = f" GROUP BY {keys} ORDER BY {keys}" if by else ""
+        summary = self.query(
+            f"SELECT {keys + ', ' if by else ''}"
+            'SUM("Total") AS revenue, COUNT(DISTINCT "Invoice ID") AS orders, '
+            'SUM("Rating") AS rating_sum, SUM("Gross income") AS gross_income, COUNT(*) AS "rows" '
+            f"FROM {SALES_TABLE}{_where_sql(clauses)}{grouping}",
+            params,
+        )
+        # Round money like SalesSummary rollups, so --backend reports match the default path to the cent.
+        for measure in MONEY_MEASURES:
+            summary[measure] = summary[measure].round(MONEY_DECIMALS)
+        summary["avg_rating"] = summary["rating_sum"] / summary["rows"]
+        summary["avg_ticket"] = summary["revenue"] / summary["orders"]
+        return summary[list(by) + RESULT_COLUMNS]
+
+    def daily_revenue(self, by: Sequence[str] = ()) -> pd.DataFrame:
+        """Revenue per ``Date`` (and ``by`` values), e.g. to feed ``PeriodMetrics``."""
+        keys = ", ".join(_quote(column) for column in ["Date", *by])
+        totals = self.query(f'SELECT {keys}, SUM("Total") AS "Total" FROM {SALES_TABLE} GROUP BY {keys} ORDER BY {keys}')
+        totals["Date"] = pd.to_datetime(totals["Date"])
+        return totals
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+
+def _default_database_path(data_path: Path | str) -> Path | None:
+    path = Path(data_path)
+    if path.is_dir():
+        return path / CACHE_DIR_NAME / "partitions.sqlite"
+    if path.is_file():
+        return path.parent / CACHE_DIR_NAME / f"{path.name}.sqlite"
+    return None
+
+
+class SqliteBackend(SqlBackend):
+    """SQLite backend (standard library) over a database file built from the source.
+
+    The source is ingested chunk by chunk, so it never has to fit in memory,
+    and the database is rebuilt only when the source version changes.
+    """
+
+    name = "sqlite"
+
+    def query(self, sql: str, params: Sequence[object] = ()) -> pd.DataFrame:
+        with self._lock:
+            return pd.read_sql_query(sql, self.connection, params=list(params))
+
+    @classmethod
+    def from_source(
+        cls,
+        data_path: Path | str,
+        database_path: Path | str | None = None,
+        chunksize: int = DEFAULT_CHUNK_ROWS,
+    ) -> SqliteBackend:
+        version = source_version(data_path)
+        database = Path(database_path) if database_path is not None else _default_database_path(data_path)
+        if database is not None:
+            database.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(str(database) if database is not None else ":memory:", check_same_thread=False)
+        connection.execute("CREATE TABLE IF NOT EXISTS sales_meta (version TEXT)")
+        stored = connection.execute("SELECT version FROM sales_meta").fetchone()
+        if stored is None or stored[0] != version:
+            cls._ingest(connection, data_path, version, chunksize)
+        return cls(connection)
+
+    @staticmethod
+    def _ingest(connection: sqlite3.Connection, data_path: Path | str, version: str, chunksize: int) -> None:
+        logger.info("Building SQLite sales table for %s", data_path)
+        connection.execute(f"DROP TABLE IF EXISTS {SALES_TABLE}")
+        for chunk in iter_sales_chunks(data_path, chunksize=chunksize):
+            chunk = chunk.assign(Date=chunk["Date"].dt.strftime("%Y-%m-%d"))
+            chunk.to_sql(SALES_TABLE, connection, if_exists="append", index=False)
+        for column in INDEXED_COLUMNS:
+            index_name = f"idx_{SALES_TABLE}_{column.lower().replace(' ', '_')}"
+            connection.execute(f"CREATE INDEX {index_name} ON {SALES_TABLE} ({_quote(column)})")
+        connection.execute("DELETE FROM sales_meta")
+        connection.execute("INSERT INTO sales_meta VALUES (?)", (version,))
+        connection.commit()
+
+
+class DuckDbBackend(SqlBackend):
+    """DuckDB backend querying the CSV or Parquet files in place (requires ``duckdb``).
+
+    CSV sources are exposed through a view that applies the same renames,
+    type coercion and row validation as ``load_sales_data``; DuckDB scans
+    them with vectorized, multi-threaded execution.
+    """
+
+    name = "duckdb"
+
+    def query(self, sql: str, params: Sequence[object] = ()) -> pd.DataFrame:
+        with self._lock:
+            return self.connection.execute(sql, list(params)).df()
+
+    @classmethod
+    def from_source(cls, data_path: Path | str, threads: int | None = None) -> DuckDbBackend:
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise RuntimeError("The DuckDB backend requires the 'duckdb' package") from exc
+
+        if is_partitioned_source(data_path):
+            paths = [str(partition.path) for partition in discover_partitions(data_path)]
+        else:
+            paths = [str(data_path)]
+        if not paths:
+            raise RuntimeError(f"Unable to find sales files at {data_path}")
+
+        connection = duckdb.connect()
+        if threads:
+            connection.execute(f"SET threads = {int(threads)}")
+
+        if all(path.endswith(".parquet") for path in paths):
+            source = f"read_parquet({_list_literal(paths)})"
+            connection.execute(f"CREATE VIEW {SALES_TABLE} AS SELECT * FROM {source}")
+        else:
+            connection.execute(f"CREATE VIEW {SALES_TABLE} AS {cls._normalizing_select(connection, paths)}")
+        return cls(connection)
+
+    @staticmethod
+    def _normalizing_select(connection: Any, paths: list[str]) -> str:
+        dialect = sniff_csv_dialect(paths[0])
+        options = [
+            "header = true",
+            "all_varchar = true",
+            f"delim = {_literal(dialect.delimiter)}",
+            f"quote = {_literal(dialect.quotechar)}",
+        ]
+        if not dialect.encoding.startswith("utf-8"):
+            options.append("encoding = 'latin-1'")
+        source = f"read_csv({_list_literal(paths)}, {', '.join(options)})"
+        raw_columns = [row[0] for row in connection.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()]
+
+        expressions = []
+        for raw in raw_columns:
+            if raw in ("", "column0", "Unnamed: 0"):
+                continue
+            name = COLUMN_RENAME_MAP.get(raw, raw)
+            value = _quote(raw)
+            if name in NUMERIC_COLUMNS:
+                if dialect.decimal != ".":
+                    value = f"replace({value}, '{dialect.decimal}', '.')"
+                value = f"TRY_CAST({value} AS DOUBLE)"
+            elif name == "Date":
+                value = _date_expression(connection, source, raw)
+            expressions.append(f"{value} AS {_quote(name)}")
+
+        required = " AND ".join(f"{_quote(column)} IS NOT NULL" for column in ("Date", *REQUIRED_COLUMNS))
+        return (
+            f"SELECT *, strftime(\"Date\", '%Y-%m') AS \"Month\" "
+            f"FROM (SELECT {', '.join(expressions)} FROM {source}) WHERE {required}"
+        )
+
+
+def _list_literal(values: Sequence[str]) -> str:
+    # DuckDB cannot bind parameters inside a view definition, so the paths are escaped instead.
+    return "[" + ", ".join(_literal(value) for value in values) + "]"
+
+
+def _date_expression(connection: Any, source: str, raw: str) -> str:
+    """Parse dates like ``pd.to_datetime(errors="coerce")`` in ``load_sales_data``.
+
+    pandas infers one format from the first non-empty value and turns
+    values in any other format into NaT; ``try_strptime`` with the same
+    format does the same, so rows with unparsable dates are dropped alike.
+    """
+    value = _quote(raw)
+    first = connection.execute(f"SELECT {value} FROM {source} WHERE trim({value}) <> '' LIMIT 1").fetchone()
+    date_format = guess_datetime_format(first[0].strip()) if first else None
+    if date_format is None:
+        return f"TRY_CAST({value} AS TIMESTAMP)"
+    return f"try_strptime(trim({value}), {_literal(date_format)})"
+
+
+def open_backend(name: str, data_path: Path | str, **options: Any) -> SqlBackend:
+    """Open the ``sqlite`` or ``duckdb`` backend over a sales source."""
+    if name == "sqlite":
+        return SqliteBackend.from_source(data_path, **options)
+    if name == "duckdb":
+        return DuckDbBackend.from_source(data_path, **options)
+    raise ValueError(f"Unknown SQL backend {name!r}; expected one of {BACKENDS}")
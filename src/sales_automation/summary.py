@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import RESULT_COLUMNS
+from .columnar import CACHE_DIR_NAME
+from .periods import GROWTH_DIMENSIONS, PeriodMetrics
+from .sketch import hash_values
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FORMAT_VERSION = 3
+SUMMARY_DIMENSIONS = ("City", "Product line")
+SUMMARY_KEYS = ["Date", *SUMMARY_DIMENSIONS]
+MEASURE_DTYPES = {
+    "revenue": "float64",
+    "orders": "int64",
+    "rating_sum": "float64",
+    "rating_count": "int64",
+    "gross_income": "float64",
+    "rows": "int64",
+}
+SUMMARY_MEASURES = list(MEASURE_DTYPES)
+# Measures that add up across cells; distinct orders do only when every invoice stays in one cell.
+ADDITIVE_MEASURES = [measure for measure in SUMMARY_MEASURES if measure != "orders"]
+MONEY_MEASURES = ("revenue", "gross_income")
+MONEY_DECIMALS = 2
+INVOICES_COLUMN = "invoices"
+
+
+def _empty_invoice_cells() -> pd.DataFrame:
+    return pd.DataFrame({"cell": pd.Series(dtype="int64"), "invoice": pd.Series(dtype="uint64")})
+
+
+def _empty_cells() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Date": pd.Series(dtype="datetime64[ns]"),
+            **{dimension: pd.Series(dtype=object) for dimension in SUMMARY_DIMENSIONS},
+            **{measure: pd.Series(dtype=dtype) for measure, dtype in MEASURE_DTYPES.items()},
+        }
+    )
+
+
+class SalesSummary:
+    """Daily sales totals per City x Product line, small enough to persist and reread.
+
+    Each Date x City x Product line cell holds revenue, distinct orders,
+    rating sum and count, gross income and row count. Monthly and daily
+    reports are rollups of these cells, so their cost depends on the number
+    of days covered rather than the number of rows. Like
+    :class:`~sales_automation.cube.SalesCube`, order counts are summed
+    across cells; only invoices with lines in several cells (product lines,
+    cities or days) are kept, as :attr:`shared_invoices` (cell, 64-bit
+    invoice hash) pairs, so a rollup counts them once, as with ``nunique``.
+    The stored summary therefore grows with the cells and the shared
+    invoices, not with the rows. Revenue and gross income rollups are
+    rounded to the cent, so repeated sums of the cells do not add float
+    noise to published reports.
+
+    To tell whether rows added by :meth:`update` belong to invoices it has
+    already counted, the summary also keeps a sorted in-memory index from
+    invoice hash to first cell. That index is not stored, so a summary read
+    back with :func:`read_summary` is meant for reporting, not for further
+    updates.
+    """
+
+    def __init__(
+        self,
+        cells: pd.DataFrame | None = None,
+        version: str | None = None,
+        shared_invoices: pd.DataFrame | None = None,
+    ) -> None:
+        self.cells = cells if cells is not None else _empty_cells()
+        self.version = version
+        self.shared_invoices = shared_invoices if shared_invoices is not None else _empty_invoice_cells()
+        self._invoice_hashes = np.empty(0, dtype=np.uint64)
+        self._invoice_first_cells = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, version: str | None = None) -> SalesSummary:
+        return cls(version=version).update(df)
+
+    @property
+    def rows(self) -> int:
+        return int(self.cells["rows"].sum())
+
+    @property
+    def invoices_are_cell_local(self) -> bool:
+        return self.shared_invoices.empty
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the cells, the shared invoices and the update index."""
+        return int(
+            self.cells.memory_usage(index=False, deep=True).sum()
+            + self.shared_invoices.memory_usage(index=False).sum()
+            + self._invoice_hashes.nbytes
+            + self._invoice_first_cells.nbytes
+        )
+
+    def update(self, rows: pd.DataFrame) -> SalesSummary:
+        """Add normalized sales rows (plain or compact schema); rows without a date are skipped."""
+        rows = rows[rows["Date"].notna()]
+        if rows.empty:
+            return self
+
+        frame = pd.DataFrame(
+            {
+                "Date": rows["Date"].dt.normalize().astype("datetime64[ns]"),
+                **{dimension: rows[dimension].astype(object) for dimension in SUMMARY_DIMENSIONS},
+                "Total": rows["Total"],
+                "Rating": rows["Rating"],
+                "Gross income": rows["Gross income"],
+            }
+        )
+        grouped = frame.groupby(SUMMARY_KEYS, dropna=False, sort=False)
+        partial = grouped.agg(
+            revenue=("Total", "sum"),
+            rating_sum=("Rating", "sum"),
+            rating_count=("Rating", "count"),
+            gross_income=("Gross income", "sum"),
+            rows=("Total", "size"),
+        ).reset_index()
+
+        # Existing cells keep their position; the batch's new cells are appended after them.
+        located = partial[SUMMARY_KEYS].merge(
+            self.cells[SUMMARY_KEYS].reset_index(names="position"), on=SUMMARY_KEYS, how="left"
+        )["position"]
+        added = located.isna().to_numpy()
+        positions = located.to_numpy(dtype=np.float64, na_value=np.nan)
+        positions[added] = np.arange(len(self.cells), len(self.cells) + added.sum())
+        positions = positions.astype(np.int64)
+        appended = partial.loc[added, SUMMARY_KEYS].assign(**{measure: 0 for measure in SUMMARY_MEASURES})
+        cells = appended if self.cells.empty else pd.concat([self.cells, appended], ignore_index=True)
+        cells = cells.astype(MEASURE_DTYPES)
+        for measure in ADDITIVE_MEASURES:
+            values = cells[measure].to_numpy(copy=True)
+            values[positions] += partial[measure].to_numpy(dtype=values.dtype)
+            cells[measure] = values
+
+        has_invoice = rows["Invoice ID"].notna().to_numpy()
+        pairs = pd.DataFrame(
+            {"cell": positions[grouped.ngroup().to_numpy()[has_invoice]], "invoice": hash_values(rows["Invoice ID"])}
+        ).drop_duplicates(ignore_index=True)
+        counted = self._count_orders(pairs)
+        orders = cells["orders"].to_numpy(copy=True)
+        orders += np.bincount(pairs["cell"].to_numpy()[counted], minlength=len(cells))
+        cells["orders"] = orders
+        self.cells = cells[SUMMARY_KEYS + SUMMARY_MEASURES]
+        return self
+
+    def _count_orders(self, pairs: pd.DataFrame) -> np.ndarray:
+        """Mark the (cell, invoice) pairs not counted yet and record invoices that span cells."""
+        invoices = pairs["invoice"].to_numpy()
+        first_cells = pairs.groupby("invoice", sort=False)["cell"].transform("first").to_numpy()
+        slots = np.searchsorted(self._invoice_hashes, invoices)
+        known = slots < len(self._invoice_hashes)
+        known[known] = self._invoice_hashes[slots[known]] == invoices[known]
+        first_cells[known] = self._invoice_first_cells[slots[known]]
+
+        # Index the invoices seen for the first time, keeping the index sorted.
+        new_invoices, first = np.unique(invoices[~known], return_index=True)
+        new_cells = first_cells[~known][first]
+        at = np.searchsorted(self._invoice_hashes, new_invoices)
+        self._invoice_hashes = np.insert(self._invoice_hashes, at, new_invoices)
+        self._invoice_first_cells = np.insert(self._invoice_first_cells, at, new_cells)
+
+        spanning = pairs["cell"].to_numpy() != first_cells
+        counted = ~known | spanning
+        if spanning.any():
+            recorded = pairs[spanning].merge(self.shared_invoices, how="left", indicator=True)["_merge"]
+            counted[spanning] = (recorded == "left_only").to_numpy()
+            shared = pd.concat(
+                [
+                    self.shared_invoices,
+                    pd.DataFrame({"cell": first_cells[spanning], "invoice": invoices[spanning]}),
+                    pairs[spanning],
+                ],
+                ignore_index=True,
+            )
+            self.shared_invoices = shared.drop_duplicates(ignore_index=True).astype({"cell": "int64", "invoice": "uint64"})
+        return counted
+
+    def select(
+        self,
+        cities: Sequence[str] | None = None,
+        product_lines: Sequence[str] | None = None,
+    ) -> SalesSummary:
+        """Return the cells for the given cities and product lines (``None`` keeps all)."""
+        mask = pd.Series(True, index=self.cells.index)
+        if cities:
+            mask &= self.cells["City"].isin(cities)
+        if product_lines:
+            mask &= self.cells["Product line"].isin(product_lines)
+        mask = mask.to_numpy()
+        renumbered = np.cumsum(mask) - 1
+        cells = self.shared_invoices["cell"].to_numpy()
+        kept = mask[cells]
+        shared_invoices = pd.DataFrame(
+            {"cell": renumbered[cells[kept]], "invoice": self.shared_invoices["invoice"].to_numpy()[kept]}
+        )
+        return SalesSummary(self.cells[mask].reset_index(drop=True), self.version, shared_invoices)
+
+    def _rollup(self, cells: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+        """Roll up ``cells`` (the summary's cells, possibly with extra key columns) by ``keys``."""
+        if cells.empty:
+            return pd.DataFrame(columns=keys + RESULT_COLUMNS)
+
+        grouped = cells.groupby(keys, dropna=False)
+        totals = grouped[SUMMARY_MEASURES].sum()
+        if not self.invoices_are_cell_local:
+            # A shared invoice was counted once per cell; count it once per group instead.
+            groups = grouped.ngroup().to_numpy()[self.shared_invoices["cell"].to_numpy()]
+            invoices = self.shared_invoices["invoice"].to_numpy()
+            distinct = pd.DataFrame({"group": groups, "invoice": invoices}).drop_duplicates()
+            totals["orders"] -= np.bincount(groups, minlength=len(totals)) - np.bincount(
+                distinct["group"].to_numpy(), minlength=len(totals)
+            )
+        for measure in MONEY_MEASURES:
+            totals[measure] = totals[measure].round(MONEY_DECIMALS)
+        totals["avg_rating"] = totals["rating_sum"] / totals["rating_count"]
+        totals["avg_ticket"] = totals["revenue"] / totals["orders"]
+        return totals.reset_index()[keys + RESULT_COLUMNS]
+
+    def daily(self, by: Sequence[str] = ()) -> pd.DataFrame:
+        """One row per day (and ``by`` value) with the same columns as :class:`SalesAccumulator`."""
+        return self._rollup(self.cells, ["Date", *by])
+
+    def monthly(self, by: Sequence[str] = ()) -> pd.DataFrame:
+        """One row per ``YYYY-MM`` month (and ``by`` value) with the same columns as :class:`SalesAccumulator`."""
+        cells = self.cells
+        if not cells.empty:
+            cells = cells.assign(Month=cells["Date"].dt.to_period("M").astype(str))
+        return self._rollup(cells, ["Month", *by])
+
+    def periods(self) -> PeriodMetrics:
+        """Rolling-window and growth metrics over the daily cells."""
+        daily = self.daily(by=GROWTH_DIMENSIONS).rename(columns={"revenue": "Total"})
+        return PeriodMetrics.from_frame(daily)
+
+
+def summary_path(data_path: Path | str) -> Path | None:
+    """Sidecar location for a source file or partition directory (globs have none)."""
+    path = Path(data_path)
+    if path.is_dir():
+        return path / CACHE_DIR_NAME / "partitions.summary.arrow"
+    if path.is_file():
+        return path.parent / CACHE_DIR_NAME / f"{path.name}.summary.arrow"
+    return None
+
+
+def read_summary(data_path: Path | str, version: str | None = None) -> SalesSummary | None:
+    """Return the stored summary, or ``None`` when it is missing, unreadable or not for ``version``."""
+    path = summary_path(data_path)
+    if path is None or not path.exists():
+        return None
+    try:
+        import pyarrow as pa
+
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (ImportError, OSError, ValueError) as exc:
+        logger.debug("Ignoring sales summary %s: %s", path, exc)
+        return None
+
+    metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+    if metadata.get("format_version") != str(SUMMARY_FORMAT_VERSION):
+        return None
+    if version is not None and metadata.get("version") != version:
+        return None
+
+    # Each cell's shared invoice hashes are one list; flatten them back into (cell, invoice) pairs.
+    invoices = table.column(INVOICES_COLUMN).combine_chunks()
+    offsets = invoices.offsets.to_numpy()
+    shared_invoices = pd.DataFrame(
+        {
+            "cell": np.repeat(np.arange(len(table), dtype=np.int64), np.diff(offsets)),
+            "invoice": invoices.values.to_numpy(zero_copy_only=False).astype(np.uint64, copy=False),
+        }
+    )
+    cells = table.drop_columns([INVOICES_COLUMN]).to_pandas()
+    return SalesSummary(
+        cells.astype(MEASURE_DTYPES) if len(cells) else None,
+        metadata.get("version"),
+        shared_invoices,
+    )
+
+
+def write_summary(data_path: Path | str, summary: SalesSummary) -> Path | None:
+    """Store the summary next to the source; failures are logged, never raised."""
+    path = summary_path(data_path)
+    if path is None:
+        return None
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    metadata = {"format_version": str(SUMMARY_FORMAT_VERSION), "version": summary.version or ""}
+    cells = summary.cells[SUMMARY_KEYS + SUMMARY_MEASURES].astype(MEASURE_DTYPES)
+    pairs = summary.shared_invoices.sort_values("cell", kind="stable")
+    counts = np.bincount(pairs["cell"].to_numpy(), minlength=len(cells))
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    invoices = pa.LargeListArray.from_arrays(pa.array(offsets), pa.array(pairs["invoice"].to_numpy(), pa.uint64()))
+    table = (
+        pa.Table.from_pandas(cells, preserve_index=False)
+        .append_column(INVOICES_COLUMN, invoices)
+        .replace_schema_metadata(metadata)
+    )
+    temporary = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with pa.OSFile(str(temporary), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(temporary, path)
+    except OSError as exc:
+        logger.warning("Unable to write sales summary for %s: %s", data_path, exc)
+        temporary.unlink(missing_ok=True)
+        return None
+    return path
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Iterator, TypeVar
+
+MAX_SPANS = 10_000
+ENV_FLAG = "SALES_TELEMETRY"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """One timed operation, with free-form tags such as row counts or cache hits."""
+
+    name: str
+    start_ns: int
+    duration_ns: int = 0
+    thread_id: int = 0
+    depth: int = 0
+    tags: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    def set(self, **tags: Any) -> None:
+        self.tags.update(tags)
+
+
+class _NullSpan:
+    # Shared stand-in returned while telemetry is off, so disabled spans allocate nothing.
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def set(self, **tags: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_enabled = os.environ.get(ENV_FLAG, "").lower() in {"1", "true", "yes"}
+_collecting = 0
+_spans: deque[Span] = deque(maxlen=MAX_SPANS)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def enable() -> None:
+    """Record spans from every thread into the global buffer."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled or _collecting > 0
+
+
+def recorded_spans() -> list[Span]:
+    """Return a copy of the spans kept in the global buffer (newest last)."""
+    with _lock:
+        return list(_spans)
+
+
+def clear() -> None:
+    with _lock:
+        _spans.clear()
+
+
+class _ActiveSpan:
+    __slots__ = ("span",)
+
+    def __init__(self, name: str, tags: dict[str, Any]) -> None:
+        self.span = Span(name=name, start_ns=0, thread_id=threading.get_ident(), tags=tags)
+
+    def __enter__(self) -> Span:
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.span.depth = len(stack)
+        stack.append(self.span)
+        self.span.start_ns = time.perf_counter_ns()
+        return self.span
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        span = self.span
+        span.duration_ns = time.perf_counter_ns() - span.start_ns
+        if exc_type is not None:
+            span.tags["error"] = exc_type.__name__
+        _local.stack.pop()
+
+        if _enabled:
+            with _lock:
+                _spans.append(span)
+        for collected in getattr(_local, "collectors", ()):
+            collected.append(span)
+
+
+def span(name: str, **tags: Any) -> _ActiveSpan | _NullSpan:
+    """Time a block: ``with span("filter", rows=n) as s: ...; s.set(cache="hit")``.
+
+    While telemetry is off this returns a shared no-op object, so the cost
+    is one flag check.
+    """
+    if not (_enabled or _collecting):
+        return _NULL_SPAN
+    return _ActiveSpan(name, tags)
+
+
+def _row_count(result: Any) -> int | None:
+    shape = getattr(result, "shape", None)
+    return shape[0] if shape else None
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorate a function so each call is a span tagged with the rows it returned."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not (_enabled or _collecting):
+                return func(*args, **kwargs)
+            with _ActiveSpan(span_name, {}) as active:
+                result = func(*args, **kwargs)
+                rows = _row_count(result)
+                if rows is not None:
+                    active.tags["rows"] = rows
+                return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextmanager
+def collect() -> Iterator[list[Span]]:
+    """Capture the spans finished by the current thread inside the block.
+
+    Collection switches span recording on for its duration even when
+    telemetry is otherwise disabled (e.g. to profile one dashboard rerun).
+    """
+    global _collecting
+    collected: list[Span] = []
+    collectors = getattr(_local, "collectors", None)
+    if collectors is None:
+        collectors = _local.collectors = []
+    collectors.append(collected)
+    with _lock:
+        _collecting += 1
+    try:
+        yield collected
+    finally:
+        with _lock:
+            _collecting -= 1
+        collectors.remove(collected)
+
+
+def summarize(spans: list[Span]) -> list[dict[str, Any]]:
+    """Aggregate spans by name: call count, total and max milliseconds."""
+    summary: dict[str, dict[str, Any]] = {}
+    for item in spans:
+        entry = summary.setdefault(item.name, {"span": item.name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        entry["calls"] += 1
+        entry["total_ms"] += item.duration_ms
+        entry["max_ms"] = max(entry["max_ms"], item.duration_ms)
+    return sorted(summary.values(), key=lambda entry: entry["total_ms"], reverse=True)
+
+
+def to_chrome_trace(spans: list[Span]) -> dict[str, Any]:
+    """Convert spans to Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    events = [
+        {
+            "name": item.name,
+            "cat": "sales_automation",
+            "ph": "X",
+            "ts": item.start_ns / 1e3,
+            "dur": item.duration_ns / 1e3,
+            "pid": pid,
+            "tid": item.thread_id,
+            "args": {key: value if isinstance(value, (int, float, bool)) else str(value) for key, value in item.tags.items()},
+        }
+        for item in spans
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path: Path | str, spans: list[Span] | None = None) -> Path:
+    """Write spans (default: the global buffer) as a Chrome trace file."""
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = to_chrome_trace(recorded_spans() if spans is None else spans)
+    output.write_text(json.dumps(payload), encoding="utf-8")
+    return output
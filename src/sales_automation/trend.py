@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .telemetry import span
+
+RESOLUTIONS = ("day", "week", "month")
+# Finest resolution used for a selected span of at most this many days.
+RESOLUTION_SPANS = (("day", 92), ("week", 731))
+# Upper bound on plotted points; longer series are reduced with LTTB.
+MAX_TREND_POINTS = 500
+# Per-point markers only pay off on short series.
+MARKER_POINT_LIMIT = 120
+
+_PERIODS = {"week": "W-SUN", "month": "M"}
+
+
+def choose_resolution(dates: pd.Series) -> str:
+    """Pick day, week or month from the span covered by ``dates``."""
+    if dates.empty:
+        return "day"
+    span_days = (dates.max() - dates.min()).days + 1
+    for resolution, max_days in RESOLUTION_SPANS:
+        if span_days <= max_days:
+            return resolution
+    return "month"
+
+
+def resample_trend(by_day: pd.DataFrame, resolution: str, x: str = "Date", y: str = "Total") -> pd.DataFrame:
+    """Sum a daily series into weeks (starting Monday) or calendar months."""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown trend resolution {resolution!r}; expected one of {RESOLUTIONS}")
+    if resolution == "day" or by_day.empty:
+        return by_day[[x, y]].reset_index(drop=True)
+
+    period_start = by_day[x].dt.to_period(_PERIODS[resolution]).dt.start_time
+    return by_day.groupby(period_start.rename(x), sort=True)[y].sum().reset_index()
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket, which preserves peaks
+    and troughs that plain decimation would drop.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64") - float(x[0])
+    y = np.asarray(y, dtype="float64")
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    anchor = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        next_lo, next_hi = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs(
+            (x[anchor] - avg_x) * (y[lo:hi] - y[anchor]) - (x[anchor] - x[lo:hi]) * (avg_y - y[anchor])
+        )
+        anchor = lo + int(np.argmax(area))
+        kept[bucket + 1] = anchor
+    return kept
+
+
+def downsample_lttb(frame: pd.DataFrame, threshold: int, x: str = "Date", y: str = "Total") -> pd.DataFrame:
+    """Reduce an x-ordered series to at most ``threshold`` rows with LTTB."""
+    if len(frame) <= threshold:
+        return frame.reset_index(drop=True)
+    x_values = frame[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype("datetime64[ns]").astype(np.int64)
+    kept = lttb_indices(x_values, frame[y].to_numpy(), threshold)
+    return frame.iloc[kept].reset_index(drop=True)
+
+
+def trend_series(
+    by_day: pd.DataFrame,
+    resolution: str = "auto",
+    max_points: int | None = MAX_TREND_POINTS,
+) -> tuple[pd.DataFrame, str]:
+    """Return the plotted revenue trend and the resolution it was built at.
+
+    ``resolution="auto"`` chooses from the selected date span; ``max_points=None``
+    returns the series at full resolution.
+    """
+    with span("trend_series", rows=len(by_day)) as active:
+        if resolution == "auto":
+            resolution = choose_resolution(by_day["Date"])
+        trend = resample_trend(by_day, resolution)
+        if max_points is not None:
+            trend = downsample_lttb(trend, max_points)
+        active.set(resolution=resolution, points=len(trend))
+    return trend, resolution
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .data import DATA_PATH, iter_sales_chunks, load_sales_data
+from .telemetry import span
+
+REQUIRED_COLUMNS = (
+    "Invoice ID",
+    "Branch",
+    "City",
+    "Customer type",
+    "Customer Name",
+    "Gender",
+    "Product line",
+    "Unit price",
+    "Quantity",
+    "Tax 5%",
+    "Total",
+    "Date",
+    "Time",
+    "Payment",
+    "cogs",
+    "gross margin percentage",
+    "Gross income",
+    "Rating",
+    "Month",
+)
+CITIES = ("Toronto", "Chicago", "Vancouver")
+PRODUCT_LINES = (
+    "Health & Wellness",
+    "Electronics Accessories",
+    "Home & Lifestyle",
+    "Food & Beverages",
+    "Sports & Travel",
+)
+DEFAULT_SAMPLE_SIZE = 5
+
+# numpy dtype kinds accepted for each logical type; categoricals count as labels.
+_DTYPE_KINDS = {"numeric": "iuf", "datetime": "M", "label": "OSUT"}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One declarative row-level check on a single column.
+
+    ``kind`` is ``"range"`` (``low``/``high`` bounds, either may be open or
+    exclusive), ``"allowed"`` (values in ``allowed``), ``"not_future"``
+    (dates up to today) or ``"dtype"`` (``dtype`` is ``numeric``,
+    ``datetime`` or ``label``). Nulls always violate.
+    """
+
+    name: str
+    column: str
+    kind: str
+    low: float | None = None
+    high: float | None = None
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+    allowed: frozenset[object] = frozenset()
+    dtype: str | None = None
+
+    def violations(self, values: pd.Series, today: date) -> np.ndarray:
+        """Boolean mask of the rows that break the rule."""
+        if self.kind == "dtype":
+            return np.full(len(values), not _has_dtype(values, self.dtype))
+        if self.kind == "allowed":
+            return ~values.isin(self.allowed).to_numpy()
+        if self.kind == "not_future":
+            days = pd.to_datetime(values, errors="coerce").to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+            return ~(days <= np.datetime64(today, "D"))
+        if self.kind == "range":
+            numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(numbers)
+            if self.low is not None:
+                valid &= numbers >= self.low if self.low_inclusive else numbers > self.low
+            if self.high is not None:
+                valid &= numbers <= self.high if self.high_inclusive else numbers < self.high
+            return ~valid
+        raise ValueError(f"Unknown rule kind: {self.kind}")
+
+
+def _has_dtype(values: pd.Series, dtype: str | None) -> bool:
+    if dtype == "label" and isinstance(values.dtype, pd.CategoricalDtype):
+        return True
+    return values.dtype.kind in _DTYPE_KINDS[dtype]
+
+
+def between(column: str, low: float, high: float) -> Rule:
+    return Rule(f"{column} between {low:g} and {high:g}", column, "range", low=low, high=high)
+
+
+def positive(column: str) -> Rule:
+    return Rule(f"{column} > 0", column, "range", low=0, low_inclusive=False)
+
+
+def allowed_values(column: str, values: Iterable[object]) -> Rule:
+    return Rule(f"{column} in allowed labels", column, "allowed", allowed=frozenset(values))
+
+
+def not_in_future(column: str) -> Rule:
+    return Rule(f"{column} not in the future", column, "not_future")
+
+
+def has_dtype(column: str, dtype: str) -> Rule:
+    if dtype not in _DTYPE_KINDS:
+        raise ValueError(f"dtype must be one of {sorted(_DTYPE_KINDS)}, got {dtype!r}")
+    return Rule(f"{column} is {dtype}", column, "dtype", dtype=dtype)
+
+
+SALES_RULES = (
+    *(has_dtype(column, "numeric") for column in ("Unit price", "Quantity", "Total", "Gross income", "Rating")),
+    has_dtype("Date", "datetime"),
+    positive("Total"),
+    positive("Quantity"),
+    positive("Gross income"),
+    between("Rating", 0, 10),
+    not_in_future("Date"),
+    allowed_values("City", CITIES),
+    allowed_values("Product line", PRODUCT_LINES),
+)
+
+
+@dataclass
+class RuleResult:
+    name: str
+    column: str
+    violations: int = 0
+    missing_column: bool = False
+    samples: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.missing_column and self.violations == 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rule": self.name,
+            "column": self.column,
+            "passed": self.passed,
+            "violations": self.violations,
+            "missing_column": self.missing_column,
+            "samples": self.samples,
+        }
+
+
+@dataclass
+class ValidationReport:
+    """Outcome of a validation run: violating row counts and a few sample rows per rule."""
+
+    rows: int
+    missing_columns: list[str]
+    results: list[RuleResult]
+
+    @property
+    def passed(self) -> bool:
+        return not self.missing_columns and all(result.passed for result in self.results)
+
+    @property
+    def failed(self) -> list[RuleResult]:
+        return [result for result in self.results if not result.passed]
+
+    def result(self, name: str) -> RuleResult:
+        for result in self.results:
+            if result.name == name:
+                return result
+        raise KeyError(name)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "passed": self.passed,
+            "missing_columns": self.missing_columns,
+            "rules": [result.as_dict() for result in self.results],
+        }
+
+
+def _sample_value(value: object) -> object:
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def validate(
+    data: pd.DataFrame | Iterable[pd.DataFrame],
+    rules: Sequence[Rule] = SALES_RULES,
+    required_columns: Sequence[str] = REQUIRED_COLUMNS,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    today: date | None = None,
+) -> ValidationReport:
+    """Evaluate every rule over one loaded frame or a stream of chunks.
+
+    Each chunk is visited once: all rules are evaluated as vectorized masks
+    on its columns, so adding a rule adds one array comparison rather than
+    another load of the dataset. Samples record the row position in the
+    input, the ``Invoice ID`` when present and the offending value.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    results = [RuleResult(rule.name, rule.column) for rule in rules]
+    missing: set[str] = set()
+    rows = 0
+
+    with span("validate", rules=len(rules)) as active:
+        for chunk in chunks:
+            missing.update(column for column in required_columns if column not in chunk.columns)
+            for rule, result in zip(rules, results):
+                if rule.column not in chunk.columns:
+                    result.missing_column = True
+                    continue
+                mask = rule.violations(chunk[rule.column], today)
+                count = int(np.count_nonzero(mask))
+                if not count:
+                    continue
+                result.violations += count
+                for position in np.flatnonzero(mask)[: sample_size - len(result.samples)]:
+                    sample = {"row": rows + int(position), "value": _sample_value(chunk[rule.column].iloc[position])}
+                    if "Invoice ID" in chunk.columns:
+                        sample["Invoice ID"] = _sample_value(chunk["Invoice ID"].iloc[position])
+                    result.samples.append(sample)
+            rows += len(chunk)
+        active.set(rows=rows)
+
+    return ValidationReport(rows, sorted(missing), results)
+
+
+def validate_file(
+    data_path: Path | str = DATA_PATH,
+    chunksize: int | None = None,
+    **options: Any,
+) -> ValidationReport:
+    """Validate a source file, streaming it in ``chunksize`` rows when given."""
+    data = iter_sales_chunks(data_path, chunksize) if chunksize else load_sales_data(data_path)
+    return validate(data, **options)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+import threading
+from typing import Callable
+
+from .cache import DatasetSnapshot, SalesCache, source_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_SECONDS = 2.0
+
+
+class DatasetWatcher:
+    """Poll a source file and hot-swap its shared snapshot when it changes.
+
+    A new version is loaded only after its size and mtime stay the same for
+    one poll interval, so half-written drops are not picked up. Loading runs
+    on the watcher thread; requests keep getting the previous snapshot until
+    the new one is installed in a single atomic swap.
+    """
+
+    def __init__(
+        self,
+        cache: SalesCache,
+        data_path: Path | str,
+        interval_seconds: float = DEFAULT_POLL_SECONDS,
+        on_reload: Callable[[DatasetSnapshot], None] | None = None,
+    ) -> None:
+        self.cache = cache
+        self.data_path = Path(data_path).resolve()
+        self.interval_seconds = interval_seconds
+        self.on_reload = on_reload
+        self.reload_count = 0
+        self.last_error: Exception | None = None
+        self._observed_version: str | None = None
+        self._failed_version: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> DatasetWatcher:
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"dataset-watcher:{self.data_path.name}",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.poll_once()
+            except Exception:  # pragma: no cover - keep the watcher alive
+                logger.exception("Dataset watcher for %s failed", self.data_path)
+
+    def poll_once(self) -> bool:
+        """Check the source once; return ``True`` when a new snapshot was installed."""
+        try:
+            version = source_version(self.data_path)
+        except FileNotFoundError:
+            # The drop is being replaced; keep serving the current snapshot.
+            self._observed_version = None
+            return False
+
+        current = self.cache.current(self.data_path)
+        settled = version == self._observed_version
+        self._observed_version = version
+
+        # An unloaded dataset stays unloaded until it is requested again.
+        if current is None or current.version == version:
+            return False
+        if not settled or version == self._failed_version:
+            return False
+
+        try:
+            snapshot = self.cache.load_snapshot(self.data_path, version)
+        except Exception as exc:
+            logger.warning("Keeping previous snapshot of %s; reload failed: %s", self.data_path, exc)
+            self.last_error = exc
+            self._failed_version = version
+            return False
+
+        if not self.cache.install(snapshot, replace_only=True):
+            logger.info("Discarding reload of %s; it was unloaded", self.data_path)
+            return False
+        self.reload_count += 1
+        self.last_error = None
+        logger.info("Reloaded %s (version %s)", self.data_path, version)
+        if self.on_reload is not None:
+            self.on_reload(snapshot)
+        return True
@@ -0,0 +1,50 @@
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+from sales_automation.aggregates import SalesAccumulator
+from sales_automation.data import iter_sales_chunks, load_sales_data
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+
+
+class TestStreamingAggregates(unittest.TestCase):
+    def test_chunked_monthly_summary_matches_full_load(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        expected = (
+            df.groupby("Month", as_index=False)
+            .agg(
+                revenue=("Total", "sum"),
+                orders=("Invoice ID", "nunique"),
+                avg_rating=("Rating", "mean"),
+                gross_income=("Gross income", "sum"),
+            )
+            .sort_values("Month")
+            .reset_index(drop=True)
+        )
+
+        accumulator = SalesAccumulator(by=["Month"])
+        chunk_rows = 0
+        for chunk in iter_sales_chunks(DATA_PATH, chunksize=97):
+            chunk_rows += len(chunk)
+            accumulator.update(chunk)
+        actual = accumulator.result()
+
+        self.assertEqual(chunk_rows, len(df))
+        pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+    def test_merged_accumulators_count_shared_invoices_once(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        first_half, second_half = df.iloc[:600], df.iloc[400:]
+
+        merged = SalesAccumulator().update(first_half).merge(SalesAccumulator().update(second_half))
+        result = merged.result()
+
+        self.assertEqual(int(result["orders"].iloc[0]), df["Invoice ID"].nunique())
+        self.assertEqual(int(result["rows"].iloc[0]), len(first_half) + len(second_half))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+from pathlib import Path
+import asyncio
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+from sales_automation.api import MetricsAPI
+from sales_automation.cache import SalesCache
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.engine import compute_metrics
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class SlowSalesCache(SalesCache):
+    """Holds every metric computation until released, to line up concurrent requests."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.metric_calls = 0
+
+    def metrics(self, *args, **kwargs):
+        self.metric_calls += 1
+        self.release.wait(5)
+        return super().metrics(*args, **kwargs)
+
+
+class TestMetricsAPI(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.tmp.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_kpis_match_engine_and_honor_etags(self) -> None:
+        api = MetricsAPI(self.data_path, SalesCache())
+
+        async def scenario() -> list:
+            first = await api.handle("GET", "/kpis?city=Toronto")
+            repeat = await api.handle("GET", "/kpis?city=Toronto", {"if-none-match": first.etag})
+            other = await api.handle("GET", "/kpis?city=Toronto,Chicago")
+            with self.data_path.open("a", encoding="utf-8") as handle:
+                handle.write(
+                    "INV-1005,Uptown,Chicago,Member,Ava Martin,Female,Electronics Accessories,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+                )
+            changed = await api.handle("GET", "/kpis?city=Toronto", {"if-none-match": first.etag})
+            return [first, repeat, other, changed]
+
+        first, repeat, other, changed = asyncio.run(scenario())
+        expected = compute_metrics(filter_sales_data(load_sales_data(FIXTURE_PATH), cities=["Toronto"]), ["kpis"])
+
+        self.assertEqual(first.status, 200)
+        self.assertEqual(json.loads(first.body)["kpis"], expected["kpis"])
+        self.assertEqual((repeat.status, repeat.body, repeat.etag), (304, b"", first.etag))
+        self.assertNotEqual(other.etag, first.etag)
+        self.assertEqual(changed.status, 200)
+        self.assertNotEqual(changed.etag, first.etag)
+        self.assertEqual(api.stats["not_modified"], 1)
+
+    def test_identical_concurrent_requests_share_one_computation(self) -> None:
+        cache = SlowSalesCache()
+        api = MetricsAPI(self.data_path, cache)
+
+        async def scenario() -> list:
+            requests = [api.handle("GET", "/metrics?outputs=kpis,by_city&product_line=Home %26 Lifestyle") for _ in range(20)]
+            gathered = asyncio.gather(*requests)
+            await asyncio.sleep(0.2)
+            cache.release.set()
+            return await gathered
+
+        responses = asyncio.run(scenario())
+        self.assertEqual(cache.metric_calls, 1)
+        self.assertEqual(api.stats["computed"], 1)
+        self.assertEqual(api.stats["coalesced"], 19)
+        self.assertEqual(len({(response.status, response.body, response.etag) for response in responses}), 1)
+        payload = json.loads(responses[0].body)
+        self.assertEqual(set(payload), {"kpis", "by_city"})
+        self.assertEqual(payload["by_city"], [{"City": "Chicago", "Total": 63.0}])
+
+    def test_http_server_routes_and_errors(self) -> None:
+        api = MetricsAPI(self.data_path, SalesCache())
+
+        def fetch(url: str, headers: dict[str, str] | None = None) -> tuple[int, dict, bytes]:
+            request = urllib.request.Request(url, headers=headers or {})
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    return response.status, dict(response.headers), response.read()
+            except urllib.error.HTTPError as exc:
+                return exc.code, dict(exc.headers), exc.read()
+
+        async def scenario() -> list:
+            server = await api.serve("127.0.0.1", 0)
+            base = "http://127.0.0.1:%s" % server.sockets[0].getsockname()[1]
+            loop = asyncio.get_running_loop()
+            async with server:
+                filters = await loop.run_in_executor(None, fetch, f"{base}/filters")
+                cached = await loop.run_in_executor(None, fetch, f"{base}/filters", {"If-None-Match": filters[1]["ETag"]})
+                bad = await loop.run_in_executor(None, fetch, f"{base}/metrics?outputs=by_planet")
+                missing = await loop.run_in_executor(None, fetch, f"{base}/nowhere")
+            return [filters, cached, bad, missing]
+
+        filters, cached, bad, missing = asyncio.run(scenario())
+        self.assertEqual(filters[0], 200)
+        self.assertEqual(json.loads(filters[2])["City"], ["Chicago", "Toronto", "Vancouver"])
+        self.assertEqual(cached[0], 304)
+        self.assertEqual(bad[0], 400)
+        self.assertIn("by_planet", json.loads(bad[2])["error"])
+        self.assertEqual(missing[0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
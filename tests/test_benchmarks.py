@@ -0,0 +1,46 @@
+from pathlib import Path
+import tempfile
+import unittest
+
+from scripts.run_benchmarks import compare_results, generate_synthetic_sales, run_benchmarks
+from sales_automation.data import load_sales_data
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self._tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_synthetic_data_matches_source_schema(self) -> None:
+        path = generate_synthetic_sales(self.data_dir / "synthetic.csv", rows=2_000, seed=7)
+        synthetic = load_sales_data(path)
+        source = load_sales_data(Path("relatorio_vendas.csv"))
+
+        self.assertEqual(len(synthetic), 2_000)
+        self.assertEqual(list(synthetic.columns), list(source.columns))
+        self.assertTrue(synthetic["Invoice ID"].is_unique)
+        self.assertEqual(set(synthetic["City"]), set(source["City"]))
+        self.assertEqual(synthetic["Month"].nunique(), 12)
+        self.assertTrue((synthetic["Total"] > 0).all())
+
+    def test_run_and_compare_benchmarks(self) -> None:
+        payload = run_benchmarks(
+            [500],
+            stages=["filter_sales_data", "compute_kpis"],
+            repeat=1,
+            isolate=False,
+            data_dir=self.data_dir,
+        )
+        self.assertEqual([item["stage"] for item in payload["results"]], ["filter_sales_data", "compute_kpis"])
+        self.assertTrue(all(item["rows_per_second"] > 0 for item in payload["results"]))
+
+        baseline = {"results": [dict(item, wall_seconds=item["wall_seconds"] / 10) for item in payload["results"]]}
+        self.assertEqual(compare_results(payload, payload), [])
+        self.assertEqual(len(compare_results(payload, baseline, min_seconds=0.0)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from sales_automation.cache import ResultCache, SalesCache, build_snapshot
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.metrics import compute_kpis
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction_and_counters(self) -> None:
+        cache = ResultCache(max_entries=2, max_bytes=None, ttl_seconds=None)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.entries), (2, 1, 1, 2))
+
+    def test_entries_expire_after_ttl(self) -> None:
+        clock = FakeClock()
+        cache = ResultCache(ttl_seconds=10, clock=clock)
+        computed = []
+
+        def compute() -> int:
+            computed.append(1)
+            return len(computed)
+
+        self.assertEqual(cache.get_or_compute("key", compute), 1)
+        clock.now = 5
+        self.assertEqual(cache.get_or_compute("key", compute), 1)
+        clock.now = 11
+        self.assertEqual(cache.get_or_compute("key", compute), 2)
+        self.assertEqual(cache.stats().expirations, 1)
+
+
+class TestSalesCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_dataset_is_shared_until_source_changes(self) -> None:
+        cache = SalesCache()
+        first = cache.dataset(self.data_path)
+        self.assertIs(cache.dataset(self.data_path), first)
+
+        lines = self.data_path.read_text(encoding="utf-8").splitlines()
+        self.data_path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+
+        reloaded = cache.dataset(self.data_path)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(len(reloaded.frame), len(first.frame) - 1)
+
+    def test_equivalent_selections_share_memoized_metrics(self) -> None:
+        cache = SalesCache()
+        snapshot = cache.dataset(self.data_path)
+        cities = snapshot.dimension_values["City"]
+
+        unfiltered = cache.metrics(snapshot, outputs=["kpis"])
+        all_cities = cache.metrics(snapshot, cities=list(reversed(cities)), outputs=["kpis"])
+        self.assertIs(all_cities, unfiltered)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        toronto = cache.metrics(snapshot, cities=["Toronto"], outputs=["kpis"])
+        expected = compute_kpis(filter_sales_data(load_sales_data(self.data_path), cities=["Toronto"]))
+        self.assertAlmostEqual(toronto["kpis"]["revenue"], expected["revenue"], places=6)
+        self.assertEqual(len(cache.filtered_frame(snapshot, cities=["Toronto"])), 2)
+
+    def test_background_load_resolves_once_and_retries_failures(self) -> None:
+        cache = SalesCache()
+        loading = cache.load_in_background(self.data_path)
+        self.assertIs(cache.load_in_background(self.data_path), loading)
+
+        snapshot = loading.result(timeout=30)
+        self.assertIs(cache.current(self.data_path), snapshot)
+        self.assertEqual(len(snapshot.frame), 4)
+        cache.watch(self.data_path).stop()
+
+        missing = Path(self._tmp_dir.name) / "missing.csv"
+        failed = cache.load_in_background(missing, watch=False)
+        with self.assertRaises(OSError):
+            failed.result(timeout=30)
+        self.assertIsNot(cache.load_in_background(missing, watch=False), failed)
+
+    def test_loads_run_outside_the_lock_and_are_shared(self) -> None:
+        other_path = Path(self._tmp_dir.name) / "other.csv"
+        shutil.copyfile(FIXTURE_PATH, other_path)
+        release = threading.Event()
+        loads = []
+
+        def loader(path: Path, version: str):
+            loads.append(path)
+            if path == self.data_path.resolve():
+                release.wait(timeout=30)
+            return build_snapshot(path, version)
+
+        cache = SalesCache(loader=loader)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            slow = [pool.submit(cache.dataset, self.data_path) for _ in range(2)]
+            while not loads:
+                time.sleep(0.01)
+            # Another dataset loads while the first one is still in progress.
+            try:
+                self.assertEqual(len(pool.submit(cache.dataset, other_path).result(timeout=5).frame), 4)
+            finally:
+                release.set()
+            first, second = (future.result(timeout=30) for future in slow)
+
+        self.assertIs(first, second)
+        self.assertIs(cache.current(self.data_path), first)
+        self.assertEqual(loads.count(self.data_path.resolve()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
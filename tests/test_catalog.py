@@ -0,0 +1,55 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from sales_automation.cache import build_snapshot, source_version
+from sales_automation.catalog import build_catalog, catalog_path, read_catalog, write_catalog
+from sales_automation.data import load_sales_data
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestFilterCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_catalog_summarizes_filter_values_and_round_trips(self) -> None:
+        catalog = build_catalog(load_sales_data(self.data_path, compact=True), "v1")
+
+        self.assertEqual((catalog.rows, catalog.min_date, catalog.max_date), (4, "2023-01-10", "2023-02-15"))
+        self.assertEqual(catalog.counts["City"], {"Chicago": 1, "Toronto": 2, "Vancouver": 1})
+        self.assertEqual(catalog.options("Month"), ["2023-01", "2023-02"])
+
+        self.assertEqual(write_catalog(self.data_path, catalog), catalog_path(self.data_path))
+        self.assertEqual(read_catalog(self.data_path, "v1"), catalog)
+        self.assertIsNone(read_catalog(self.data_path, "v2"))
+        catalog_path(self.data_path).write_text("{not json", encoding="utf-8")
+        self.assertIsNone(read_catalog(self.data_path))
+        self.assertIsNone(catalog_path(Path(self._tmp_dir.name) / "*.csv"))
+
+    def test_snapshot_build_stores_the_sidecar_for_the_next_cold_start(self) -> None:
+        snapshot = build_snapshot(self.data_path)
+        stored = read_catalog(self.data_path, source_version(self.data_path))
+
+        self.assertEqual(stored, snapshot.catalog)
+        frame = load_sales_data(self.data_path)
+        for dimension in ("Month", "City", "Product line"):
+            self.assertEqual(snapshot.dimension_values[dimension], sorted(frame[dimension].unique()))
+
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(
+                "INV-1005,Uptown,Chicago,Member,Ava Martin,Female,Electronics Accessories,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+            )
+        self.assertIsNone(read_catalog(self.data_path, source_version(self.data_path)))
+        self.assertEqual(build_snapshot(self.data_path).catalog.options("Month")[-1], "2023-03")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from pathlib import Path
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from sales_automation.columnar import cache_paths
+from sales_automation.data import load_sales_data
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestColumnarCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_cached_load_matches_direct_load(self) -> None:
+        expected = load_sales_data(self.data_path)
+
+        first = load_sales_data(self.data_path, use_cache=True)
+        arrow_path, meta_path = cache_paths(self.data_path)
+        self.assertTrue(arrow_path.exists())
+        self.assertTrue(meta_path.exists())
+
+        second = load_sales_data(self.data_path, use_cache=True)
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_cache_is_rebuilt_when_source_changes(self) -> None:
+        load_sales_data(self.data_path, use_cache=True)
+
+        lines = self.data_path.read_text(encoding="utf-8").splitlines()
+        self.data_path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+
+        reloaded = load_sales_data(self.data_path, use_cache=True)
+        self.assertEqual(len(reloaded), len(lines) - 2)
+
+    def test_touched_source_reuses_cache(self) -> None:
+        load_sales_data(self.data_path, use_cache=True)
+        arrow_path, _ = cache_paths(self.data_path)
+        cache_mtime = arrow_path.stat().st_mtime_ns
+
+        stat = self.data_path.stat()
+        os.utime(self.data_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+        load_sales_data(self.data_path, use_cache=True)
+        self.assertEqual(arrow_path.stat().st_mtime_ns, cache_mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
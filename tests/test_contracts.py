@@ -1,52 +1,31 @@
-from datetime import datetime, timezone
 from pathlib import Path
 import unittest
 
 from sales_automation.data import load_sales_data
+from sales_automation.validation import validate
 
 
 DATA_PATH = Path("relatorio_vendas.csv")
-REQUIRED_COLUMNS = {
-    "Invoice ID",
-    "Branch",
-    "City",
-    "Customer type",
-    "Customer Name",
-    "Gender",
-    "Product line",
-    "Unit price",
-    "Quantity",
-    "Tax 5%",
-    "Total",
-    "Date",
-    "Time",
-    "Payment",
-    "cogs",
-    "gross margin percentage",
-    "Gross income",
-    "Rating",
-    "Month",
-}
 
 
 class TestDataContracts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.report = validate(load_sales_data(DATA_PATH))
+
+    def assert_rules_pass(self, *names: str) -> None:
+        for name in names:
+            result = self.report.result(name)
+            self.assertTrue(result.passed, f"{name}: {result.violations} violating rows, e.g. {result.samples}")
+
     def test_required_columns_exist(self) -> None:
-        df = load_sales_data(DATA_PATH)
-        missing = REQUIRED_COLUMNS - set(df.columns)
-        self.assertEqual(missing, set(), f"Missing required columns: {missing}")
+        self.assertEqual(self.report.missing_columns, [], f"Missing required columns: {self.report.missing_columns}")
 
     def test_numeric_ranges_are_valid(self) -> None:
-        df = load_sales_data(DATA_PATH)
-
-        self.assertTrue((df["Total"] > 0).all())
-        self.assertTrue((df["Quantity"] > 0).all())
-        self.assertTrue((df["Gross income"] > 0).all())
-        self.assertTrue(df["Rating"].between(0, 10).all())
+        self.assert_rules_pass("Total > 0", "Quantity > 0", "Gross income > 0", "Rating between 0 and 10")
 
     def test_dates_are_not_in_the_future(self) -> None:
-        df = load_sales_data(DATA_PATH)
-        today = datetime.now(timezone.utc).date()
-        self.assertTrue((df["Date"].dt.date <= today).all())
+        self.assert_rules_pass("Date is datetime", "Date not in the future")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+from sales_automation.cube import SalesCube
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.metrics import (
+    compute_kpis,
+    payment_mix,
+    revenue_by_city,
+    revenue_by_day,
+    revenue_by_product_line,
+)
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+BREAKDOWNS = (revenue_by_day, revenue_by_product_line, revenue_by_city, payment_mix)
+
+
+class TestSalesCube(unittest.TestCase):
+    def assert_slice_matches_frame(self, df: pd.DataFrame, cube: SalesCube, **filters: list[str]) -> None:
+        filtered_df = filter_sales_data(df, **filters)
+        selection = cube.slice(**filters)
+
+        expected_kpis = compute_kpis(filtered_df)
+        actual_kpis = compute_kpis(selection)
+        for key, value in expected_kpis.items():
+            self.assertAlmostEqual(actual_kpis[key], value, places=6, msg=f"{key} for {filters}")
+
+        for breakdown in BREAKDOWNS:
+            pd.testing.assert_frame_equal(
+                breakdown(selection).reset_index(drop=True),
+                breakdown(filtered_df).reset_index(drop=True),
+                check_exact=False,
+            )
+
+    def test_cube_rollups_match_frame_metrics(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        cube = SalesCube.from_frame(df)
+        months = sorted(df["Month"].unique())
+
+        self.assert_slice_matches_frame(df, cube)
+        self.assert_slice_matches_frame(df, cube, months=[months[-1]])
+        self.assert_slice_matches_frame(df, cube, months=months[:3], cities=["Toronto", "Chicago"])
+        self.assert_slice_matches_frame(df, cube, product_lines=["Electronics Accessories"])
+        self.assertTrue(cube.slice(months=["1999-01"]).empty)
+
+    def test_cube_counts_invoices_spanning_cells_once(self) -> None:
+        df = load_sales_data(FIXTURE_PATH)
+        df.loc[1, "Invoice ID"] = df.loc[0, "Invoice ID"]
+        cube = SalesCube.from_frame(df)
+
+        self.assertFalse(cube.invoices_are_cell_local)
+        self.assertEqual(compute_kpis(cube.slice())["orders"], 3.0)
+        self.assert_slice_matches_frame(df, cube, cities=["Toronto", "Chicago"])
+
+
+if __name__ == "__main__":
+    unittest.main()
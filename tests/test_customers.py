@@ -0,0 +1,107 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.cache import SalesCache
+from sales_automation.customers import compute_customer_metrics
+from sales_automation.data import load_sales_data
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+REPEAT_ROWS = (
+    "INV-1005,Downtown,Toronto,Member,Olivia Smith,Female,Sports & Travel,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+    "INV-1006,Uptown,Chicago,Regular,Liam Brown,Male,Home & Lifestyle,10,3,1.5,31.5,2023-01-20,16:45,Credit Card,30,0,30,9.0\n"
+)
+
+
+class TestCustomerMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.tmp.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(REPEAT_ROWS)
+        self.df = load_sales_data(self.data_path, compact=True)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_repeat_rate_cohorts_rfm_and_customer_types(self) -> None:
+        metrics = compute_customer_metrics(self.df)
+
+        self.assertEqual(
+            metrics["repeat"],
+            {"customers": 4, "repeat_customers": 2, "repeat_rate": 0.5, "orders_per_customer": 1.5},
+        )
+        cohorts = metrics["cohorts"]
+        self.assertEqual(cohorts["Cohort"].tolist(), ["2023-01", "2023-01", "2023-02"])
+        self.assertEqual(cohorts["months_since_first"].tolist(), [0, 2, 0])
+        self.assertEqual(cohorts["customers"].tolist(), [2, 1, 2])
+        self.assertEqual(cohorts["retention"].tolist(), [1.0, 0.5, 1.0])
+
+        rfm = metrics["rfm"]
+        self.assertEqual(rfm["Customer Name"].tolist(), ["Olivia Smith", "Liam Brown", "Noah Wilson", "Emma Davis"])
+        self.assertEqual(rfm["recency_days"].tolist(), [0, 41, 15, 25])
+        self.assertEqual(rfm["frequency"].tolist(), [2, 2, 1, 1])
+        self.assertEqual(rfm["rfm"].tolist(), [555, 254, 423, 322])
+
+        by_type = metrics["by_customer_type"].set_index("Customer type")
+        self.assertEqual(by_type.loc["Member", "revenue"], 157.5)
+        self.assertEqual(by_type.loc["Member", "avg_ticket"], 52.5)
+        self.assertEqual(by_type.loc["Regular", "revenue_per_customer"], 73.5)
+        self.assertEqual(by_type["repeat_rate"].tolist(), [0.5, 0.5])
+
+        plain = compute_customer_metrics(load_sales_data(self.data_path, compact=False))
+        pd.testing.assert_frame_equal(plain["rfm"], rfm)
+        self.assertTrue(compute_customer_metrics(self.df.iloc[:0])["cohorts"].empty)
+        with self.assertRaises(ValueError):
+            compute_customer_metrics(self.df, outputs=["lifetime_value"])
+        with self.assertRaises(ValueError):
+            compute_customer_metrics(self.df, rfm_bins=1)
+
+    def test_cohorts_match_a_groupby_over_generated_sales(self) -> None:
+        rng = np.random.default_rng(7)
+        size = 5_000
+        df = pd.DataFrame(
+            {
+                "Invoice ID": [f"INV-{i}" for i in range(size)],
+                "Customer Name": [f"C{i}" for i in rng.integers(0, 400, size)],
+                "Customer type": rng.choice(["Member", "Regular"], size),
+                "Date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365, size), unit="D"),
+                "Total": rng.uniform(5, 500, size).round(2),
+            }
+        )
+        metrics = compute_customer_metrics(df)
+
+        months = df["Date"].dt.to_period("M")
+        first = months.groupby(df["Customer Name"]).transform("min")
+        active = pd.DataFrame(
+            {"Cohort": first.astype(str), "months_since_first": (months - first).apply(lambda offset: offset.n)}
+        ).assign(customer=df["Customer Name"]).drop_duplicates()
+        expected = active.groupby(["Cohort", "months_since_first"]).size()
+        actual = metrics["cohorts"].set_index(["Cohort", "months_since_first"])["customers"]
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+
+        monetary = df.groupby("Customer Name")["Total"].sum()
+        rfm = metrics["rfm"].set_index("Customer Name")
+        np.testing.assert_allclose(rfm["monetary"], monetary[rfm.index])
+        self.assertEqual(metrics["repeat"]["customers"], df["Customer Name"].nunique())
+
+    def test_cache_memoizes_per_selection(self) -> None:
+        cache = SalesCache()
+        snapshot = cache.dataset(self.data_path)
+
+        first = cache.customer_metrics(snapshot)
+        self.assertIs(cache.customer_metrics(snapshot), first)
+        toronto = cache.customer_metrics(snapshot, cities=["Toronto"])
+        self.assertEqual(toronto["repeat"]["customers"], 2)
+        self.assertEqual(toronto["rfm"]["Customer Name"].tolist(), ["Olivia Smith", "Noah Wilson"])
+        self.assertGreaterEqual(cache.results.stats().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
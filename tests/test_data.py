@@ -1,23 +1,31 @@
 from pathlib import Path
+import tempfile
 import unittest
 
-from sales_automation.data import filter_sales_data, load_sales_data
+import pandas as pd
+
+from sales_automation.data import (
+    SNIFF_SAMPLE_BYTES,
+    CsvDialect,
+    filter_sales_data,
+    iter_sales_chunks,
+    load_sales_data,
+    sniff_csv_dialect,
+)
+from sales_automation.validation import CITIES, PRODUCT_LINES, allowed_values, validate
 
 
 DATA_PATH = Path("relatorio_vendas.csv")
-EXPECTED_CITIES = {"Toronto", "Chicago", "Vancouver"}
-EXPECTED_PRODUCT_LINES = {
-    "Health & Wellness",
-    "Electronics Accessories",
-    "Home & Lifestyle",
-    "Food & Beverages",
-    "Sports & Travel",
-}
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
 
 
 class TestData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.df = load_sales_data(DATA_PATH)
+
     def test_load_sales_data_has_expected_schema(self) -> None:
-        df = load_sales_data(DATA_PATH)
+        df = self.df
 
         self.assertFalse(df.empty)
         self.assertIn("Month", df.columns)
@@ -26,7 +34,7 @@ class TestData(unittest.TestCase):
         self.assertTrue(df["Date"].is_monotonic_increasing)
 
     def test_filter_sales_data_by_month_city(self) -> None:
-        df = load_sales_data(DATA_PATH)
+        df = self.df
 
         sample_month = df["Month"].iloc[0]
         sample_city = df["City"].iloc[0]
@@ -38,12 +46,58 @@ class TestData(unittest.TestCase):
         self.assertEqual(set(filtered["City"].unique()), {sample_city})
 
     def test_dataset_uses_north_america_business_labels(self) -> None:
-        df = load_sales_data(DATA_PATH)
+        report = validate(self.df, rules=[allowed_values("City", CITIES), allowed_values("Product line", PRODUCT_LINES)])
+
+        self.assertTrue(report.passed, [result.as_dict() for result in report.failed])
+        self.assertIn("Customer Name", self.df.columns)
+        self.assertGreater(self.df["Customer Name"].str.contains(" ").mean(), 0.95)
+
+    def test_sniff_csv_dialect_detects_modern_export(self) -> None:
+        self.assertEqual(sniff_csv_dialect(DATA_PATH), CsvDialect())
+
+    def test_legacy_export_is_parsed_in_a_single_pass(self) -> None:
+        source = FIXTURE_PATH.read_text(encoding="utf-8").splitlines()
+        legacy_lines = [source[0].replace(",", ";")]
+        for line in source[1:]:
+            values = [value.replace(".", ",") for value in line.split(",")]
+            legacy_lines.append(";".join(values))
+        legacy_lines[1] = legacy_lines[1].replace("Olivia Smith", "Olívia Smith")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            legacy_path = Path(tmp_dir) / "legacy.csv"
+            legacy_path.write_bytes(("\n".join(legacy_lines) + "\n").encode("latin1"))
+
+            self.assertEqual(
+                sniff_csv_dialect(legacy_path),
+                CsvDialect(delimiter=";", decimal=",", encoding="latin1"),
+            )
+            legacy_df = load_sales_data(legacy_path)
+
+        modern_df = load_sales_data(FIXTURE_PATH)
+        self.assertEqual(list(legacy_df.columns), list(modern_df.columns))
+        self.assertAlmostEqual(float(legacy_df["Total"].sum()), float(modern_df["Total"].sum()), places=4)
+        self.assertIn("Olívia Smith", legacy_df["Customer Name"].tolist())
+
+    def test_latin1_bytes_past_the_sniff_sample_are_decoded(self) -> None:
+        lines = DATA_PATH.read_text(encoding="utf-8").splitlines()
+        last = max(index for index, line in enumerate(lines) if not line.startswith(","))
+        name = lines[last].split(",")[4]
+        lines[last] = lines[last].replace(name, "Zoë Müller")
+        payload = ("\n".join(lines) + "\n").encode("latin1")
+        self.assertGreater(payload.index("ë".encode("latin1")), SNIFF_SAMPLE_BYTES)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_path = Path(tmp_dir) / "export.csv"
+            export_path.write_bytes(payload)
+            self.assertEqual(sniff_csv_dialect(export_path).encoding, "utf-8")
+            loaded = load_sales_data(export_path)
+            chunks = pd.concat(iter_sales_chunks(export_path, chunksize=100), ignore_index=True)
 
-        self.assertTrue(set(df["City"].unique()).issubset(EXPECTED_CITIES))
-        self.assertTrue(set(df["Product line"].unique()).issubset(EXPECTED_PRODUCT_LINES))
-        self.assertIn("Customer Name", df.columns)
-        self.assertGreater(df["Customer Name"].str.contains(" ").mean(), 0.95)
+        expected = load_sales_data(DATA_PATH)
+        for frame in (loaded, chunks):
+            self.assertEqual(len(frame), len(expected))
+            self.assertTrue(frame["Customer Name"].map(type).eq(str).all())
+            self.assertIn("Zoë Müller", frame["Customer Name"].tolist())
 
 
 if __name__ == "__main__":
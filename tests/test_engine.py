@@ -0,0 +1,64 @@
+from pathlib import Path
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.data import iter_sales_chunks, load_sales_data
+from sales_automation.engine import BREAKDOWN_DIMENSIONS, METRIC_OUTPUTS, compute_metrics
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+# bincount adds in a different order than groupby, so sums may differ in the last bits.
+RTOL = 1e-12
+
+
+class TestMetricsEngine(unittest.TestCase):
+    def test_single_pass_matches_groupby_results(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        results = compute_metrics(df)
+
+        self.assertEqual(set(results), set(METRIC_OUTPUTS))
+        self.assertEqual(results["kpis"]["orders"], float(df["Invoice ID"].nunique()))
+        self.assertAlmostEqual(results["kpis"]["revenue"], float(df["Total"].sum()), places=6)
+        self.assertAlmostEqual(results["kpis"]["avg_rating"], float(df["Rating"].mean()), places=6)
+
+        expected_city = (
+            df.groupby("City", as_index=False)["Total"].sum().sort_values("Total", ascending=False)
+        )
+        pd.testing.assert_frame_equal(results["by_city"], expected_city, check_exact=False)
+        expected_month = df.groupby("Month", as_index=False)["Total"].sum().sort_values("Month")
+        pd.testing.assert_frame_equal(results["by_month"], expected_month, check_exact=False)
+
+    def test_full_dataset_matches_groupby_within_rtol(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        results = compute_metrics(df)
+
+        for column, kpi in (("Total", "revenue"), ("Gross income", "gross_income")):
+            np.testing.assert_allclose(results["kpis"][kpi], df[column].sum(), rtol=RTOL, atol=0)
+        for output, dimension in BREAKDOWN_DIMENSIONS.items():
+            expected = df.groupby(dimension)["Total"].sum()
+            actual = results[output].set_index(dimension)["Total"]
+            self.assertEqual(set(actual.index), set(expected.index))
+            np.testing.assert_allclose(actual[expected.index], expected, rtol=RTOL, atol=0, err_msg=output)
+
+    def test_chunk_stream_matches_full_frame(self) -> None:
+        full = compute_metrics(load_sales_data(DATA_PATH))
+        streamed = compute_metrics(iter_sales_chunks(DATA_PATH, chunksize=64))
+
+        for key, value in full["kpis"].items():
+            self.assertAlmostEqual(streamed["kpis"][key], value, places=6)
+        for output in ("by_day", "by_month", "by_city", "by_payment", "by_product_line"):
+            pd.testing.assert_frame_equal(
+                streamed[output].reset_index(drop=True),
+                full[output].reset_index(drop=True),
+                check_exact=False,
+            )
+
+    def test_unknown_output_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            compute_metrics(load_sales_data(DATA_PATH), ["kpis", "by_weather"])
+
+
+if __name__ == "__main__":
+    unittest.main()
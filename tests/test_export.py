@@ -0,0 +1,90 @@
+from pathlib import Path
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from sales_automation.cache import SalesCache
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.export import iter_csv_chunks, prune_exports, write_export
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+DATA_PATH = Path("relatorio_vendas.csv")
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp_dir.name)
+        self.df = load_sales_data(DATA_PATH)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def test_chunked_csv_matches_single_serialization(self) -> None:
+        expected = self.df.to_csv(index=False).encode("utf-8")
+        chunks = list(iter_csv_chunks(self.df, chunk_rows=128))
+
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(b"".join(chunks), expected)
+        self.assertEqual(write_export(self.df, self.tmp / "sales.csv", chunk_rows=300).read_bytes(), expected)
+        self.assertEqual(b"".join(iter_csv_chunks(self.df.iloc[:0])), self.df.iloc[:0].to_csv(index=False).encode())
+
+    def test_compressed_formats_round_trip_smaller(self) -> None:
+        plain = write_export(self.df, self.tmp / "sales.csv")
+        gzipped = write_export(self.df, self.tmp / "sales.csv.gz", fmt="csv.gz", chunk_rows=300)
+        parquet = write_export(self.df, self.tmp / "sales.parquet", fmt="parquet", chunk_rows=300)
+
+        self.assertEqual(gzip.decompress(gzipped.read_bytes()), plain.read_bytes())
+        self.assertLess(gzipped.stat().st_size, plain.stat().st_size / 2)
+        self.assertLess(parquet.stat().st_size, plain.stat().st_size / 2)
+        pd.testing.assert_frame_equal(pd.read_parquet(parquet), self.df.reset_index(drop=True))
+        self.assertEqual(sorted(path.name for path in self.tmp.iterdir()), ["sales.csv", "sales.csv.gz", "sales.parquet"])
+        with self.assertRaises(ValueError):
+            write_export(self.df, self.tmp / "sales.xlsx", fmt="xlsx")
+
+    def test_cache_builds_each_selection_once(self) -> None:
+        data_path = self.tmp / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, data_path)
+        cache = SalesCache(export_dir=self.tmp / "exports")
+        snapshot = cache.dataset(data_path)
+
+        first = cache.export(snapshot, "csv", cities=["Toronto"])
+        inode = first.stat().st_ino
+        again = cache.export(snapshot, "csv", cities=["Toronto"])
+        self.assertEqual((again, again.stat().st_ino), (first, inode))
+        self.assertNotEqual(cache.export(snapshot, "parquet", cities=["Toronto"]), first)
+        self.assertNotEqual(cache.export(snapshot, "csv"), first)
+
+        expected = filter_sales_data(snapshot.frame, cities=["Toronto"]).to_csv(index=False)
+        self.assertEqual(first.read_text(encoding="utf-8"), expected)
+
+        self.assertEqual(prune_exports(cache.export_dir, keep=1), 2)
+        self.assertEqual(len(list(cache.export_dir.iterdir())), 1)
+
+    def test_hits_keep_exports_and_pruned_files_are_rebuilt(self) -> None:
+        data_path = self.tmp / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, data_path)
+        cache = SalesCache(export_dir=self.tmp / "exports")
+        snapshot = cache.dataset(data_path)
+
+        oldest = cache.export(snapshot, "csv", cities=["Toronto"])
+        newer = cache.export(snapshot, "csv")
+        os.utime(oldest, ns=(1, 1))
+        os.utime(newer, ns=(2, 2))
+        self.assertEqual(cache.export(snapshot, "csv", cities=["Toronto"]), oldest)
+        prune_exports(cache.export_dir, keep=1)
+        self.assertEqual(list(cache.export_dir.iterdir()), [oldest])
+
+        expected = oldest.read_bytes()
+        oldest.unlink()
+        with cache.open_export(snapshot, "csv", cities=["Toronto"]) as handle:
+            self.assertEqual(handle.read(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
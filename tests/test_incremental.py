@@ -0,0 +1,125 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from sales_automation.aggregates import SalesAccumulator
+from sales_automation.data import load_sales_data, merge_sorted_rows
+from sales_automation.incremental import IncrementalSalesData
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+NEW_ROWS = (
+    "INV-1005,Uptown,Chicago,Member,Ava Martin,Female,Electronics Accessories,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+    "INV-1006,Downtown,Toronto,Regular,Lucas Lee,Male,Food & Beverages,10,3,1.5,31.5,2023-01-20,16:45,Credit Card,30,0,30,9.0\n"
+)
+
+
+class TestIncrementalSalesData(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self._tmp_dir.cleanup()
+
+    def _append(self, text: str) -> None:
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(text)
+
+    def assert_matches_full_load(self, data: IncrementalSalesData) -> None:
+        expected = load_sales_data(self.data_path)
+        self.assertTrue(data.frame["Date"].is_monotonic_increasing)
+        pd.testing.assert_frame_equal(
+            data.frame.sort_values(["Date", "Invoice ID"]).reset_index(drop=True),
+            expected.sort_values(["Date", "Invoice ID"]).reset_index(drop=True),
+        )
+        pd.testing.assert_frame_equal(
+            data.summary(),
+            SalesAccumulator(["Month"]).update(expected).result(),
+            check_dtype=False,
+        )
+
+    def test_refresh_ingests_only_appended_rows(self) -> None:
+        data = IncrementalSalesData(self.data_path)
+        self.assertTrue(data.refresh().reloaded)
+        self._append(NEW_ROWS)
+
+        result = data.refresh()
+        self.assertEqual((result.appended_rows, result.duplicate_rows, result.reloaded), (2, 0, False))
+        self.assertEqual(data.watermark.byte_offset, self.data_path.stat().st_size)
+        self.assert_matches_full_load(data)
+
+    def test_partial_line_waits_for_next_refresh(self) -> None:
+        data = IncrementalSalesData(self.data_path)
+        data.refresh()
+        first, second = NEW_ROWS.splitlines(keepends=True)
+        self._append(first + second[:20])
+
+        self.assertEqual(data.refresh().appended_rows, 1)
+        self._append(second[20:])
+        self.assertEqual(data.refresh().appended_rows, 1)
+        self.assert_matches_full_load(data)
+
+    def test_resent_invoices_are_detected_and_dropped(self) -> None:
+        data = IncrementalSalesData(self.data_path, on_duplicate="drop")
+        data.refresh()
+        resent = FIXTURE_PATH.read_text(encoding="utf-8").splitlines(keepends=True)[1]
+        self._append(resent + NEW_ROWS)
+
+        result = data.refresh()
+        self.assertEqual((result.appended_rows, result.duplicate_rows), (2, 1))
+        self.assertEqual(data.frame["Invoice ID"].nunique(), len(data.frame))
+        self.assertEqual(data.summary(by=())["rows"].iloc[0], 6)
+
+    def test_multi_line_invoices_are_not_resends(self) -> None:
+        # A second line of INV-1001 in the initial load, and a two-line invoice in one appended batch.
+        second_line = NEW_ROWS.splitlines(keepends=True)[1].replace("INV-1006", "INV-1001")
+        self._append(second_line)
+        data = IncrementalSalesData(self.data_path, on_duplicate="drop")
+        self.assertEqual(data.refresh().duplicate_rows, 0)
+        self._append(NEW_ROWS + NEW_ROWS.splitlines(keepends=True)[0].replace("Electronics Accessories", "Sports & Travel"))
+
+        result = data.refresh()
+        self.assertEqual((result.appended_rows, result.duplicate_rows), (3, 0))
+        self.assert_matches_full_load(data)
+
+        kept = IncrementalSalesData(self.data_path)
+        kept.refresh()
+        self.assertEqual(kept.on_duplicate, "keep")
+        self._append(second_line)
+        self.assertEqual(kept.refresh().duplicate_rows, 1)
+        self.assert_matches_full_load(kept)
+
+    def test_rewritten_source_is_reloaded(self) -> None:
+        data = IncrementalSalesData(self.data_path)
+        data.refresh()
+        lines = self.data_path.read_text(encoding="utf-8").splitlines(keepends=True)
+        self.data_path.write_text("".join(lines[:2]) + NEW_ROWS, encoding="utf-8")
+
+        self.assertTrue(data.refresh().reloaded)
+        self.assert_matches_full_load(data)
+
+    def test_cached_load_parses_only_the_appended_tail(self) -> None:
+        load_sales_data(self.data_path, use_cache=True)
+        self._append(NEW_ROWS)
+
+        with self.assertLogs("sales_automation.data", level="INFO") as logs:
+            cached = load_sales_data(self.data_path, use_cache=True)
+        self.assertTrue(any("Appended 2 new rows" in line for line in logs.output))
+        pd.testing.assert_frame_equal(cached, load_sales_data(self.data_path))
+        pd.testing.assert_frame_equal(load_sales_data(self.data_path, use_cache=True), cached)
+
+    def test_merge_sorted_rows_places_late_rows_by_date(self) -> None:
+        frame = pd.DataFrame({"Date": pd.to_datetime(["2023-01-01", "2023-01-03", "2023-01-05"]), "id": [1, 2, 3]})
+        rows = pd.DataFrame({"Date": pd.to_datetime(["2023-01-04", "2023-01-01"]), "id": [4, 5]})
+
+        merged = merge_sorted_rows(frame, rows)
+        self.assertEqual(merged["id"].tolist(), [1, 5, 2, 4, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.index import SalesIndex
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+
+
+class TestSalesIndex(unittest.TestCase):
+    def test_indexed_filter_matches_mask_filter(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        index = SalesIndex.build(df)
+        months = sorted(df["Month"].unique())
+
+        for filters in (
+            {"months": [months[0]], "cities": ["Toronto"]},
+            {"months": months[2:5], "product_lines": ["Food & Beverages", "Sports & Travel"]},
+            {"cities": ["Chicago", "Nowhere"]},
+            {"months": ["1999-01"]},
+        ):
+            pd.testing.assert_frame_equal(
+                filter_sales_data(df, index=index, **filters),
+                filter_sales_data(df, **filters),
+            )
+
+    def test_full_selection_skips_filtering(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        index = SalesIndex.build(df)
+
+        selected = filter_sales_data(
+            df,
+            months=sorted(df["Month"].unique()),
+            cities=sorted(df["City"].unique()),
+            index=index,
+        )
+        self.assertIs(selected, df)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from sales_automation.cache import source_version
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.partitions import discover_partitions, is_partitioned_source, prune_partitions
+from sales_automation.summary import summary_path
+
+
+SOURCE_PATH = Path("relatorio_vendas.csv")
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["Date", "Invoice ID"]).reset_index(drop=True)
+
+
+class TestPartitionedLoading(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._tmp_dir = tempfile.TemporaryDirectory()
+        cls.root = Path(cls._tmp_dir.name) / "exports"
+        raw = pd.read_csv(SOURCE_PATH)
+        cls.full = load_sales_data(SOURCE_PATH)
+
+        dates = pd.to_datetime(raw["Date"], errors="coerce")
+        raw = raw[dates.notna()]
+        dates = dates[dates.notna()]
+        for (year, month, branch), rows in raw.groupby([dates.dt.year, dates.dt.month, raw["Branch"]]):
+            folder = cls.root / f"year={year}" / f"month={month:02d}" / f"branch={branch}"
+            folder.mkdir(parents=True)
+            rows.to_csv(folder / "sales.csv", index=False)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._tmp_dir.cleanup()
+
+    def test_directory_load_matches_single_file(self) -> None:
+        loaded = load_sales_data(self.root, workers=1)
+
+        self.assertEqual(len(discover_partitions(self.root)), 36)
+        self.assertTrue(loaded["Date"].is_monotonic_increasing)
+        pd.testing.assert_frame_equal(_sorted(loaded), _sorted(self.full))
+
+    def test_process_pool_matches_serial_load(self) -> None:
+        serial = load_sales_data(self.root, workers=1, use_cache=True)
+        parallel = load_sales_data(self.root, workers=2, use_cache=True)
+        pd.testing.assert_frame_equal(parallel, serial)
+
+    def test_filters_prune_partitions_before_reading(self) -> None:
+        partitions = discover_partitions(self.root)
+        self.assertEqual(len(prune_partitions(partitions, months=["2023-03", "2023-04"])), 6)
+        self.assertEqual(len(prune_partitions(partitions, months=["2024-01"])), 0)
+
+        with mock.patch("sales_automation.data._read_csv_flexible") as read_csv:
+            empty = load_sales_data(self.root, months=["2024-01"], workers=1)
+        read_csv.assert_not_called()
+        self.assertTrue(empty.empty)
+        self.assertEqual(list(empty.columns), list(self.full.columns))
+        self.assertEqual(empty["Date"].dtype, self.full["Date"].dtype)
+
+        with self.assertLogs("sales_automation.data", level="INFO") as logs:
+            loaded = load_sales_data(self.root, months=["2023-03"], cities=["Toronto"], workers=1)
+        self.assertIn("Reading 3 of 36 partitions", "\n".join(logs.output))
+        expected = filter_sales_data(self.full, months=["2023-03"], cities=["Toronto"])
+        pd.testing.assert_frame_equal(_sorted(loaded), _sorted(expected))
+
+    def test_glob_source_and_version(self) -> None:
+        pattern = str(self.root / "year=2023" / "month=0[1-3]" / "**" / "*.csv")
+        loaded = load_sales_data(pattern, workers=1)
+
+        self.assertEqual(sorted(loaded["Month"].unique()), ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(len(loaded), self.full["Month"].isin(["2023-01", "2023-02", "2023-03"]).sum())
+        self.assertEqual(source_version(pattern), source_version(pattern))
+        self.assertNotEqual(source_version(pattern), source_version(self.root))
+
+    def test_file_named_like_a_glob_is_a_single_source(self) -> None:
+        path = Path(self._tmp_dir.name) / "sales[2024].csv"
+        path.write_bytes(SOURCE_PATH.read_bytes())
+
+        self.assertFalse(is_partitioned_source(path))
+        self.assertTrue(is_partitioned_source(Path(self._tmp_dir.name) / "sales[0-9].csv"))
+        pd.testing.assert_frame_equal(load_sales_data(path, workers=1), self.full)
+        self.assertEqual(summary_path(path), path.parent / ".sales_cache" / "sales[2024].csv.summary.arrow")
+        stat = path.stat()
+        self.assertEqual(source_version(path), f"{stat.st_size}-{stat.st_mtime_ns}")
+
+
+if __name__ == "__main__":
+    unittest.main()
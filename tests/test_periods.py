@@ -0,0 +1,125 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.data import load_sales_data
+from sales_automation.incremental import IncrementalSalesData
+from sales_automation.periods import PeriodMetrics
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+NEW_ROWS = (
+    "INV-1005,Uptown,Chicago,Member,Ava Martin,Female,Electronics Accessories,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+)
+
+
+def _synthetic_sales(rows: int = 3_000, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Sparse dates over two years leave empty days, months and cities to exercise the zero handling.
+    days = pd.Timestamp("2022-02-10") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+    return pd.DataFrame(
+        {
+            "Date": days,
+            "City": rng.choice(["Toronto", "Chicago", "Vancouver"], rows, p=[0.5, 0.45, 0.05]),
+            "Product line": rng.choice(["Sports & Travel", "Home & Lifestyle"], rows),
+            "Total": rng.gamma(2.0, 150.0, rows).round(2),
+        }
+    )
+
+
+def _reference_growth(df: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    months = pd.period_range(df["Date"].min(), df["Date"].max(), freq="M")
+    revenue = (
+        df.assign(Month=df["Date"].dt.to_period("M"))
+        .pivot_table(index="Month", columns=dimension, values="Total", aggfunc="sum", fill_value=0.0)
+        .reindex(months, fill_value=0.0)
+    )
+    mom = (revenue / revenue.shift(1).where(revenue.shift(1) > 0) - 1) * 100
+    yoy = (revenue / revenue.shift(12).where(revenue.shift(12) > 0) - 1) * 100
+    frame = pd.concat({"revenue": revenue.stack(), "mom_pct": mom.stack(), "yoy_pct": yoy.stack()}, axis=1)
+    frame.index.names = ["Month", dimension]
+    frame = frame.reset_index()
+    frame["Month"] = frame["Month"].dt.strftime("%Y-%m")
+    return frame.sort_values(["Month", dimension]).reset_index(drop=True)
+
+
+class TestPeriodMetrics(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.df = _synthetic_sales()
+        cls.metrics = PeriodMetrics.from_frame(cls.df)
+
+    def test_rolling_windows_and_ytd_match_pandas(self) -> None:
+        series = self.df.groupby("Date")["Total"].sum().asfreq("D", fill_value=0.0)
+        daily = self.metrics.daily().set_index("Date")
+
+        np.testing.assert_allclose(daily["Total"], series, rtol=1e-12)
+        for window in (7, 28, 90):
+            expected = series.rolling(window, min_periods=1).sum()
+            np.testing.assert_allclose(daily[f"rolling_{window}d"], expected, rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(daily["ytd"], series.groupby(series.index.year).cumsum(), rtol=1e-9, atol=1e-6)
+
+        self.assertAlmostEqual(daily.loc["2023-01-01", "ytd"], daily.loc["2023-01-01", "Total"], places=6)
+        self.assertAlmostEqual(self.metrics.window_revenue(28, "2023-05-31"), series["2023-05-04":"2023-05-31"].sum())
+        self.assertAlmostEqual(self.metrics.ytd_revenue("2023-05-31"), series["2023-01-01":"2023-05-31"].sum())
+        self.assertAlmostEqual(self.metrics.ytd_revenue(), series[str(series.index[-1].year)].sum())
+
+    def test_growth_matches_groupby_reference(self) -> None:
+        for dimension in ("City", "Product line"):
+            with self.subTest(dimension=dimension):
+                result = self.metrics.growth(dimension)
+                pd.testing.assert_frame_equal(result, _reference_growth(self.df, dimension), check_dtype=False)
+
+        totals = self.metrics.growth()
+        self.assertEqual(list(totals.columns), ["Month", "revenue", "mom_pct", "yoy_pct"])
+        self.assertAlmostEqual(totals["revenue"].sum(), self.df["Total"].sum(), places=4)
+        self.assertTrue(totals["yoy_pct"].iloc[:12].isna().all())
+
+    def test_incremental_updates_in_any_order_match_a_full_build(self) -> None:
+        shuffled = self.df.sample(frac=1.0, random_state=3)
+        # Later chunks reach both before and after the span seen so far.
+        chunks = [shuffled[shuffled["Date"].between("2022-09-01", "2023-03-31")], shuffled[shuffled["Date"] > "2023-03-31"]]
+        chunks.append(shuffled[shuffled["Date"] < "2022-09-01"])
+        incremental = PeriodMetrics()
+        for chunk in chunks:
+            incremental.update(chunk)
+
+        pd.testing.assert_frame_equal(
+            incremental.daily(),
+            PeriodMetrics.from_frame(shuffled.sort_values("Date", kind="stable")).daily(),
+            rtol=1e-12,
+        )
+        pd.testing.assert_frame_equal(incremental.growth("City"), self.metrics.growth("City"), rtol=1e-12)
+        self.assertEqual(PeriodMetrics().window_revenue(7), 0.0)
+        self.assertTrue(PeriodMetrics().daily().empty)
+
+
+class TestIncrementalPeriods(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.tmp.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_refresh_extends_period_metrics(self) -> None:
+        data = IncrementalSalesData(self.data_path)
+        data.refresh()
+        self.assertEqual(data.periods.ytd_revenue(), 189.0)
+
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(NEW_ROWS)
+        data.refresh()
+
+        expected = PeriodMetrics.from_frame(load_sales_data(self.data_path)).daily()
+        pd.testing.assert_frame_equal(data.periods.daily(), expected)
+        self.assertEqual(data.periods.window_revenue(28), 31.5 + 52.5 + 84.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+from pathlib import Path
+import json
+import shutil
+import tempfile
+import unittest
+
+from sales_automation.cache import SalesCache
+from sales_automation.registry import DatasetRegistry
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestDatasetRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for region in ("north", "south", "west"):
+            (self.root / region).mkdir()
+            shutil.copyfile(FIXTURE_PATH, self.root / region / "sales.csv")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _registry(self, max_bytes: int | None) -> DatasetRegistry:
+        registry = DatasetRegistry(SalesCache(), max_bytes=max_bytes)
+        for region in ("north", "south", "west"):
+            registry.register(region, self.root / region / "sales.csv")
+        return registry
+
+    def test_least_recently_used_datasets_are_unloaded_over_budget(self) -> None:
+        snapshot_bytes = self._registry(None).dataset("north").nbytes
+        registry = self._registry(int(snapshot_bytes * 2.5))
+        cache = registry.cache
+
+        north = registry.dataset("north")
+        registry.dataset("south")
+        registry.dataset("north")
+        registry.dataset("west")
+
+        self.assertIsNone(cache.current(self.root / "south" / "sales.csv"))
+        self.assertIs(cache.current(self.root / "north" / "sales.csv"), north)
+        self.assertEqual(registry.unloads, 1)
+        self.assertFalse(registry.stats()["datasets"]["south"]["loaded"])
+        self.assertEqual(registry.stats()["datasets"]["south"]["resident_bytes"], 0)
+
+        reloaded = registry.dataset("south")
+        self.assertEqual(reloaded.catalog.rows, north.catalog.rows)
+        self.assertEqual(cache.metrics(reloaded, outputs=["kpis"])["kpis"]["revenue"], 189.0)
+        self.assertEqual(registry.unloads, 2)
+
+    def test_dataset_budget_trims_its_own_results(self) -> None:
+        registry = DatasetRegistry(SalesCache(), max_bytes=None)
+        registry.register("north", self.root / "north" / "sales.csv")
+        snapshot = registry.dataset("north")
+        for city in ("Toronto", "Chicago", "Vancouver"):
+            registry.cache.filtered_frame(snapshot, cities=[city])
+        result_bytes = registry.resident_bytes("north") - snapshot.nbytes
+        self.assertGreater(result_bytes, 0)
+
+        budgeted = DatasetRegistry(registry.cache, max_bytes=None)
+        budgeted.register("north", self.root / "north" / "sales.csv", max_bytes=snapshot.nbytes + result_bytes // 2)
+        budgeted.dataset("north")
+
+        self.assertLessEqual(budgeted.resident_bytes("north"), snapshot.nbytes + result_bytes // 2)
+        self.assertGreater(registry.cache.results.stats().evictions, 0)
+
+    def test_config_file_and_unknown_names(self) -> None:
+        config = self.root / "datasets.json"
+        config.write_text(
+            json.dumps({"max_mb": 64, "datasets": [{"name": "north", "path": "north/sales.csv", "max_mb": 0.5}]}),
+            encoding="utf-8",
+        )
+        registry = DatasetRegistry.from_file(config, SalesCache())
+
+        self.assertEqual(registry.names, ["north"])
+        self.assertEqual(registry.max_bytes, 64 * 1024**2)
+        self.assertEqual(registry.spec("north").max_bytes, 512 * 1024)
+        self.assertEqual(registry.dataset("north").path, (self.root / "north" / "sales.csv").resolve())
+        with self.assertRaises(KeyError):
+            registry.spec("east")
+        with self.assertRaises(ValueError):
+            registry.register("north", self.root / "south" / "sales.csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
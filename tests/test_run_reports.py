@@ -0,0 +1,84 @@
+from pathlib import Path
+import json
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+from sales_automation import telemetry
+from scripts.generate_monthly_report import generate_monthly_summary
+from scripts.run_reports import ReportJob, run_jobs, run_reports
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestReportRunner(unittest.TestCase):
+    def test_independent_jobs_overlap_and_receive_dependencies(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+        jobs = [
+            ReportJob("base", lambda _: 2),
+            ReportJob("left", lambda inputs: (barrier.wait(), inputs["base"] * 10)[1], depends_on=("base",)),
+            ReportJob("right", lambda inputs: (barrier.wait(), inputs["base"] + 1)[1], depends_on=("base",)),
+            ReportJob("total", lambda inputs: inputs["left"] + inputs["right"], depends_on=("left", "right")),
+        ]
+
+        outcomes = run_jobs(jobs, max_workers=2)
+        self.assertEqual({name: outcome.status for name, outcome in outcomes.items()}, dict.fromkeys(outcomes, "ok"))
+        self.assertEqual(outcomes["total"].result, 23)
+        self.assertEqual(list(outcomes)[0], "base")
+        self.assertEqual(list(outcomes)[-1], "total")
+        self.assertGreaterEqual(outcomes["total"].started_seconds, outcomes["left"].started_seconds)
+
+    def test_failures_skip_dependents_and_bad_graphs_are_rejected(self) -> None:
+        def broken(_: dict) -> None:
+            raise RuntimeError("boom")
+
+        outcomes = run_jobs(
+            [
+                ReportJob("broken", broken),
+                ReportJob("after", lambda _: 1, depends_on=("broken",)),
+                ReportJob("later", lambda _: 1, depends_on=("after",)),
+                ReportJob("other", lambda _: 1),
+            ]
+        )
+        self.assertEqual(
+            {name: outcome.status for name, outcome in outcomes.items()},
+            {"broken": "failed", "after": "skipped", "later": "skipped", "other": "ok"},
+        )
+        self.assertIn("RuntimeError: boom", outcomes["broken"].error)
+
+        with self.assertRaises(ValueError):
+            run_jobs([ReportJob("a", lambda _: 1, depends_on=("missing",))])
+        with self.assertRaises(ValueError):
+            run_jobs([ReportJob("a", lambda _: 1, depends_on=("b",)), ReportJob("b", lambda _: 1, depends_on=("a",))])
+
+    def test_reports_share_one_dataset_load(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            telemetry.clear()
+            telemetry.enable()
+            try:
+                outcomes, run_report = run_reports(FIXTURE_PATH, output_dir, include_tests=False)
+            finally:
+                telemetry.disable()
+            loads = [item for item in telemetry.recorded_spans() if item.name == "load_sales_data"]
+            telemetry.clear()
+
+            self.assertEqual(len(loads), 1)
+            self.assertTrue(all(outcome.status == "ok" for outcome in outcomes.values()))
+            self.assertTrue((output_dir / "business_snapshot.json").exists())
+            standalone = generate_monthly_summary(data_path=FIXTURE_PATH, output_file=output_dir / "standalone.csv")
+            pd.testing.assert_frame_equal(pd.read_csv(output_dir / "monthly_summary.csv"), pd.read_csv(standalone))
+
+            timings = json.loads(run_report.read_text(encoding="utf-8"))
+            self.assertEqual(
+                {job["name"] for job in timings["jobs"]},
+                {"load_dataset", "sales_summary", "monthly_summary", "business_snapshot"},
+            )
+            self.assertTrue(all(job["duration_seconds"] >= 0 for job in timings["jobs"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+from pathlib import Path
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.metrics import compute_kpis, revenue_by_product_line
+from sales_automation.schema import compact_sales_frame
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestCompactSchema(unittest.TestCase):
+    def test_compact_frame_uses_smaller_dtypes(self) -> None:
+        df = load_sales_data(DATA_PATH)
+        compact_df, report = compact_sales_frame(df)
+
+        self.assertIsInstance(compact_df["City"].dtype, pd.CategoricalDtype)
+        self.assertTrue(compact_df["Month"].cat.ordered)
+        self.assertEqual(compact_df["Month"].cat.categories.tolist(), sorted(df["Month"].unique()))
+        self.assertEqual(compact_df["Total"].dtype, np.float64)
+        self.assertEqual(compact_df["Rating"].dtype, np.float64)
+        self.assertEqual(compact_df["Tax 5%"].dtype, np.float32)
+        self.assertTrue(pd.api.types.is_integer_dtype(compact_df["Quantity"]))
+        self.assertLess(report.bytes_after, report.bytes_before)
+        self.assertEqual(report.rows, len(df))
+
+    def test_compact_frame_keeps_kpis_and_filters(self) -> None:
+        df = load_sales_data(FIXTURE_PATH)
+        compact_df = load_sales_data(FIXTURE_PATH, compact=True)
+        self.assertEqual(compute_kpis(compact_df), compute_kpis(df))
+
+        # Sums and means over many ratings must match too, not only single values.
+        full = load_sales_data(DATA_PATH)
+        self.assertEqual(compute_kpis(compact_sales_frame(full)[0]), compute_kpis(full))
+
+        filtered = filter_sales_data(compact_df, product_lines=["Health & Wellness"])
+        self.assertEqual(revenue_by_product_line(filtered)["Product line"].tolist(), ["Health & Wellness"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from pathlib import Path
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.aggregates import SalesAccumulator
+from sales_automation.cube import SalesCube
+from sales_automation.data import filter_sales_data, iter_sales_chunks, load_sales_data
+from sales_automation.engine import compute_metrics
+from sales_automation.sketch import HyperLogLog, precision_for_error
+
+
+DATA_PATH = Path("relatorio_vendas.csv")
+
+
+def _invoices(count: int, prefix: str = "INV") -> pd.Series:
+    return pd.Series(np.char.add(f"{prefix}-", np.arange(count).astype(str)))
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_estimates_within_error_bound(self) -> None:
+        self.assertEqual(HyperLogLog().count(), 0.0)
+        self.assertEqual(precision_for_error(0.01), 14)
+        for count in (50, 5_000, 200_000):
+            ids = _invoices(count)
+            sketch = HyperLogLog(12).update(pd.concat([ids, ids.iloc[: count // 2], pd.Series([None])]))
+            self.assertLess(abs(sketch.count() / count - 1), 4 * sketch.relative_error, count)
+
+    def test_union_matches_single_sketch_and_round_trips(self) -> None:
+        ids = _invoices(20_000)
+        whole = HyperLogLog(10).update(ids)
+        left = HyperLogLog(10).update(ids.iloc[:12_000])
+        right = HyperLogLog(10).update(ids.iloc[8_000:].astype("category"))
+
+        merged = left.merge(right)
+        np.testing.assert_array_equal(merged.registers, whole.registers)
+        restored = HyperLogLog.from_bytes(merged.to_bytes())
+        self.assertEqual((restored.precision, restored.count()), (10, whole.count()))
+        with self.assertRaises(ValueError):
+            merged.merge(HyperLogLog(11))
+
+
+class TestSketchedOrderCounts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.df = load_sales_data(DATA_PATH)
+
+    def test_exact_mode_stays_default(self) -> None:
+        exact = compute_metrics(self.df, ["kpis"])["kpis"]
+        sketched = compute_metrics(iter_sales_chunks(DATA_PATH, chunksize=128), ["kpis"], order_error=0.01)["kpis"]
+
+        self.assertEqual(exact["orders"], float(self.df["Invoice ID"].nunique()))
+        self.assertLess(abs(sketched["orders"] / exact["orders"] - 1), 0.04)
+        self.assertAlmostEqual(sketched["revenue"], exact["revenue"], places=6)
+
+    def test_accumulators_merge_sketches_across_partitions(self) -> None:
+        exact = SalesAccumulator(by=["Month"]).update(self.df).result()
+        merged = SalesAccumulator(by=["Month"], order_error=0.01)
+        for _, partition in self.df.groupby("City"):
+            merged.merge(SalesAccumulator(by=["Month"], order_error=0.01).update(partition))
+        result = merged.result()
+
+        self.assertEqual(result["Month"].tolist(), exact["Month"].tolist())
+        np.testing.assert_allclose(result["orders"], exact["orders"], rtol=0.05)
+        np.testing.assert_allclose(result["avg_ticket"], exact["avg_ticket"], rtol=0.05)
+        with self.assertRaises(ValueError):
+            merged.merge(SalesAccumulator(by=["Month"]))
+
+    def test_cube_rolls_up_cell_sketches_for_any_selection(self) -> None:
+        cube = SalesCube.from_frame(self.df, order_error=0.01)
+        self.assertEqual(len(cube.cell_invoices), 0)
+
+        selections = [{}, {"cities": ["Toronto"]}, {"months": ["2023-03", "2023-04"], "product_lines": ["Home & Lifestyle"]}]
+        for selection in selections:
+            with self.subTest(selection=selection):
+                expected = filter_sales_data(self.df, **selection)["Invoice ID"].nunique()
+                kpis = cube.slice(**selection).compute_kpis()
+                self.assertLess(abs(kpis["orders"] / expected - 1), 0.04)
+        self.assertEqual(cube.slice(months=["2030-01"]).order_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
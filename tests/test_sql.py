@@ -0,0 +1,157 @@
+from pathlib import Path
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from sales_automation.aggregates import SalesAccumulator
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.engine import METRIC_OUTPUTS, compute_metrics
+from sales_automation.metrics import compute_kpis, revenue_by_city, revenue_by_product_line
+from sales_automation.sql import SqlBackend, SqliteBackend, open_backend
+from sales_automation.summary import SalesSummary
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+DATA_PATH = Path("relatorio_vendas.csv")
+
+
+def _sorted(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sort_values(["Date", "Invoice ID"]).reset_index(drop=True)
+
+
+class TestSqliteBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+        self.backend = SqliteBackend.from_source(self.data_path)
+        self.df = load_sales_data(self.data_path)
+
+    def tearDown(self) -> None:
+        self.backend.close()
+        self._tmp_dir.cleanup()
+
+    def test_metrics_match_pandas_exactly_on_golden_fixture(self) -> None:
+        selections = [{}, {"cities": ["Toronto"]}, {"months": ["2023-01"], "product_lines": ["Health & Wellness"]}]
+        for selection in selections:
+            with self.subTest(selection=selection):
+                expected = compute_metrics(filter_sales_data(self.df, **selection))
+                actual = compute_metrics(self.backend.select(**selection))
+
+                self.assertEqual(actual["kpis"], expected["kpis"])
+                for output in METRIC_OUTPUTS[1:]:
+                    pd.testing.assert_frame_equal(
+                        actual[output].reset_index(drop=True),
+                        expected[output].reset_index(drop=True),
+                    )
+
+        selection = self.backend.select(cities=["Toronto"])
+        toronto = filter_sales_data(self.df, cities=["Toronto"])
+        self.assertEqual(compute_kpis(selection), compute_kpis(toronto))
+        pd.testing.assert_frame_equal(revenue_by_city(selection), revenue_by_city(toronto))
+        pd.testing.assert_frame_equal(
+            revenue_by_product_line(selection).reset_index(drop=True),
+            revenue_by_product_line(toronto).reset_index(drop=True),
+        )
+
+    def test_filtered_rows_and_summary_match_pandas(self) -> None:
+        rows = self.backend.filter_sales_data(cities=["Toronto", "Chicago"])
+        expected = filter_sales_data(self.df, cities=["Toronto", "Chicago"])
+        pd.testing.assert_frame_equal(_sorted(rows), _sorted(expected), check_dtype=False)
+
+        accumulator = SalesAccumulator(by=["Month"])
+        accumulator.update(self.df)
+        pd.testing.assert_frame_equal(
+            self.backend.summary(by=["Month"]),
+            accumulator.result(),
+            check_dtype=False,
+        )
+
+    def test_database_is_rebuilt_when_source_changes(self) -> None:
+        database = self.data_path.parent / ".sales_cache" / "sales.csv.sqlite"
+        self.assertTrue(database.exists())
+
+        reopened = SqliteBackend.from_source(self.data_path)
+        self.assertEqual(compute_kpis(reopened.select())["orders"], 4.0)
+        reopened.close()
+
+        lines = self.data_path.read_text(encoding="utf-8").splitlines()
+        self.data_path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+        os.utime(self.data_path, ns=(1, 1))
+        rebuilt = SqliteBackend.from_source(self.data_path)
+        self.assertEqual(compute_kpis(rebuilt.select())["orders"], 3.0)
+        rebuilt.close()
+
+    def test_full_dataset_matches_within_float_tolerance(self) -> None:
+        backend = SqliteBackend.from_source(DATA_PATH, database_path=":memory:")
+        df = load_sales_data(DATA_PATH)
+        full = compute_metrics(df)
+        sql = compute_metrics(backend.select())
+        monthly = backend.summary(by=["Month"])
+        backend.close()
+
+        # The monthly report rounds money to the cent on every path.
+        columns = ["Month", "revenue", "orders", "avg_ticket", "gross_income"]
+        pd.testing.assert_frame_equal(
+            monthly[columns], SalesSummary.from_frame(df).monthly()[columns], check_dtype=False, check_exact=True
+        )
+
+        for key, value in full["kpis"].items():
+            self.assertAlmostEqual(sql["kpis"][key], value, places=6)
+        pd.testing.assert_frame_equal(sql["by_month"], full["by_month"], check_exact=False)
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            open_backend("postgres", self.data_path)
+
+        class IncompleteBackend(SqlBackend):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend(None)
+
+
+@unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb is not installed")
+class TestDuckDbBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        # A quote in the path must not break the generated view definition.
+        self.data_path = Path(self._tmp_dir.name) / "o'brien" / "sales.csv"
+        self.data_path.parent.mkdir()
+        lines = FIXTURE_PATH.read_text(encoding="utf-8").splitlines()
+        rows = [lines[0]]
+        for line in lines[1:]:
+            fields = line.split(",")
+            year, month, day = fields[11].split("-")
+            fields[11] = f"{int(month)}/{int(day)}/{year}"
+            rows.append(",".join(fields))
+        rows.append(lines[1].replace("INV-1001", "INV-1099").replace("2023-01-10", "2023-01-11"))
+        self.data_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+        self.backend = open_backend("duckdb", self.data_path)
+
+    def tearDown(self) -> None:
+        self.backend.close()
+        self._tmp_dir.cleanup()
+
+    def test_non_iso_dates_are_parsed_like_pandas(self) -> None:
+        df = load_sales_data(self.data_path)
+        self.assertEqual(len(df), 4)
+
+        rows = self.backend.filter_sales_data()
+        pd.testing.assert_frame_equal(
+            _sorted(rows)[["Invoice ID", "Date", "Month"]],
+            _sorted(df)[["Invoice ID", "Date", "Month"]],
+            check_dtype=False,
+        )
+        expected = compute_metrics(df)
+        actual = compute_metrics(self.backend.select(months=["2023-02"]))
+        self.assertEqual(actual["kpis"], compute_metrics(filter_sales_data(df, months=["2023-02"]))["kpis"])
+        self.assertEqual(compute_metrics(self.backend.select())["kpis"], expected["kpis"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from sales_automation import telemetry
+from sales_automation.cache import load_summary, source_version
+from sales_automation.data import load_sales_data
+from sales_automation.incremental import IncrementalSalesData
+from sales_automation.periods import PeriodMetrics
+from sales_automation.summary import SalesSummary, read_summary, summary_path, write_summary
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+NEW_ROW = "INV-1005,Uptown,Chicago,Member,Ava Martin,Female,Electronics Accessories,40,2,4,84,2023-03-02,11:00,Cash,80,0,80,6.5\n"
+
+
+class TestSalesSummary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_path = Path(self.tmp.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+        self.df = load_sales_data(FIXTURE_PATH)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_rollups_match_row_level_groupby(self) -> None:
+        summary = SalesSummary.from_frame(self.df.iloc[:2]).update(self.df.iloc[2:])
+        expected = self.df.groupby(["Month", "City"], as_index=False).agg(
+            revenue=("Total", "sum"),
+            orders=("Invoice ID", "nunique"),
+            avg_rating=("Rating", "mean"),
+            gross_income=("Gross income", "sum"),
+        )
+
+        monthly = summary.monthly(by=["City"])
+        pd.testing.assert_frame_equal(monthly[expected.columns], expected, check_dtype=False)
+        self.assertEqual(summary.monthly()["revenue"].tolist(), [105.0, 84.0])
+        self.assertEqual(summary.select(cities=["Toronto"]).daily()["revenue"].tolist(), [42.0, 52.5])
+        self.assertEqual(summary.rows, len(self.df))
+
+        # A second line of INV-1001 in another product line, sent in a later batch, is still one order.
+        second_line = self.df.iloc[[0]].assign(**{"Product line": "Sports & Travel", "Total": 10.0})
+        rows = pd.concat([self.df, second_line], ignore_index=True)
+        split = SalesSummary.from_frame(self.df).update(second_line)
+        expected_orders = rows.groupby("Month")["Invoice ID"].nunique().tolist()
+        self.assertEqual(split.monthly()["orders"].tolist(), expected_orders)
+        self.assertEqual(split.monthly()["revenue"].tolist(), [115.0, 84.0])
+        self.assertEqual(split.monthly(by=["Product line"])["orders"].sum(), 5)
+        self.assertEqual(split.select(cities=["Toronto"]).monthly()["orders"].tolist(), [1, 1])
+        stored = Path(self.tmp.name) / "split.csv"
+        stored.touch()
+        write_summary(stored, split)
+        pd.testing.assert_frame_equal(read_summary(stored).monthly(), split.monthly())
+
+        periods = summary.periods()
+        reference = PeriodMetrics.from_frame(self.df)
+        pd.testing.assert_frame_equal(periods.daily(), reference.daily())
+        pd.testing.assert_frame_equal(periods.growth("City"), reference.growth("City"))
+
+    def test_sidecar_is_versioned_and_skips_the_rows_when_fresh(self) -> None:
+        version = source_version(self.data_path)
+        self.assertIsNone(read_summary(self.data_path))
+
+        built = load_summary(self.data_path)
+        self.assertEqual(built.version, version)
+        self.assertTrue(summary_path(self.data_path).exists())
+
+        telemetry.clear()
+        telemetry.enable()
+        try:
+            stored = load_summary(self.data_path)
+        finally:
+            telemetry.disable()
+        spans = {item.name for item in telemetry.recorded_spans()}
+        telemetry.clear()
+
+        self.assertFalse(spans & {"build_summary", "load_sales_data"})
+        pd.testing.assert_frame_equal(stored.monthly(), built.monthly())
+        self.assertIsNone(read_summary(self.data_path, "0-0"))
+        self.assertIsNone(write_summary(Path(self.tmp.name) / "*.csv", built))
+
+    def test_ingestion_keeps_the_stored_summary_current(self) -> None:
+        data = IncrementalSalesData(self.data_path)
+        data.refresh()
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(NEW_ROW)
+        data.refresh()
+
+        stored = read_summary(self.data_path, source_version(self.data_path))
+        self.assertIsNotNone(stored)
+        self.assertEqual(stored.monthly()["Month"].tolist(), ["2023-01", "2023-02", "2023-03"])
+        self.assertEqual(stored.monthly()["revenue"].tolist(), [105.0, 84.0, 84.0])
+        pd.testing.assert_frame_equal(stored.cells, data.sales_summary.cells)
+
+    def test_only_summaries_keeping_every_row_are_stored(self) -> None:
+        resent = FIXTURE_PATH.read_text(encoding="utf-8").splitlines(keepends=True)[1]
+        dropping = IncrementalSalesData(self.data_path, on_duplicate="drop")
+        dropping.refresh()
+        with self.data_path.open("a", encoding="utf-8") as handle:
+            handle.write(resent)
+        dropping.refresh()
+        self.assertIsNone(read_summary(self.data_path, source_version(self.data_path)))
+
+        IncrementalSalesData(self.data_path).refresh()
+        stored = read_summary(self.data_path, source_version(self.data_path))
+        summary_path(self.data_path).unlink()
+        pd.testing.assert_frame_equal(stored.monthly(), load_summary(self.data_path).monthly())
+
+    def test_sidecar_grows_with_cells_not_rows(self) -> None:
+        def sidecar_bytes(copies: int) -> int:
+            rows = pd.concat([self.df] * copies, ignore_index=True)
+            rows["Invoice ID"] = [f"INV-{i}" for i in range(len(rows))]
+            summary = SalesSummary.from_frame(rows.iloc[: len(rows) // 2]).update(rows.iloc[len(rows) // 2 :])
+            self.assertEqual(summary.monthly()["orders"].sum(), len(rows))
+            path = Path(self.tmp.name) / f"sales-{copies}.csv"
+            path.touch()
+            return write_summary(path, summary).stat().st_size
+
+        self.assertEqual(sidecar_bytes(5_000), sidecar_bytes(10))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from pathlib import Path
+import json
+import shutil
+import tempfile
+import unittest
+
+from sales_automation import telemetry
+from sales_automation.data import filter_sales_data, load_sales_data
+from sales_automation.metrics import compute_kpis
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+        telemetry.disable()
+        telemetry.clear()
+
+    def tearDown(self) -> None:
+        telemetry.disable()
+        telemetry.clear()
+        self._tmp_dir.cleanup()
+
+    def test_disabled_telemetry_records_nothing(self) -> None:
+        self.assertFalse(telemetry.is_enabled())
+        with telemetry.span("idle", rows=1) as active:
+            active.set(cache="hit")
+        compute_kpis(load_sales_data(self.data_path))
+
+        self.assertIs(telemetry.span("idle"), telemetry.span("other"))
+        self.assertEqual(telemetry.recorded_spans(), [])
+
+    def test_collected_spans_carry_rows_and_cache_tags(self) -> None:
+        with telemetry.collect() as spans:
+            with telemetry.span("rerun"):
+                load_sales_data(self.data_path, use_cache=True)
+                df = load_sales_data(self.data_path, use_cache=True)
+                filter_sales_data(df, cities=["Toronto"])
+                compute_kpis(df)
+
+        by_name: dict[str, list[telemetry.Span]] = {}
+        for item in spans:
+            by_name.setdefault(item.name, []).append(item)
+
+        self.assertEqual([item.tags["cache"] for item in by_name["load_sales_data"]], ["miss", "hit"])
+        self.assertEqual(len(by_name["read_csv"]), 1)
+        self.assertEqual(by_name["filter_sales_data"][0].tags["rows"], 2)
+        self.assertEqual(by_name["compute_metrics"][0].tags["rows"], 4)
+        self.assertIn("compute_kpis", by_name)
+        self.assertEqual(by_name["rerun"][0].depth, 0)
+        self.assertEqual(by_name["read_csv"][0].depth, 2)
+        self.assertEqual(spans[-1].name, "rerun")
+        self.assertFalse(telemetry.is_enabled())
+        self.assertEqual(telemetry.recorded_spans(), [])
+
+    def test_chrome_trace_export(self) -> None:
+        telemetry.enable()
+        with telemetry.span("outer", rows=3):
+            with telemetry.span("inner"):
+                pass
+
+        output = telemetry.export_chrome_trace(Path(self._tmp_dir.name) / "trace.json")
+        events = json.loads(output.read_text(encoding="utf-8"))["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["inner", "outer"])
+        self.assertTrue(all(event["ph"] == "X" and event["dur"] >= 0 for event in events))
+        self.assertEqual(events[1]["args"], {"rows": 3})
+        self.assertEqual([row["span"] for row in telemetry.summarize(telemetry.recorded_spans())][0], "outer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sales_automation.trend import (
+    choose_resolution,
+    downsample_lttb,
+    lttb_indices,
+    resample_trend,
+    trend_series,
+)
+
+
+def _daily(days: int, start: str = "2021-01-01") -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(
+        {"Date": pd.date_range(start, periods=days, freq="D"), "Total": rng.uniform(100, 200, days)}
+    )
+
+
+class TestTrendSeries(unittest.TestCase):
+    def test_resolution_follows_selected_span(self) -> None:
+        self.assertEqual(choose_resolution(_daily(31)["Date"]), "day")
+        self.assertEqual(choose_resolution(_daily(365)["Date"]), "week")
+        self.assertEqual(choose_resolution(_daily(3 * 365)["Date"]), "month")
+        self.assertEqual(choose_resolution(pd.Series([], dtype="datetime64[ns]")), "day")
+
+    def test_resampling_preserves_revenue(self) -> None:
+        daily = _daily(400)
+        weekly = resample_trend(daily, "week")
+        monthly = resample_trend(daily, "month")
+
+        self.assertEqual(weekly["Date"].dt.dayofweek.unique().tolist(), [0])
+        self.assertEqual(len(monthly), 14)
+        self.assertAlmostEqual(weekly["Total"].sum(), daily["Total"].sum(), places=6)
+        self.assertAlmostEqual(monthly["Total"].sum(), daily["Total"].sum(), places=6)
+        with self.assertRaises(ValueError):
+            resample_trend(daily, "hour")
+
+    def test_lttb_keeps_endpoints_and_peaks(self) -> None:
+        daily = _daily(5000)
+        daily.loc[1234, "Total"] = 10_000.0
+        daily.loc[4321, "Total"] = -10_000.0
+
+        reduced = downsample_lttb(daily, 300)
+        self.assertEqual(len(reduced), 300)
+        self.assertTrue(reduced["Date"].is_monotonic_increasing)
+        self.assertEqual(reduced["Date"].iloc[0], daily["Date"].iloc[0])
+        self.assertEqual(reduced["Date"].iloc[-1], daily["Date"].iloc[-1])
+        self.assertIn(10_000.0, reduced["Total"].tolist())
+        self.assertIn(-10_000.0, reduced["Total"].tolist())
+        np.testing.assert_array_equal(lttb_indices(np.arange(5), np.ones(5), 10), np.arange(5))
+
+    def test_trend_series_caps_points_unless_full_resolution(self) -> None:
+        daily = _daily(3 * 365)
+
+        trend, resolution = trend_series(daily, resolution="day", max_points=200)
+        self.assertEqual((resolution, len(trend)), ("day", 200))
+        full, _ = trend_series(daily, resolution="day", max_points=None)
+        pd.testing.assert_frame_equal(full, daily)
+        auto, resolution = trend_series(daily)
+        self.assertEqual((resolution, len(auto)), ("month", 36))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from datetime import date
+from pathlib import Path
+import unittest
+
+import pandas as pd
+
+from sales_automation.data import iter_sales_chunks, load_sales_data
+from sales_automation.validation import SALES_RULES, between, has_dtype, validate, validate_file
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+TODAY = date(2024, 1, 1)
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.df = load_sales_data(FIXTURE_PATH)
+
+    def test_reports_violation_counts_and_samples_per_rule(self) -> None:
+        broken = self.df.copy()
+        broken.loc[1, "Rating"] = 11.0
+        broken.loc[2, ["Rating", "Total"]] = [None, -5.0]
+        broken.loc[3, "City"] = "Boston"
+        broken.loc[3, "Date"] = pd.Timestamp("2030-01-01")
+
+        report = validate(broken, today=TODAY)
+        self.assertFalse(report.passed)
+        self.assertEqual(
+            {result.name: result.violations for result in report.failed},
+            {"Rating between 0 and 10": 2, "Total > 0": 1, "City in allowed labels": 1, "Date not in the future": 1},
+        )
+        self.assertEqual(
+            report.result("Rating between 0 and 10").samples,
+            [{"row": 1, "value": 11.0, "Invoice ID": "INV-1002"}, {"row": 2, "value": None, "Invoice ID": "INV-1003"}],
+        )
+        self.assertEqual(report.result("Date not in the future").samples[0]["value"], "2030-01-01")
+        self.assertTrue(validate(self.df, today=TODAY).passed)
+
+    def test_chunk_stream_matches_single_frame(self) -> None:
+        rules = [*SALES_RULES, between("Total", 40, 60)]
+        whole = validate(self.df, rules=rules, today=TODAY, sample_size=1)
+        streamed = validate(iter_sales_chunks(FIXTURE_PATH, chunksize=1), rules=rules, today=TODAY, sample_size=1)
+
+        self.assertEqual(whole.rows, streamed.rows)
+        self.assertEqual([result.violations for result in whole.results], [result.violations for result in streamed.results])
+        self.assertEqual(streamed.result("Total between 40 and 60").samples, [{"row": 1, "value": 63.0, "Invoice ID": "INV-1002"}])
+        self.assertEqual(validate_file(FIXTURE_PATH, chunksize=2, today=TODAY).as_dict(), validate(self.df, today=TODAY).as_dict())
+
+    def test_missing_columns_and_dtypes_fail(self) -> None:
+        report = validate(self.df.drop(columns=["Rating"]).astype({"Total": str}), today=TODAY)
+
+        self.assertEqual(report.missing_columns, ["Rating"])
+        self.assertTrue(report.result("Rating between 0 and 10").missing_column)
+        self.assertEqual(report.result("Total is numeric").violations, len(self.df))
+        self.assertTrue(report.result("Total > 0").passed)
+        with self.assertRaises(ValueError):
+            has_dtype("Total", "decimal")
+
+
+if __name__ == "__main__":
+    unittest.main()
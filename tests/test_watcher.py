@@ -0,0 +1,82 @@
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from sales_automation.cache import SalesCache
+from sales_automation.watcher import DatasetWatcher
+
+
+FIXTURE_PATH = Path("tests/fixtures/golden_sales.csv")
+
+
+class TestDatasetWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.data_path = Path(self._tmp_dir.name) / "sales.csv"
+        shutil.copyfile(FIXTURE_PATH, self.data_path)
+        self.cache = SalesCache()
+        self.watcher = self.cache.watch(self.data_path, start=False)
+
+    def tearDown(self) -> None:
+        self.watcher.stop()
+        self._tmp_dir.cleanup()
+
+    def _drop_last_row(self) -> None:
+        lines = self.data_path.read_text(encoding="utf-8").splitlines()
+        self.data_path.write_text("\n".join(lines[:-1]) + "\n", encoding="utf-8")
+
+    def test_watched_dataset_swaps_only_after_version_settles(self) -> None:
+        first = self.cache.dataset(self.data_path)
+        self.cache.metrics(first, outputs=["kpis"])
+        self._drop_last_row()
+
+        # Requests keep the installed snapshot; the first poll only observes the change.
+        self.assertIs(self.cache.dataset(self.data_path), first)
+        self.assertFalse(self.watcher.poll_once())
+        self.assertIs(self.cache.dataset(self.data_path), first)
+
+        self.assertTrue(self.watcher.poll_once())
+        reloaded = self.cache.dataset(self.data_path)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(len(reloaded.frame), len(first.frame) - 1)
+        self.assertEqual(self.watcher.reload_count, 1)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertFalse(self.watcher.poll_once())
+
+    def test_failed_reload_keeps_previous_snapshot(self) -> None:
+        first = self.cache.dataset(self.data_path)
+        self.data_path.write_text("not a sales file\n", encoding="utf-8")
+
+        self.assertFalse(self.watcher.poll_once())
+        self.assertFalse(self.watcher.poll_once())
+        self.assertIsNotNone(self.watcher.last_error)
+        self.assertIs(self.cache.dataset(self.data_path), first)
+
+    def test_unloaded_dataset_is_not_reloaded_by_its_watcher(self) -> None:
+        self.cache.dataset(self.data_path)
+        self._drop_last_row()
+        self.assertFalse(self.watcher.poll_once())
+
+        load_snapshot = self.cache.load_snapshot
+
+        def unload_during_reload(data_path: Path, version: str):
+            snapshot = load_snapshot(data_path, version)
+            self.cache.unload(data_path)
+            return snapshot
+
+        self.cache.load_snapshot = unload_during_reload
+        self.assertFalse(self.watcher.poll_once())
+        self.assertIsNone(self.cache.current(self.data_path))
+        self.assertFalse(self.watcher.poll_once())
+        self.assertIsNone(self.cache.current(self.data_path))
+        self.assertEqual(self.watcher.reload_count, 0)
+
+    def test_watch_is_idempotent(self) -> None:
+        self.assertIs(self.cache.watch(self.data_path, start=False), self.watcher)
+        self.assertIsInstance(self.watcher, DatasetWatcher)
+        self.assertFalse(self.watcher.running)
+
+
+if __name__ == "__main__":
+    unittest.main()